@@ -126,12 +126,22 @@ async def chat_policy_assistant(
         result = await rag_service.chat(
             message=request.message,
             session_id=request.session_id,
+            grade=current_user.get("grade"),
         )
         return PolicyChatResponse(**result)
     except ValueError as validation_error:
         raise HTTPException(status_code=400, detail=str(validation_error))
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="Policy assistant timed out, please try again")
     except Exception as exc:  # pylint: disable=broad-except
         raise HTTPException(status_code=500, detail=f"Policy assistant error: {exc}")
+
+
+@router.get("/policy/cache-stats")
+def policy_cache_stats(current_user=Depends(get_current_user)):
+    """Hit rates for the policy assistant caches"""
+    return get_policy_rag_service().cache_stats()
+
 @router.get("/my-indents")
 def list_my_indents(current_user=Depends(get_current_user)):
     if current_user["role"] != "employee":
@@ -8,11 +8,21 @@ from fastapi import APIRouter, HTTPException, Depends
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
 
 from src.auth.jwt_service import get_current_user
-from src.api.models import ChatRequest, ChatResponse, StatusUpdateRequest
+from src.api.models import (
+    ChatRequest,
+    ChatResponse,
+    StatusUpdateRequest,
+    TripPlanRequest,
+    TripPlanResponse,
+    BatchBookingRequest,
+    BatchBookingResponse
+)
 from src.api.services import (
     get_session_service,
     build_context_message,
-    get_travel_indent_service
+    get_travel_indent_service,
+    get_trip_planner_service,
+    get_batch_booking_service
 )
 from src.api.handlers import get_mcp_handler
 
@@ -102,7 +112,9 @@ async def chat(request: ChatRequest):
                 continue
             
             result = await tool.ainvoke(args)
-            tool_msgs.append(ToolMessage(tool_call_id=tc["id"], content=json.dumps(result)))
+            # MCP tools already return JSON text; only encode structured results
+            content = result if isinstance(result, str) else json.dumps(result, default=str)
+            tool_msgs.append(ToolMessage(tool_call_id=tc["id"], content=content))
             tools_used.append(name)
         
         session.history.extend(tool_msgs)
@@ -113,8 +125,10 @@ async def chat(request: ChatRequest):
         final_response = await final_llm.ainvoke(session.history)
         session.history.append(final_response)
         
-        # Check if booking complete
-        if "book_flight" in tools_used and "book_hotel" in tools_used:
+        # Check if booking complete (direct bookings or confirmed holds)
+        flight_booked = "book_flight" in tools_used or "confirm_flight_hold" in tools_used
+        hotel_booked = "book_hotel" in tools_used or "confirm_room_hold" in tools_used
+        if flight_booked and hotel_booked:
             booking_complete = True
             if session.travel_indent:
                 try:
@@ -135,6 +149,33 @@ async def chat(request: ChatRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
+@router.post("/plan-trip", response_model=TripPlanResponse)
+async def plan_trip(request: TripPlanRequest):
+    """Rank the cheapest policy-compliant flight + hotel combinations for a trip"""
+    travel_indent_service = get_travel_indent_service()
+    trip_planner_service = get_trip_planner_service()
+    
+    indent = None
+    if request.indent_id:
+        indent = travel_indent_service.get_by_id(request.indent_id)
+        if not indent:
+            raise HTTPException(status_code=404, detail="Travel indent not found")
+    
+    try:
+        return await trip_planner_service.plan(request, indent)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+@router.post("/batch-book", response_model=BatchBookingResponse)
+async def batch_book(request: BatchBookingRequest):
+    """Book many manager-approved indents, sharing searches across identical routes and dates"""
+    batch_booking_service = get_batch_booking_service()
+    
+    try:
+        return await batch_booking_service.book(request)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
 @router.get("/travel-indents")
 async def get_travel_indents():
     """Get all travel indents for HR dashboard"""
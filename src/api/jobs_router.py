@@ -0,0 +1,89 @@
+# src/api/jobs_router.py
+"""
+Background job submission and status endpoints
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+
+from src.auth.jwt_service import get_current_user
+from src.api.models import JobSubmitRequest, JobResponse
+from src.api.services import IdempotencyConflict, get_job_queue
+from src.api.services.job_handlers import JOB_KIND_ROLES, register_default_handlers
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+# ─────────────────────────────
+# Startup/Shutdown Events
+# ─────────────────────────────
+@router.on_event("startup")
+async def startup_jobs():
+    """Register job handlers and start the workers"""
+    job_queue = get_job_queue()
+    register_default_handlers(job_queue)
+    await job_queue.start()
+
+@router.on_event("shutdown")
+async def shutdown_jobs():
+    """Stop the workers; unfinished jobs resume on next start"""
+    await get_job_queue().stop()
+
+# ─────────────────────────────
+# API Endpoints
+# ─────────────────────────────
+@router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def submit_job(
+    request: JobSubmitRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    user=Depends(get_current_user),
+):
+    """Queue a job; resubmitting with the same idempotency key returns the original job"""
+    allowed_roles = JOB_KIND_ROLES.get(request.kind)
+    if allowed_roles and user["role"] not in allowed_roles:
+        raise HTTPException(status_code=403, detail=f"Not allowed to submit {request.kind} jobs")
+
+    job_queue = get_job_queue()
+    try:
+        job, created = job_queue.submit(
+            request.kind,
+            request.payload,
+            idempotency_key=idempotency_key or request.idempotency_key,
+            max_attempts=request.max_attempts,
+            submitted_by=user["employee_id"],
+        )
+    except IdempotencyConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    return job
+
+@router.get("", response_model=List[JobResponse])
+def list_jobs(
+    status_filter: Optional[str] = Query(None, alias="status"),
+    kind: Optional[str] = None,
+    limit: int = 50,
+    user=Depends(get_current_user),
+):
+    """The current user's most recent jobs, optionally filtered by status and kind"""
+    return get_job_queue().list_jobs(
+        status=status_filter,
+        kind=kind,
+        limit=max(1, min(limit, 200)),
+        submitted_by=user["employee_id"],
+    )
+
+@router.get("/health")
+def jobs_health(user=Depends(get_current_user)):
+    """Worker count and job counts by status"""
+    return get_job_queue().stats()
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: str, user=Depends(get_current_user)):
+    """Status, attempts and result of one of the current user's jobs"""
+    job = get_job_queue().get(job_id, submitted_by=user["employee_id"])
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -8,6 +8,14 @@ from src.api.models.chat_models import (
 	PolicyChatResponse,
 	PolicySource,
 )
+from src.api.models.trip_models import (
+	TripPlanWeights,
+	TripPlanRequest,
+	TripPlanResponse,
+	BatchBookingRequest,
+	BatchBookingResponse,
+)
+from src.api.models.job_models import JobSubmitRequest, JobResponse
 
 __all__ = [
 	'Session',
@@ -17,4 +25,11 @@ __all__ = [
 	'PolicyChatRequest',
 	'PolicyChatResponse',
 	'PolicySource',
+	'TripPlanWeights',
+	'TripPlanRequest',
+	'TripPlanResponse',
+	'BatchBookingRequest',
+	'BatchBookingResponse',
+	'JobSubmitRequest',
+	'JobResponse',
 ]
\ No newline at end of file
@@ -39,4 +39,5 @@ class PolicyChatResponse(BaseModel):
     """Employee policy assistant response."""
     response: str
     session_id: str
-    sources: List[PolicySource] = Field(default_factory=list)
\ No newline at end of file
+    sources: List[PolicySource] = Field(default_factory=list)
+    cached: bool = False
\ No newline at end of file
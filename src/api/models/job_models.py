@@ -0,0 +1,29 @@
+# src/api/models/job_models.py
+"""
+Background job request/response models
+"""
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+
+class JobSubmitRequest(BaseModel):
+    """Queue a background job"""
+    kind: str = Field(..., description="Registered job kind, e.g. batch_booking or policy_reindex")
+    payload: Dict[str, Any] = {}
+    idempotency_key: Optional[str] = Field(None, max_length=200)
+    max_attempts: Optional[int] = Field(None, ge=1, le=10)
+
+class JobResponse(BaseModel):
+    """Current state of a background job"""
+    job_id: str
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    idempotency_key: Optional[str] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: str
+    updated_at: str
+    next_run_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
@@ -0,0 +1,53 @@
+# src/api/models/trip_models.py
+"""
+Trip planning request/response models
+"""
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+class TripPlanWeights(BaseModel):
+    """Preference weights; each lowers a candidate's effective cost when ranking"""
+    preferred_vendor: float = Field(0.05, ge=0, le=0.5, description="Fractional credit for preferred airlines/hotels")
+    star_rating: float = Field(0.03, ge=0, le=0.2, description="Fractional credit per hotel star above 3")
+    duration_per_hour: float = Field(0.0, ge=0, description="Cost added per hour of flight time")
+
+class TripPlanRequest(BaseModel):
+    """Trip planning request; route/dates/grade default from the travel indent"""
+    indent_id: Optional[str] = None
+    origin: Optional[str] = None
+    destination: Optional[str] = None
+    depart_date: Optional[str] = None
+    return_date: Optional[str] = None
+    grade: Optional[str] = None
+    cabin_class: str = "economy"
+    include_return_flight: bool = True
+    max_budget: Optional[float] = None
+    top_k: int = Field(3, ge=1, le=10)
+    weights: TripPlanWeights = Field(default_factory=TripPlanWeights)
+
+class TripPlanResponse(BaseModel):
+    """Ranked trip plans with cost breakdowns"""
+    search_criteria: Dict[str, Any]
+    candidates: Dict[str, int]
+    plans: List[Dict[str, Any]] = []
+    errors: List[str] = []
+
+class BatchBookingRequest(BaseModel):
+    """Book many manager-approved indents in one run"""
+    indent_ids: List[str] = Field(..., min_length=1)
+    cabin_class: str = "economy"
+    include_return_flight: bool = True
+    max_budget_per_indent: Optional[float] = None
+    fallback_plans: int = Field(5, ge=1, le=10, description="Plans to try per indent when holds fail")
+    max_concurrency: Optional[int] = Field(None, ge=1, le=32)
+    weights: TripPlanWeights = Field(default_factory=TripPlanWeights)
+
+class BatchBookingResponse(BaseModel):
+    """Per-indent booking outcomes"""
+    requested: int
+    booked: int
+    partial: int = 0
+    failed: int
+    skipped: int
+    search_groups: int
+    results: List[Dict[str, Any]] = []
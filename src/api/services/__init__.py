@@ -2,11 +2,21 @@
 from src.api.services.session_service import SessionService, get_session_service
 from src.api.services.context_service import build_context_message
 from src.api.services.travel_indent_service import TravelIndentService, get_travel_indent_service
+from src.api.services.trip_planner_service import TripPlannerService, get_trip_planner_service
+from src.api.services.batch_booking_service import BatchBookingService, get_batch_booking_service
+from src.api.services.job_queue import JobQueue, IdempotencyConflict, get_job_queue
 
 __all__ = [
     'SessionService',
     'get_session_service',
     'build_context_message',
     'TravelIndentService',
-    'get_travel_indent_service'
+    'get_travel_indent_service',
+    'TripPlannerService',
+    'get_trip_planner_service',
+    'BatchBookingService',
+    'get_batch_booking_service',
+    'JobQueue',
+    'IdempotencyConflict',
+    'get_job_queue'
 ]
\ No newline at end of file
@@ -0,0 +1,325 @@
+# src/api/services/batch_booking_service.py
+"""
+Bulk booking of manager-approved travel indents over MCP hold/confirm tools
+"""
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.config.settings import settings
+from src.api.models.trip_models import BatchBookingRequest
+from src.api.services.travel_indent_service import (
+    BOOKING_IN_PROGRESS_STATUS,
+    PARTIALLY_BOOKED_STATUS,
+    TravelIndentService,
+    is_manager_approved,
+)
+from src.api.services.trip_planner_service import Candidate, TripPlannerService, get_trip_planner_service
+from src.mcp_servers.common.policy_rules import get_policy_rules
+
+BOOKED_STATUS = "completed_hr"
+
+def route_key(indent: Dict) -> Tuple[str, str, str, Optional[str]]:
+    """Indents with the same key share one set of flight/hotel searches"""
+    end = indent.get("travel_end_date")
+    return (
+        (indent.get("from_city") or "").strip().lower(),
+        (indent.get("to_city") or "").strip().lower(),
+        str(indent.get("travel_start_date")),
+        str(end) if end else None,
+    )
+
+def search_grade(grades: List[str]) -> str:
+    """
+    Grade with the widest occupancy and cabin entitlements in a group, which
+    the servers apply as search filters. It says nothing about nightly caps
+    or per diem, so the group's search keeps rooms the search grade may not
+    book and each indent is filtered to its own grade by rank_plans.
+    """
+    policy = get_policy_rules()
+    return max(
+        grades,
+        key=lambda g: (
+            policy.single_occupancy_allowed(g),
+            len(policy.entitlement(g).international_cabins),
+            len(policy.entitlement(g).domestic_cabins),
+        ),
+    )
+
+class BatchBookingService:
+    """Groups indents by route and date, searches once per group and books concurrently"""
+
+    def __init__(self, planner: Optional[TripPlannerService] = None):
+        self.planner = planner or get_trip_planner_service()
+
+    async def book(self, request: BatchBookingRequest) -> Dict:
+        """
+        Book every eligible indent.
+
+        Indents are claimed first (moved to booking_hr under a status guard),
+        so overlapping batches never book the same indent. Each indent's final
+        status is written as soon as its own booking finishes: completed_hr,
+        partial_hr when only some legs could be confirmed, or back to its
+        manager-approved status when nothing was booked. An indent whose
+        confirmation was interrupted stays booking_hr for HR to review.
+        """
+        indent_ids = list(dict.fromkeys(request.indent_ids))
+        if len(indent_ids) > settings.BATCH_BOOKING_MAX_INDENTS:
+            raise ValueError(f"At most {settings.BATCH_BOOKING_MAX_INDENTS} indents per batch")
+
+        indents = TravelIndentService.get_by_ids(indent_ids)
+        results: Dict[str, Dict] = {}
+        eligible: List[Dict] = []
+        for indent_id in indent_ids:
+            indent = indents.get(indent_id)
+            if not indent:
+                results[indent_id] = {"indent_id": indent_id, "status": "skipped", "error": "Travel indent not found"}
+            elif not is_manager_approved(indent):
+                results[indent_id] = {
+                    "indent_id": indent_id, "status": "skipped",
+                    "error": f"Indent is {indent.get('is_approved') or 'pending'}, not awaiting HR booking"
+                }
+            else:
+                eligible.append(indent)
+
+        claimed = set(TravelIndentService.claim_for_booking([i["indent_id"] for i in eligible]))
+        groups: Dict[Tuple, List[Dict]] = defaultdict(list)
+        for indent in eligible:
+            if indent["indent_id"] in claimed:
+                groups[route_key(indent)].append(indent)
+            else:
+                results[indent["indent_id"]] = {
+                    "indent_id": indent["indent_id"], "status": "skipped",
+                    "error": "Indent is already being booked or is no longer awaiting HR booking"
+                }
+
+        # Claims still open when the batch stops; the ones whose confirmation never started are handed back
+        open_claims = {i["indent_id"]: i["is_approved"] for group in groups.values() for i in group}
+        confirming: Set[str] = set()
+        semaphore = asyncio.Semaphore(request.max_concurrency or settings.BATCH_BOOKING_CONCURRENCY)
+        tasks = [
+            asyncio.create_task(self._book_group(members, request, semaphore, open_claims, confirming))
+            for members in groups.values()
+        ]
+        try:
+            group_results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            # Only hand claims back once no group can still be holding or confirming
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for indent_id, previous_status in list(open_claims.items()):
+                if indent_id not in confirming:
+                    TravelIndentService.finish_booking(indent_id, previous_status)
+        for members, group_result in zip(groups.values(), group_results):
+            if isinstance(group_result, BaseException):
+                # The group's search failed before any member was booked
+                group_result = [
+                    {"indent_id": m["indent_id"], "status": "failed", "error": f"Search failed: {group_result}"}
+                    for m in members
+                ]
+            for result in group_result:
+                results[result["indent_id"]] = result
+
+        ordered = [results[i] for i in indent_ids]
+        return {
+            "requested": len(indent_ids),
+            "booked": sum(r["status"] == "booked" for r in ordered),
+            "partial": sum(r["status"] == "partial" for r in ordered),
+            "failed": sum(r["status"] == "failed" for r in ordered),
+            "skipped": sum(r["status"] == "skipped" for r in ordered),
+            "search_groups": len(groups),
+            "results": ordered,
+        }
+
+    @staticmethod
+    def _finish(indent: Dict, result: Dict, open_claims: Dict[str, str]) -> None:
+        """Write the indent's status for this result and drop its claim"""
+        final_status = {
+            "booked": BOOKED_STATUS,
+            "partial": PARTIALLY_BOOKED_STATUS,
+        }.get(result["status"], indent["is_approved"])
+        try:
+            updated = TravelIndentService.finish_booking(indent["indent_id"], final_status)
+            result["indent_status"] = final_status if updated else "claim lost"
+        except Exception as e:
+            result["indent_status"] = f"status update failed: {e}"
+            if result["status"] == "failed":
+                # Nothing was booked; let the finally block in book() retry the hand-back
+                return
+        open_claims.pop(indent["indent_id"], None)
+
+    async def _book_group(
+        self,
+        members: List[Dict],
+        request: BatchBookingRequest,
+        semaphore: asyncio.Semaphore,
+        open_claims: Dict[str, str],
+        confirming: Set[str]
+    ) -> List[Dict]:
+        first = members[0]
+        depart_date = str(first["travel_start_date"])
+        return_date = str(first["travel_end_date"]) if first.get("travel_end_date") else None
+
+        async with semaphore:
+            legs, errors = await self.planner.search_legs(
+                first["from_city"], first["to_city"], depart_date, return_date,
+                search_grade([m.get("grade") or "E5" for m in members]),
+                request.cabin_class, request.include_return_flight, request.weights,
+                compliant_only=False
+            )
+
+        async def book_member(indent: Dict) -> Dict:
+            try:
+                async with semaphore:
+                    result = await self._book_indent(
+                        indent, legs, errors, depart_date, return_date, request, confirming
+                    )
+            except Exception as e:
+                result = {"indent_id": indent["indent_id"], "status": "failed", "error": str(e)}
+                if indent["indent_id"] in confirming:
+                    # Bookings may have been confirmed; the claim stays for HR to review
+                    result["indent_status"] = BOOKING_IN_PROGRESS_STATUS
+                    return result
+            self._finish(indent, result, open_claims)
+            return result
+
+        return list(await asyncio.gather(*(book_member(m) for m in members)))
+
+    async def _book_indent(
+        self,
+        indent: Dict,
+        legs: Dict[str, List[Candidate]],
+        search_errors: List[str],
+        depart_date: str,
+        return_date: Optional[str],
+        request: BatchBookingRequest,
+        confirming: Set[str]
+    ) -> Dict:
+        """Hold every leg of the best plan, falling back to the next plan if a hold fails, then confirm"""
+        result = {"indent_id": indent["indent_id"], "status": "failed"}
+        plans, _ = self.planner.rank_plans(
+            legs, indent.get("grade") or "E5", request.fallback_plans, request.max_budget_per_indent
+        )
+        if not plans:
+            result["error"] = "; ".join(search_errors) or "No policy-compliant plan within budget"
+            return result
+
+        attempts = []
+        for plan in plans:
+            holds, error = await self._hold_plan(indent, plan, depart_date, return_date)
+            if error:
+                attempts.append(f"plan {plan['rank']}: {error}")
+                await self._release(holds)
+                continue
+
+            confirming.add(indent["indent_id"])
+            bookings, error = await self._confirm(indent, holds)
+            result.update({
+                "plan": plan,
+                "bookings": bookings,
+                "total_cost": plan["total_cost"],
+            })
+            if error:
+                result["error"] = error
+                if bookings:
+                    result["status"] = "partial"
+            else:
+                result["status"] = "booked"
+            if attempts:
+                result["failed_attempts"] = attempts
+            return result
+
+        result["error"] = "All plans failed to hold"
+        result["failed_attempts"] = attempts
+        return result
+
+    async def _hold_plan(
+        self,
+        indent: Dict,
+        plan: Dict,
+        depart_date: str,
+        return_date: Optional[str]
+    ) -> Tuple[Dict[str, str], Optional[str]]:
+        """Hold references per leg, and the first hold error if any"""
+        grade = indent.get("grade") or "E5"
+        calls = {}
+        for leg, travel_date in (("outbound", depart_date), ("return", return_date)):
+            if leg in plan:
+                calls[leg] = ("hold_flight", {
+                    "flight_id": plan[leg]["flight_id"], "travel_date": travel_date,
+                    "passenger_email": indent["email"], "employee_grade": grade,
+                    "cabin_class": plan[leg]["cabin_class"]
+                })
+        if "hotel" in plan:
+            calls["hotel"] = ("hold_room", {
+                "hotel_id": plan["hotel"]["hotel_id"], "room_id": plan["hotel"]["room_id"],
+                "check_in": depart_date, "check_out": return_date,
+                "guest_email": indent["email"], "employee_grade": grade
+            })
+
+        responses = await asyncio.gather(*(self.planner.call_tool(name, args) for name, args in calls.values()))
+        holds, error = {}, None
+        for leg, response in zip(calls, responses):
+            if response.get("hold_reference"):
+                holds[leg] = response["hold_reference"]
+            elif error is None:
+                error = f"{leg} hold failed: {response.get('error', 'unknown error')}"
+        return holds, error
+
+    async def _confirm(self, indent: Dict, holds: Dict[str, str]) -> Tuple[Dict[str, Dict], Optional[str]]:
+        """
+        Confirm the hotel first, then the flights, stopping at the first
+        failure. Unconfirmed holds are then released and a confirmed hotel is
+        cancelled. Flight bookings cannot be cancelled over MCP, so a flight
+        confirmed before a later failure stays in the returned bookings and
+        the indent is reported as partially booked.
+        """
+        name, email = indent.get("employee_name") or "", indent["email"]
+        bookings, errors = {}, []
+        for leg, reference in sorted(holds.items(), key=lambda item: item[0] != "hotel"):
+            if leg == "hotel":
+                response = await self.planner.call_tool("confirm_room_hold", {
+                    "hold_reference": reference, "guest_name": name, "guest_email": email
+                })
+            else:
+                response = await self.planner.call_tool("confirm_flight_hold", {
+                    "hold_reference": reference, "passenger_name": name, "passenger_email": email
+                })
+            if response.get("error"):
+                errors.append(f"{leg} confirmation failed: {response['error']}")
+                break
+            bookings[leg] = {
+                "booking_id": response.get("booking_id"),
+                "booking_reference": response.get("booking_reference"),
+                "hold_reference": reference,
+            }
+        if errors:
+            await self._release({leg: ref for leg, ref in holds.items() if leg not in bookings})
+            hotel = bookings.get("hotel")
+            if hotel:
+                response = await self.planner.call_tool("cancel_booking", {
+                    "booking_reference": hotel["booking_reference"], "guest_email": email
+                })
+                if response.get("error"):
+                    errors.append(f"hotel cancellation failed: {response['error']}")
+                else:
+                    del bookings["hotel"]
+        return bookings, "; ".join(errors) or None
+
+    async def _release(self, holds: Dict[str, str]) -> None:
+        await asyncio.gather(*(
+            self.planner.call_tool("release_room_hold" if leg == "hotel" else "release_flight_hold",
+                                    {"hold_reference": reference})
+            for leg, reference in holds.items()
+        ))
+
+# Singleton instance
+_batch_booking_service: Optional[BatchBookingService] = None
+
+def get_batch_booking_service() -> BatchBookingService:
+    """Get batch booking service singleton"""
+    global _batch_booking_service
+    if _batch_booking_service is None:
+        _batch_booking_service = BatchBookingService()
+    return _batch_booking_service
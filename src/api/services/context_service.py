@@ -4,6 +4,8 @@ Context building for chat messages
 """
 from typing import Optional, Dict
 
+from src.mcp_servers.common.policy_rules import get_policy_rules
+
 def build_context_message(user_message: str, travel_indent: Optional[Dict]) -> str:
     """Build enhanced message with travel context"""
     if not travel_indent:
@@ -32,6 +34,22 @@ def build_context_message(user_message: str, travel_indent: Optional[Dict]) -> s
     context_parts.append(f"📅 Total Days: {indent['total_days']}")
     context_parts.append("")
 
+    context_parts.append("📏 **POLICY ENTITLEMENTS:**")
+    policy = get_policy_rules()
+    is_international = indent['travel_type'] == 'international'
+    cabins = policy.allowed_cabins(indent['grade'], is_international)
+    context_parts.append(f"✈️ Cabin classes: {', '.join(cabins)}")
+    occupancy = "single occupancy allowed" if policy.single_occupancy_allowed(indent['grade']) else "twin sharing required"
+    context_parts.append(f"🏨 Hotel: {occupancy}")
+    nightly_caps = policy.entitlement(indent['grade']).nightly_cap
+    if nightly_caps:
+        caps = ", ".join(f"Tier {tier}: {cap:,.0f}" for tier, cap in sorted(nightly_caps.items()))
+        context_parts.append(f"🛏️ Nightly cap by city tier: {caps}")
+    per_diem = policy.per_diem(indent['grade'], indent['travel_type'])
+    if per_diem is not None:
+        context_parts.append(f"💵 Per diem: {per_diem:,.0f}")
+    context_parts.append("")
+
     context_parts.append("✅ **APPROVAL STATUS:**")
     status_mapping = {
         "saved": "Saved by Employee",
@@ -40,6 +58,8 @@ def build_context_message(user_message: str, travel_indent: Optional[Dict]) -> s
         "accpeted_manager": "Approved by Manager",
         "accepted_manager": "Approved by Manager",
         "rejected_hr": "Rejected by HR",
+        "booking_hr": "Booking in Progress by HR",
+        "partial_hr": "Partially Booked (HR Review)",
         "completed_hr": "Completed by HR"
     }
     status_display = status_mapping.get(indent['is_approved'], indent['is_approved'])
@@ -0,0 +1,107 @@
+# src/api/services/job_handlers.py
+"""
+Background job handlers for long-running booking and indexing work
+"""
+import asyncio
+import os
+from typing import Any, Dict, List
+
+from src.api.models.trip_models import BatchBookingRequest
+from src.api.services.batch_booking_service import get_batch_booking_service
+from src.api.services.job_queue import JobQueue
+from src.config.settings import settings
+
+# Roles allowed to submit each job kind (kinds not listed are open to any user)
+JOB_KIND_ROLES: Dict[str, tuple] = {
+    "batch_booking": ("hr", "admin"),
+    "policy_reindex": ("hr", "admin"),
+    "policy_ingest": ("hr", "admin"),
+}
+
+DEFAULT_REINDEX_DOCUMENT = "policy_reindex"
+
+POLICY_DOCUMENT_EXTENSIONS = (".pdf", ".txt")
+
+async def run_batch_booking(payload: Dict[str, Any]) -> Dict:
+    """
+    Same as POST /hr-mcp/batch-book. A retry after an error only books
+    indents that are still manager-approved: booked ones are completed_hr
+    and ones an earlier attempt was confirming stay booking_hr, so both are
+    skipped. Timed-out or interrupted runs are not retried (the cancelled
+    attempt may have confirmed bookings it never recorded).
+    """
+    return await get_batch_booking_service().book(BatchBookingRequest(**payload))
+
+def _reindex_policy_texts(texts: List[str], document: str) -> Dict:
+    from src.rag.embedder import get_embedder
+    from src.rag.ingest import chunk_hash
+    from src.rag.metadata import chunk_metadata
+    from src.rag.vector_store import get_vector_store
+
+    store = get_vector_store()
+    embeddings = get_embedder().embed_documents(texts)
+    metadata = [
+        {"chunk_id": chunk_hash(document, text), **chunk_metadata(text, document=document)}
+        for text in texts
+    ]
+    store.upsert(texts, embeddings, flush=True, metadata=metadata)
+
+    # The texts replace whatever was indexed under this document before
+    current = {meta["chunk_id"] for meta in metadata}
+    stale = [
+        chunk_id for chunk_id, stored_document in store.chunk_index().items()
+        if stored_document == document and chunk_id not in current
+    ]
+    if stale:
+        store.delete(stale)
+    return {"document": document, "chunks_indexed": len(texts), "chunks_deleted": len(stale)}
+
+async def run_policy_reindex(payload: Dict[str, Any]) -> Dict:
+    """
+    Embed policy text chunks in one batch and store them under `document`,
+    replacing that document's previous chunks. `ingest --prune` removes them
+    like any other document not listed.
+    """
+    texts = [t for t in payload.get("texts") or [] if t and t.strip()]
+    if not texts:
+        raise ValueError("policy_reindex requires a non-empty 'texts' list")
+    document = str(payload.get("document") or DEFAULT_REINDEX_DOCUMENT).strip()
+    return await asyncio.to_thread(_reindex_policy_texts, texts, document)
+
+def _policy_document_paths(paths: List[str]) -> List[str]:
+    """
+    Resolve `paths` against POLICY_DOCUMENTS_DIR. Anything that resolves
+    outside it (absolute paths, .., symlinks), is not a .pdf/.txt file or
+    does not exist is rejected.
+    """
+    root = os.path.realpath(settings.POLICY_DOCUMENTS_DIR)
+    resolved = []
+    for path in paths:
+        full = os.path.realpath(os.path.join(root, str(path)))
+        if os.path.commonpath([root, full]) != root:
+            raise ValueError(f"Policy document {path!r} is outside the policy directory")
+        if not full.lower().endswith(POLICY_DOCUMENT_EXTENSIONS):
+            raise ValueError(f"Policy document {path!r} must be a .pdf or .txt file")
+        if not os.path.isfile(full):
+            raise ValueError(f"Policy document {path!r} not found")
+        resolved.append(full)
+    return resolved
+
+async def run_policy_ingest(payload: Dict[str, Any]) -> Dict:
+    """Incremental ingestion of files under POLICY_DOCUMENTS_DIR (see src.rag.ingest)"""
+    from src.rag.ingest import ingest
+
+    paths = payload.get("paths") or []
+    if not paths:
+        raise ValueError("policy_ingest requires a non-empty 'paths' list")
+    paths = _policy_document_paths(paths)
+    return await ingest(
+        paths,
+        prune=bool(payload.get("prune", False)),
+        policy_version=str(payload.get("policy_version") or ""),
+    )
+
+def register_default_handlers(queue: JobQueue) -> None:
+    queue.register("batch_booking", run_batch_booking, retry_on_timeout=False)
+    queue.register("policy_reindex", run_policy_reindex)
+    queue.register("policy_ingest", run_policy_ingest)
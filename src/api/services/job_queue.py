@@ -0,0 +1,354 @@
+# src/api/services/job_queue.py
+"""
+In-process background job queue persisted in SQLite
+"""
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.config.settings import settings
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+JOB_STATUSES = (QUEUED, RUNNING, SUCCEEDED, FAILED)
+
+STALE_GRACE_SECONDS = 60.0
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    idempotency_key TEXT UNIQUE,
+    submitted_by TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    next_run_at REAL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, next_run_at);
+"""
+
+class IdempotencyConflict(ValueError):
+    """An idempotency key was reused for a different job"""
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+class JobQueue:
+    """
+    Runs registered async handlers on a bounded pool of worker tasks.
+
+    Jobs survive restarts: a job still marked running well past
+    `timeout_seconds` was abandoned by its process and is re-queued. Failures
+    are retried with exponential backoff until `max_attempts`; a ValueError
+    from a handler marks the job failed at once, since retrying a bad payload
+    cannot succeed. Kinds registered with `retry_on_timeout=False` are never
+    re-run after a timeout or an interrupted run, because the first attempt
+    may still have had side effects.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        concurrency: int = 2,
+        max_attempts: int = 3,
+        retry_base_seconds: float = 5,
+        retry_max_seconds: float = 300,
+        timeout_seconds: float = 900,
+        poll_seconds: float = 1
+    ):
+        self.db_path = db_path
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.timeout_seconds = timeout_seconds
+        self.poll_seconds = poll_seconds
+        self._handlers: Dict[str, JobHandler] = {}
+        self._retry_on_timeout: Dict[str, bool] = {}
+        self._next_recovery_at = 0.0
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA_SQL)
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "submitted_by" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN submitted_by TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_owner ON jobs (submitted_by, created_at)")
+
+    # ─────────────────────────────
+    # Registration / submission
+    # ─────────────────────────────
+    def register(self, kind: str, handler: JobHandler, retry_on_timeout: bool = True) -> None:
+        self._handlers[kind] = handler
+        self._retry_on_timeout[kind] = retry_on_timeout
+
+    @property
+    def kinds(self) -> List[str]:
+        return sorted(self._handlers)
+
+    def submit(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        submitted_by: Optional[str] = None
+    ) -> Tuple[Dict, bool]:
+        """
+        Queue a job; returns (job, created). Reusing a key returns the original
+        job. Keys are scoped to `submitted_by`, so two users never share one.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind '{kind}'. Available: {', '.join(self.kinds)}")
+
+        payload_json = json.dumps(payload, sort_keys=True, default=str)
+        stored_key = self._scoped_key(submitted_by, idempotency_key) if idempotency_key else None
+        now = time.time()
+        with self._lock:
+            if stored_key:
+                existing = self._conn.execute(
+                    "SELECT * FROM jobs WHERE idempotency_key = ?", (stored_key,)
+                ).fetchone()
+                if existing:
+                    if existing["kind"] != kind or existing["payload"] != payload_json:
+                        raise IdempotencyConflict("Idempotency key already used for a different job")
+                    return self._to_dict(existing), False
+
+            job_id = uuid.uuid4().hex
+            self._conn.execute("""
+                INSERT INTO jobs (job_id, kind, payload, status, idempotency_key, submitted_by, attempts,
+                                  max_attempts, created_at, updated_at, next_run_at)
+                VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?)
+            """, (job_id, kind, payload_json, QUEUED, stored_key, submitted_by,
+                  max_attempts or self.max_attempts, now, now, now))
+
+        if self._wakeup:
+            self._wakeup.set()
+        return self.get(job_id), True
+
+    def get(self, job_id: str, submitted_by: Optional[str] = None) -> Optional[Dict]:
+        """A job by id; with `submitted_by`, only if that user submitted it"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row and submitted_by is not None and row["submitted_by"] != submitted_by:
+            return None
+        return self._to_dict(row) if row else None
+
+    def list_jobs(
+        self,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        limit: int = 50,
+        submitted_by: Optional[str] = None
+    ) -> List[Dict]:
+        clauses, params = [], []
+        if submitted_by is not None:
+            clauses.append("submitted_by = ?")
+            params.append(submitted_by)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM jobs {where} ORDER BY created_at DESC LIMIT ?", (*params, limit)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {
+            "workers": len(self._workers),
+            "concurrency": self.concurrency,
+            "kinds": self.kinds,
+            "counts": {status: counts.get(status, 0) for status in JOB_STATUSES}
+        }
+
+    # ─────────────────────────────
+    # Worker lifecycle
+    # ─────────────────────────────
+    async def start(self) -> None:
+        if self._workers:
+            return
+        self._recover_stale()
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        print(f"✓ Job queue started with {self.concurrency} worker(s)")
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _worker(self) -> None:
+        while True:
+            job = self._claim()
+            if job is None:
+                if time.time() >= self._next_recovery_at:
+                    self._recover_stale()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    def _recover_stale(self) -> None:
+        """
+        Re-queue jobs left running past the timeout by a process that died;
+        kinds that must not be re-run are failed instead.
+        """
+        now = time.time()
+        self._next_recovery_at = now + min(STALE_GRACE_SECONDS, self.timeout_seconds)
+        # A live worker gives up at timeout_seconds; past the grace period nobody holds the job
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, kind FROM jobs WHERE status = ? AND updated_at < ?",
+                (RUNNING, now - self.timeout_seconds - STALE_GRACE_SECONDS)
+            ).fetchall()
+            requeued = failed = 0
+            for row in rows:
+                if self._retry_on_timeout.get(row["kind"], True):
+                    requeued += self._conn.execute("""
+                        UPDATE jobs SET status = ?, next_run_at = ?, updated_at = ?
+                        WHERE job_id = ? AND status = ?
+                    """, (QUEUED, now, now, row["job_id"], RUNNING)).rowcount
+                else:
+                    failed += self._conn.execute("""
+                        UPDATE jobs SET status = ?, error = ?, finished_at = ?, updated_at = ?
+                        WHERE job_id = ? AND status = ?
+                    """, (FAILED, "Interrupted while running; not retried", now, now, row["job_id"], RUNNING)).rowcount
+        if requeued:
+            print(f"⚠ Re-queued {requeued} interrupted job(s)")
+        if failed:
+            print(f"⚠ Failed {failed} interrupted job(s) whose kind is not retried")
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        now = time.time()
+        with self._lock:
+            while True:
+                row = self._conn.execute(
+                    "SELECT job_id FROM jobs WHERE status = ? AND next_run_at <= ? ORDER BY next_run_at LIMIT 1",
+                    (QUEUED, now)
+                ).fetchone()
+                if row is None:
+                    return None
+                # Guarded on status: another process sharing the database may claim the same row first
+                claimed = self._conn.execute("""
+                    UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?, updated_at = ?
+                    WHERE job_id = ? AND status = ?
+                """, (RUNNING, now, now, row["job_id"], QUEUED)).rowcount
+                if claimed:
+                    return self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (row["job_id"],)).fetchone()
+
+    async def _run(self, job: sqlite3.Row) -> None:
+        handler = self._handlers.get(job["kind"])
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for job kind '{job['kind']}'")
+            result = await asyncio.wait_for(handler(json.loads(job["payload"])), timeout=self.timeout_seconds)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            retryable = not isinstance(e, ValueError) and job["attempts"] < job["max_attempts"]
+            if isinstance(e, asyncio.TimeoutError) and not self._retry_on_timeout.get(job["kind"], True):
+                error = f"Timed out after {self.timeout_seconds:g}s; not retried"
+                retryable = False
+            self._finish_attempt(job, error=error, retry=retryable)
+            return
+        self._finish_attempt(job, result=result)
+
+    def _finish_attempt(self, job: sqlite3.Row, result: Any = None, error: Optional[str] = None, retry: bool = False) -> None:
+        now = time.time()
+        with self._lock:
+            if error is None:
+                self._conn.execute("""
+                    UPDATE jobs SET status = ?, result = ?, error = NULL, finished_at = ?, updated_at = ?
+                    WHERE job_id = ?
+                """, (SUCCEEDED, json.dumps(result, default=str), now, now, job["job_id"]))
+            elif retry:
+                delay = min(self.retry_max_seconds, self.retry_base_seconds * 2 ** (job["attempts"] - 1))
+                delay *= random.uniform(0.5, 1.0)
+                self._conn.execute("""
+                    UPDATE jobs SET status = ?, error = ?, next_run_at = ?, updated_at = ?
+                    WHERE job_id = ?
+                """, (QUEUED, error, now + delay, now, job["job_id"]))
+            else:
+                self._conn.execute("""
+                    UPDATE jobs SET status = ?, error = ?, finished_at = ?, updated_at = ?
+                    WHERE job_id = ?
+                """, (FAILED, error, now, now, job["job_id"]))
+        if error:
+            outcome = "will retry" if retry else "failed"
+            print(f"✗ Job {job['job_id']} ({job['kind']}) attempt {job['attempts']} {outcome}: {error}")
+
+    @staticmethod
+    def _scoped_key(submitted_by: Optional[str], idempotency_key: str) -> str:
+        return f"{submitted_by or ''}:{idempotency_key}"
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict:
+        idempotency_key = row["idempotency_key"]
+        if idempotency_key:
+            idempotency_key = idempotency_key.split(":", 1)[-1]
+        return {
+            "job_id": row["job_id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "max_attempts": row["max_attempts"],
+            "idempotency_key": idempotency_key,
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "created_at": _iso(row["created_at"]),
+            "updated_at": _iso(row["updated_at"]),
+            "next_run_at": _iso(row["next_run_at"]) if row["status"] == QUEUED else None,
+            "started_at": _iso(row["started_at"]),
+            "finished_at": _iso(row["finished_at"])
+        }
+
+# Singleton instance
+_job_queue: Optional[JobQueue] = None
+
+def get_job_queue() -> JobQueue:
+    """Get job queue singleton"""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue(
+            db_path=settings.JOB_QUEUE_DB_PATH,
+            concurrency=settings.JOB_WORKER_CONCURRENCY,
+            max_attempts=settings.JOB_MAX_ATTEMPTS,
+            retry_base_seconds=settings.JOB_RETRY_BASE_SECONDS,
+            retry_max_seconds=settings.JOB_RETRY_MAX_SECONDS,
+            timeout_seconds=settings.JOB_TIMEOUT_SECONDS
+        )
+    return _job_queue
@@ -17,7 +17,41 @@ _HR_ACTION_STATUSES = {
     "booked",
 }
 
-_HR_ELIGIBLE_STATUSES = _MANAGER_APPROVED_STATUSES | _HR_ACTION_STATUSES
+# Batch booking: claimed for booking, and booked only in part (needs HR review)
+BOOKING_IN_PROGRESS_STATUS = "booking_hr"
+PARTIALLY_BOOKED_STATUS = "partial_hr"
+
+_BOOKED_STATUSES = {"completed_hr", "booked"}
+
+_HR_ELIGIBLE_STATUSES = (
+    _MANAGER_APPROVED_STATUSES | _HR_ACTION_STATUSES | {BOOKING_IN_PROGRESS_STATUS, PARTIALLY_BOOKED_STATUS}
+)
+
+_MANAGER_APPROVAL_REQUIRED = "Manager approval required before HR can approve or book this ticket."
+_ALREADY_BOOKED = "This ticket is already booked."
+
+_INDENT_COLUMNS = (
+    "indent_id", "employee_id", "employee_name", "email", "grade", "department",
+    "designation", "purpose_of_booking", "travel_type", "travel_start_date",
+    "travel_end_date", "from_city", "from_country", "to_city", "to_country",
+    "total_days", "is_approved", "created_at",
+)
+
+def is_manager_approved(indent: Dict) -> bool:
+    """Whether an indent has manager approval and is waiting on HR"""
+    return (indent.get("is_approved") or "pending").strip().lower() in _MANAGER_APPROVED_STATUSES
+
+def _transition_error(current_status: Optional[str], new_status: str) -> Optional[str]:
+    """Why an indent may not move to new_status, or None when it may"""
+    current = (current_status or "pending").strip().lower()
+    normalized_new = (new_status or "").strip().lower()
+    if normalized_new not in _HR_ACTION_STATUSES:
+        return None
+    if normalized_new in _BOOKED_STATUSES and current in _BOOKED_STATUSES:
+        return _ALREADY_BOOKED
+    if current not in _HR_ELIGIBLE_STATUSES:
+        return _MANAGER_APPROVAL_REQUIRED
+    return None
 
 class TravelIndentService:
     """Service for travel indent operations"""
@@ -76,11 +110,10 @@ class TravelIndentService:
                 cur.close()
                 return False
 
-            current_status = (row[0] or "pending").strip().lower()
-            normalized_new = (status or "").strip().lower()
-            if normalized_new in _HR_ACTION_STATUSES and current_status not in _HR_ELIGIBLE_STATUSES:
+            error = _transition_error(row[0], status)
+            if error:
                 cur.close()
-                raise ValueError("Manager approval required before HR can approve or book this ticket.")
+                raise ValueError(error)
 
             cur.execute("""
                 UPDATE travel_indents 
@@ -92,6 +125,70 @@ class TravelIndentService:
             cur.close()
             return success
     
+    @staticmethod
+    def get_by_ids(indent_ids: List[str]) -> Dict[str, Dict]:
+        """Get several travel indents in one query, keyed by indent_id"""
+        if not indent_ids:
+            return {}
+        with get_db_conn() as conn:
+            cur = conn.cursor()
+            cur.execute(f"""
+                SELECT {', '.join(_INDENT_COLUMNS)}
+                FROM travel_indents 
+                WHERE indent_id = ANY(%s)
+            """, (list(indent_ids),))
+            rows = cur.fetchall()
+            cur.close()
+        
+        return {row[0]: dict(zip(_INDENT_COLUMNS, row)) for row in rows}
+    
+    @staticmethod
+    def claim_for_booking(indent_ids: List[str]) -> List[str]:
+        """
+        Move manager-approved indents to booking_hr and return the ids that
+        moved. The status guard is re-checked under the row lock, so when two
+        batches race for an indent exactly one of them claims it.
+        """
+        if not indent_ids:
+            return []
+        with get_db_conn() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("""
+                    UPDATE travel_indents
+                    SET is_approved = %s, updated_at = NOW()
+                    WHERE indent_id = ANY(%s)
+                      AND LOWER(TRIM(COALESCE(is_approved, 'pending'))) = ANY(%s)
+                    RETURNING indent_id
+                """, (BOOKING_IN_PROGRESS_STATUS, list(indent_ids), sorted(_MANAGER_APPROVED_STATUSES)))
+                claimed = [row[0] for row in cur.fetchall()]
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+        return claimed
+    
+    @staticmethod
+    def finish_booking(indent_id: str, status: str) -> bool:
+        """Move an indent claimed by claim_for_booking to its final (or previous) status"""
+        with get_db_conn() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("""
+                    UPDATE travel_indents
+                    SET is_approved = %s, updated_at = NOW()
+                    WHERE indent_id = %s AND is_approved = %s
+                """, (status, indent_id, BOOKING_IN_PROGRESS_STATUS))
+                conn.commit()
+                return cur.rowcount > 0
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cur.close()
+    
     @staticmethod
     def get_all() -> List[Dict]:
         """Get all travel indents for HR dashboard"""
@@ -108,7 +205,7 @@ class TravelIndentService:
                 WHERE COALESCE(is_approved, 'pending') IN (
                     'pending', 'manager_pending', 'pending_manager', 'submitted',
                     'accepted_manager', 'accpeted_manager', 'manager_approved',
-                    'hr_approved', 'completed_hr', 'booked'
+                    'hr_approved', 'completed_hr', 'booked', 'booking_hr', 'partial_hr'
                 )
                 ORDER BY created_at DESC
             """)
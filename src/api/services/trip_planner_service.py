@@ -0,0 +1,266 @@
+# src/api/services/trip_planner_service.py
+"""
+Budget-aware trip planning over MCP flight and hotel searches
+"""
+import asyncio
+import heapq
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.api.handlers import get_mcp_handler
+from src.api.models.trip_models import TripPlanRequest, TripPlanWeights
+from src.mcp_servers.common.policy_rules import get_policy_rules
+
+# Candidates fetched per search (the MCP servers cap page size at SEARCH_MAX_LIMIT)
+CANDIDATE_LIMIT = 50
+# Upper bound on heap pops per plan request
+MAX_EXPANSIONS = 5000
+
+@dataclass(frozen=True)
+class Candidate:
+    """One flight or hotel room option"""
+    score: float          # effective cost used for ranking
+    cost: float           # actual price paid
+    details: Dict[str, Any]
+
+def parse_tool_result(result: Any) -> Dict:
+    """MCP tool output (JSON text or content blocks) as a dict"""
+    if isinstance(result, list):
+        result = "".join(
+            block.get("text", "") if isinstance(block, dict) else str(block)
+            for block in result
+        )
+    if isinstance(result, str):
+        return json.loads(result)
+    return result or {}
+
+def flight_candidates(response: Dict, weights: TripPlanWeights) -> List[Candidate]:
+    candidates = []
+    for flight in response.get("flights", []):
+        price = float(flight["final_price"])
+        score = price * (1 - weights.preferred_vendor * bool(flight.get("is_preferred_vendor")))
+        score += weights.duration_per_hour * (flight.get("duration_minutes") or 0) / 60
+        candidates.append(Candidate(score=score, cost=price, details={
+            "flight_id": flight["flight_id"],
+            "flight_number": flight["flight_number"],
+            "airline": flight["airline"],
+            "route": flight.get("route"),
+            "departure_time": flight.get("departure_time"),
+            "arrival_time": flight.get("arrival_time"),
+            "duration_minutes": flight.get("duration_minutes"),
+            "cabin_class": flight.get("cabin_class"),
+            "travel_type": flight.get("travel_type"),
+            "is_preferred_vendor": flight.get("is_preferred_vendor"),
+            "final_price": price
+        }))
+    return candidates
+
+def room_candidates(response: Dict, weights: TripPlanWeights, compliant_only: bool = True) -> List[Candidate]:
+    """
+    Room options from a search_hotels response. With `compliant_only`, rooms
+    the server flagged non-compliant for the searched grade are dropped.
+    """
+    candidates = []
+    for hotel in response.get("hotels", []):
+        stars = hotel.get("star_rating") or 0
+        credit = weights.preferred_vendor * bool(hotel.get("is_preferred_vendor"))
+        credit += weights.star_rating * max(0, stars - 3)
+        for room in hotel.get("rooms", []):
+            if compliant_only and room.get("policy_compliant") is False:
+                continue
+            price = float(room["total_stay_price"])
+            candidates.append(Candidate(score=price * (1 - credit), cost=price, details={
+                "hotel_id": hotel["hotel_id"],
+                "hotel_name": hotel["hotel_name"],
+                "star_rating": stars,
+                "city_tier": hotel.get("city_tier"),
+                "is_preferred_vendor": hotel.get("is_preferred_vendor"),
+                "room_id": room["room_id"],
+                "room_type": room["room_type"],
+                "is_twin_sharing": room.get("is_twin_sharing"),
+                "final_price_per_night": float(room["final_price_per_night"]),
+                "nights": room.get("nights"),
+                "total_stay_price": price
+            }))
+    return candidates
+
+def k_best_plans(
+    lists: Sequence[List[Candidate]],
+    k: int,
+    max_budget: Optional[float] = None
+) -> List[Tuple[float, Tuple[Candidate, ...]]]:
+    """
+    Best k combinations (one candidate per list) by summed score.
+
+    Lists must be sorted by score. Combinations are expanded lazily from a
+    heap, so only O(k · len(lists)) of the full cross product is visited.
+    Candidates that cannot fit the budget even with the cheapest pick from
+    every other list are skipped.
+    """
+    if max_budget is not None:
+        cheapest = [min(c.cost for c in items) if items else 0.0 for items in lists]
+        floor = sum(cheapest)
+        lists = [
+            [c for c in items if c.cost + floor - cheapest[d] <= max_budget]
+            for d, items in enumerate(lists)
+        ]
+    if not lists or any(not items for items in lists):
+        return []
+
+    plans = []
+    start = (0,) * len(lists)
+    heap = [(sum(items[0].score for items in lists), start)]
+    seen = {start}
+    expansions = 0
+
+    while heap and len(plans) < k and expansions < MAX_EXPANSIONS:
+        score, index = heapq.heappop(heap)
+        expansions += 1
+
+        cost = sum(lists[d][i].cost for d, i in enumerate(index))
+        if max_budget is None or cost <= max_budget:
+            plans.append((score, tuple(lists[d][i] for d, i in enumerate(index))))
+
+        for d, i in enumerate(index):
+            if i + 1 < len(lists[d]):
+                successor = index[:d] + (i + 1,) + index[d + 1:]
+                if successor not in seen:
+                    seen.add(successor)
+                    heapq.heappush(heap, (score - lists[d][i].score + lists[d][i + 1].score, successor))
+
+    return plans
+
+class TripPlannerService:
+    """Finds the cheapest policy-compliant flight + hotel combinations"""
+
+    async def call_tool(self, name: str, args: Dict) -> Dict:
+        tool = get_mcp_handler().get_tool(name)
+        if not tool:
+            return {"error": f"Tool {name} not available"}
+        try:
+            return parse_tool_result(await tool.ainvoke(args))
+        except Exception as e:
+            return {"error": f"{name} failed: {e}"}
+
+    async def search_legs(
+        self,
+        origin: str,
+        destination: str,
+        depart_date: str,
+        return_date: Optional[str],
+        grade: str,
+        cabin_class: str = "economy",
+        include_return_flight: bool = True,
+        weights: Optional[TripPlanWeights] = None,
+        compliant_only: bool = True
+    ) -> Tuple[Dict[str, List[Candidate]], List[str]]:
+        """
+        Run the flight/hotel searches for a trip concurrently; candidates per
+        leg plus errors. Pass `compliant_only=False` to keep rooms over the
+        searched grade's nightly cap when candidates are re-evaluated per
+        grade afterwards (rank_plans).
+        """
+        weights = weights or TripPlanWeights()
+        searches = {
+            "outbound": self.call_tool("search_flights", {
+                "origin": origin, "destination": destination, "travel_date": depart_date,
+                "employee_grade": grade, "cabin_class": cabin_class,
+                "sort_by": "price", "limit": CANDIDATE_LIMIT
+            })
+        }
+        if return_date and return_date > depart_date:
+            searches["hotel"] = self.call_tool("search_hotels", {
+                "city": destination, "check_in": depart_date, "check_out": return_date,
+                "employee_grade": grade,
+                "sort_by": "price", "limit": CANDIDATE_LIMIT
+            })
+        if return_date and include_return_flight:
+            searches["return"] = self.call_tool("search_flights", {
+                "origin": destination, "destination": origin, "travel_date": return_date,
+                "employee_grade": grade, "cabin_class": cabin_class,
+                "sort_by": "price", "limit": CANDIDATE_LIMIT
+            })
+
+        responses = dict(zip(searches, await asyncio.gather(*searches.values())))
+        errors = [f"{leg}: {resp['error']}" for leg, resp in responses.items() if resp.get("error")]
+        legs = {
+            leg: room_candidates(response, weights, compliant_only) if leg == "hotel" else flight_candidates(response, weights)
+            for leg, response in responses.items()
+        }
+        return legs, errors
+
+    def rank_plans(
+        self,
+        legs: Dict[str, List[Candidate]],
+        grade: str,
+        top_k: int,
+        max_budget: Optional[float] = None
+    ) -> Tuple[List[Dict], Dict[str, int]]:
+        """Top-k policy-compliant plans for one grade, plus the candidate count per leg"""
+        policy = get_policy_rules()
+        compliant: Dict[str, List[Candidate]] = {}
+        for leg, candidates in legs.items():
+            evaluation = policy.evaluate([c.details for c in candidates], grade)
+            compliant[leg] = sorted(evaluation.filter(candidates), key=lambda c: c.score)
+
+        leg_names = list(compliant)
+        plans = []
+        for rank, (score, combination) in enumerate(
+            k_best_plans([compliant[leg] for leg in leg_names], top_k, max_budget), start=1
+        ):
+            chosen = dict(zip(leg_names, combination))
+            breakdown = {leg: round(candidate.cost, 2) for leg, candidate in chosen.items()}
+            plans.append({
+                "rank": rank,
+                "total_cost": round(sum(breakdown.values()), 2),
+                "weighted_score": round(score, 2),
+                "cost_breakdown": breakdown,
+                **{leg: candidate.details for leg, candidate in chosen.items()}
+            })
+        return plans, {leg: len(items) for leg, items in compliant.items()}
+
+    async def plan(self, request: TripPlanRequest, indent: Optional[Dict] = None) -> Dict:
+        """Top-k trip plans with cost breakdowns"""
+        indent = indent or {}
+        origin = request.origin or indent.get("from_city")
+        destination = request.destination or indent.get("to_city")
+        depart_date = request.depart_date or indent.get("travel_start_date")
+        return_date = request.return_date or indent.get("travel_end_date")
+        grade = request.grade or indent.get("grade") or "E5"
+        if not (origin and destination and depart_date):
+            raise ValueError("origin, destination and depart_date are required (directly or via indent_id)")
+        depart_date, return_date = str(depart_date), str(return_date) if return_date else None
+
+        weights = request.weights
+        legs, errors = await self.search_legs(
+            origin, destination, depart_date, return_date, grade,
+            request.cabin_class, request.include_return_flight, weights
+        )
+        plans, candidate_counts = self.rank_plans(legs, grade, request.top_k, request.max_budget)
+
+        return {
+            "search_criteria": {
+                "origin": origin,
+                "destination": destination,
+                "depart_date": depart_date,
+                "return_date": return_date,
+                "grade": grade,
+                "cabin_class": request.cabin_class,
+                "max_budget": request.max_budget,
+                "weights": weights.model_dump()
+            },
+            "candidates": candidate_counts,
+            "plans": plans,
+            "errors": errors
+        }
+
+# Singleton instance
+_trip_planner_service: Optional[TripPlannerService] = None
+
+def get_trip_planner_service() -> TripPlannerService:
+    """Get trip planner service singleton"""
+    global _trip_planner_service
+    if _trip_planner_service is None:
+        _trip_planner_service = TripPlannerService()
+    return _trip_planner_service
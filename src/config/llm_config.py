@@ -17,4 +17,19 @@ def get_llm():
     """Get singleton LLM instance"""
     if not hasattr(get_llm, '_instance'):
         get_llm._instance = create_llm()
-    return get_llm._instance
\ No newline at end of file
+    return get_llm._instance
+
+def create_fast_llm():
+    """Small, deterministic model for short helper calls such as query rewriting"""
+    return ChatLiteLLM(
+        model=settings.AZURE_FAST_MODEL or settings.AZURE_MODEL,
+        temperature=0,
+        max_tokens=128,
+        verbose=settings.LLM_VERBOSE
+    )
+
+def get_fast_llm():
+    """Get singleton fast LLM instance"""
+    if not hasattr(get_fast_llm, '_instance'):
+        get_fast_llm._instance = create_fast_llm()
+    return get_fast_llm._instance
\ No newline at end of file
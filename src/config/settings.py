@@ -17,6 +17,8 @@ class Settings:
     AZURE_API_BASE = os.getenv("AZURE_API_BASE")
     AZURE_API_VERSION = os.getenv("AZURE_API_VERSION")
     AZURE_MODEL = os.getenv("AZURE_MODEL", "azure/gpt-4o")
+    # Small model for helper calls (query rewriting); empty uses AZURE_MODEL
+    AZURE_FAST_MODEL = os.getenv("AZURE_FAST_MODEL", "")
     AZURE_EMBEDDING_DEPLOYMENT = os.getenv("AZURE_EMBEDDING_DEPLOYMENT", "text-embedding-3-small")
     AZURE_EMBEDDING_MODEL = os.getenv("AZURE_EMBEDDING_MODEL", "text-embedding-3-small")
     
@@ -60,12 +62,40 @@ class Settings:
     MILVUS_DIM = int(os.getenv("MILVUS_DIM", 1536))
     MILVUS_VECTOR_FIELD = os.getenv("MILVUS_VECTOR_FIELD", "vector")
     MILVUS_TEXT_FIELD = os.getenv("MILVUS_TEXT_FIELD", "text")
+    MILVUS_HEALTH_CHECK_SECONDS = int(os.getenv("MILVUS_HEALTH_CHECK_SECONDS", 30))
+    MILVUS_FLUSH_BATCH_SIZE = int(os.getenv("MILVUS_FLUSH_BATCH_SIZE", 1000))
+    MILVUS_FLUSH_INTERVAL_SECONDS = float(os.getenv("MILVUS_FLUSH_INTERVAL_SECONDS", 5))
 
     # ═══════════════════════════════════════════════════════
     # RAG CONFIGURATION
     # ═══════════════════════════════════════════════════════
     RAG_TOP_K = int(os.getenv("RAG_TOP_K", 3))
-    RAG_CONTEXT_MAX_CHARS = int(os.getenv("RAG_CONTEXT_MAX_CHARS", 1800))
+    RAG_CONTEXT_MAX_TOKENS = int(os.getenv("RAG_CONTEXT_MAX_TOKENS", 450))
+    RAG_VECTOR_BACKEND = os.getenv("RAG_VECTOR_BACKEND", "milvus")
+    RAG_LOCAL_INDEX_DIR = os.getenv("RAG_LOCAL_INDEX_DIR", "data/policy_index")
+    POLICY_DOCUMENTS_DIR = os.getenv("POLICY_DOCUMENTS_DIR", "data/policies")
+    RAG_LOCAL_HNSW = os.getenv("RAG_LOCAL_HNSW", "false").lower() == "true"
+    RAG_METADATA_FILTER = os.getenv("RAG_METADATA_FILTER", "true").lower() == "true"
+    RAG_HYBRID = os.getenv("RAG_HYBRID", "true").lower() == "true"
+    RAG_HYBRID_CANDIDATES = int(os.getenv("RAG_HYBRID_CANDIDATES", 20))
+    RAG_RRF_K = int(os.getenv("RAG_RRF_K", 60))
+    RAG_RERANKER = os.getenv("RAG_RERANKER", "heuristic")
+    RAG_CROSS_ENCODER_MODEL = os.getenv("RAG_CROSS_ENCODER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+    RAG_EMBED_CACHE_SIZE = int(os.getenv("RAG_EMBED_CACHE_SIZE", 2048))
+    RAG_EMBED_CACHE_DIR = os.getenv("RAG_EMBED_CACHE_DIR", "")
+    RAG_EMBED_CACHE_DISK_MB = int(os.getenv("RAG_EMBED_CACHE_DISK_MB", 256))
+    RAG_ANSWER_CACHE_THRESHOLD = float(os.getenv("RAG_ANSWER_CACHE_THRESHOLD", 0.95))
+    RAG_ANSWER_CACHE_SIZE = int(os.getenv("RAG_ANSWER_CACHE_SIZE", 512))
+    RAG_ANSWER_CACHE_TTL_SECONDS = int(os.getenv("RAG_ANSWER_CACHE_TTL_SECONDS", 86400))
+    RAG_CORPUS_VERSION_CHECK_SECONDS = int(os.getenv("RAG_CORPUS_VERSION_CHECK_SECONDS", 60))
+    RAG_SEARCH_WORKERS = int(os.getenv("RAG_SEARCH_WORKERS", 8))
+    RAG_EMBED_TIMEOUT_SECONDS = float(os.getenv("RAG_EMBED_TIMEOUT_SECONDS", 10))
+    RAG_SEARCH_TIMEOUT_SECONDS = float(os.getenv("RAG_SEARCH_TIMEOUT_SECONDS", 5))
+    RAG_LLM_TIMEOUT_SECONDS = float(os.getenv("RAG_LLM_TIMEOUT_SECONDS", 60))
+    RAG_QUERY_REWRITE = os.getenv("RAG_QUERY_REWRITE", "true").lower() == "true"
+    RAG_REWRITE_HISTORY_TURNS = int(os.getenv("RAG_REWRITE_HISTORY_TURNS", 3))
+    RAG_REWRITE_CACHE_SIZE = int(os.getenv("RAG_REWRITE_CACHE_SIZE", 1024))
+    RAG_REWRITE_TIMEOUT_SECONDS = float(os.getenv("RAG_REWRITE_TIMEOUT_SECONDS", 3))
     
     # ═══════════════════════════════════════════════════════
     # MCP CONFIGURATION
@@ -77,5 +107,21 @@ class Settings:
     MCP_HOTEL_COMMAND = os.getenv("MCP_HOTEL_COMMAND", "npx")
     MCP_HOTEL_ARGS = os.getenv("MCP_HOTEL_ARGS", "-y,mcp-remote,http://127.0.0.1:8002/mcp").split(",")
 
+    # ═══════════════════════════════════════════════════════
+    # BATCH BOOKING
+    # ═══════════════════════════════════════════════════════
+    BATCH_BOOKING_CONCURRENCY = int(os.getenv("BATCH_BOOKING_CONCURRENCY", 4))
+    BATCH_BOOKING_MAX_INDENTS = int(os.getenv("BATCH_BOOKING_MAX_INDENTS", 100))
+
+    # ═══════════════════════════════════════════════════════
+    # BACKGROUND JOBS
+    # ═══════════════════════════════════════════════════════
+    JOB_QUEUE_DB_PATH = os.getenv("JOB_QUEUE_DB_PATH", "data/jobs.sqlite3")
+    JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", 2))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+    JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", 5))
+    JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", 300))
+    JOB_TIMEOUT_SECONDS = float(os.getenv("JOB_TIMEOUT_SECONDS", 900))
+
 # Global settings instance
 settings = Settings()
\ No newline at end of file
@@ -21,6 +21,8 @@ _HR_ACTION_STATUSES = {
     "hr_approved",
     "completed_hr",
     "booked",
+    "booking_hr",
+    "partial_hr",
 }
  
 _HR_ELIGIBLE_STATUSES = _MANAGER_APPROVED_STATUSES | _HR_ACTION_STATUSES
@@ -603,6 +605,10 @@ def get_employee_travel_indents(employee_id: str):
             status_clean = "Approved by manager (Pending HR)"
         elif status_code in ("completed_hr", "hr_approved", "booked", "hr_approved"):
             status_clean = "Completed booking"
+        elif status_code == "booking_hr":
+            status_clean = "Booking in progress"
+        elif status_code == "partial_hr":
+            status_clean = "Partially booked (HR review)"
         elif status_code == "rejected_manager":
             status_clean = "Rejected by manager"
         elif status_code == "rejected_hr":
@@ -14,6 +14,9 @@ from src.api.manager_router import router as manager_router
 # MCP-based HR router
 from src.api.hr_mcp_router import router as hr_mcp_router
 
+# Background jobs
+from src.api.jobs_router import router as jobs_router
+
 # Create FastAPI app
 app = FastAPI(
     title="Travel Management System",
@@ -44,6 +47,11 @@ app.include_router(manager_router, tags=["Manager"])  # Has its own prefix
 # ---------------------------
 app.include_router(hr_mcp_router, prefix="/hr-mcp", tags=["HR - AI Booking"])
 
+# ---------------------------
+# Background Jobs Router
+# ---------------------------
+app.include_router(jobs_router)  # Has its own prefix
+
 # ---------------------------
 # Root Endpoint
 # ---------------------------
@@ -60,7 +68,8 @@ def root():
             "auth": "/auth",
             "employee": "/employee",
             "manager": "/manager",
-            "hr_ai_booking": "/hr-mcp"
+            "hr_ai_booking": "/hr-mcp",
+            "jobs": "/jobs"
         }
     }
 
@@ -4,22 +4,37 @@ Enhanced Airlines MCP Server - Minimal but Powerful
 YASH Travel Policy Compliant
 """
 
-import json
 import psycopg2
 import psycopg2.extras
 from fastmcp import FastMCP
 import os
+import re
+import time
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 import logging
+import sys
 from dotenv import load_dotenv
 
+# Shared MCP helpers live one level up (src/mcp_servers/common) when run from
+# the repository, and next to this file inside the container image
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("airline-booking")
 
 load_dotenv()
 
+from common.background import PeriodicTask
+from common.serialization import dumps
+from common.paging import RESPONSE_MODES, clamp_page, page_info
+from common.reference_cache import ReferenceCache
+from common.db import ReplicaRouter
+from common.policy_rules import get_policy_rules
+from airport_directory import AirportDirectory
+import flight_holds
+
 # Initialize FastMCP server
 mcp = FastMCP(
     name="airline-booking",
@@ -33,6 +48,8 @@ mcp = FastMCP(
     - Cabin class enforcement by employee grade
     - Preferred airline prioritization
     - Real-time seat availability
+    - Temporary seat holds (hold_flight → confirm_flight_hold / release_flight_hold)
+    - Batch booking status lookups (get_flight_booking_statuses)
     
     POLICY RULES:
     - E1-E8: Economy class only
@@ -53,20 +70,86 @@ DB_CONFIG = {
     "sslmode": "require"
 }
 
-def get_db_connection():
-    """Get database connection with error handling"""
+# Optional streaming replica for read-only tools
+REPLICA_DB_CONFIG = {
+    **DB_CONFIG,
+    "host": os.getenv("AIRLINES_DB_REPLICA_HOST"),
+    "port": os.getenv("AIRLINES_DB_REPLICA_PORT", DB_CONFIG["port"])
+}
+
+db_router = ReplicaRouter(
+    DB_CONFIG,
+    REPLICA_DB_CONFIG,
+    max_lag_seconds=float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", 30)),
+    lag_check_seconds=float(os.getenv("DB_REPLICA_LAG_CHECK_SECONDS", 10))
+)
+
+def get_db_connection(read_only: bool = False):
+    """
+    Get database connection with error handling.
+    
+    Read-only callers may be routed to the replica; anything that writes
+    (bookings, holds, cancellations) must use the default primary connection.
+    """
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
+        conn = db_router.connect(read_only=read_only)
         conn.cursor_factory = psycopg2.extras.RealDictCursor
         return conn
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
         raise
 
+# City → airport reference cache (loaded at startup, refreshed in background)
+airport_directory = AirportDirectory(
+    lambda: get_db_connection(read_only=True),
+    refresh_seconds=int(os.getenv("AIRPORT_CACHE_REFRESH_SECONDS", 3600))
+)
+
+PREFERRED_AIRLINE_FIELDS = (
+    'airline_code', 'airline_name', 'country', 'corporate_discount_percent',
+    'quality_rating', 'on_time_performance', 'is_preferred_vendor'
+)
+
+def load_preferred_airlines() -> Dict[str, List[Dict]]:
+    """Preferred airlines by route type, best discount and rating first"""
+    conn = get_db_connection(read_only=True)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT airline_code, airline_name, country, corporate_discount_percent,
+                   quality_rating, on_time_performance, is_preferred_vendor,
+                   is_domestic_approved, is_international_approved
+            FROM airlines 
+            WHERE is_preferred_vendor = TRUE
+            ORDER BY corporate_discount_percent DESC, quality_rating DESC
+        """)
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
+    
+    catalog = {'both': [], 'domestic': [], 'international': []}
+    for row in rows:
+        airline = {field: row[field] for field in PREFERRED_AIRLINE_FIELDS}
+        catalog['both'].append(airline)
+        if row['is_domestic_approved']:
+            catalog['domestic'].append(airline)
+        if row['is_international_approved']:
+            catalog['international'].append(airline)
+    return catalog
+
+# Preferred-vendor catalog served from memory (warmed at startup)
+vendor_catalog = ReferenceCache(
+    "airline-vendor-catalog",
+    load_preferred_airlines,
+    refresh_seconds=int(os.getenv("VENDOR_CATALOG_REFRESH_SECONDS", 900))
+)
+
+# Grade entitlements shared with the hotel server and the API
+policy_rules = get_policy_rules()
+
 def is_business_class_allowed(employee_grade: str, is_international: bool) -> bool:
     """Check if employee grade allows business class"""
-    business_allowed_grades = ['M1', 'M2', 'M3']
-    return employee_grade in business_allowed_grades and is_international
+    return policy_rules.is_cabin_allowed(employee_grade, 'business', is_international)
 
 def generate_booking_reference() -> str:
     """Generate unique booking reference"""
@@ -76,10 +159,33 @@ def generate_booking_reference() -> str:
 
 def get_allowed_cabin_classes(employee_grade: str, is_international: bool) -> List[str]:
     """Get allowed cabin classes based on employee grade and travel type"""
-    if is_business_class_allowed(employee_grade, is_international):
-        return ['economy', 'premium_economy', 'business']
-    else:
-        return ['economy', 'premium_economy']
+    return policy_rules.allowed_cabins(employee_grade, is_international)
+
+# ORDER BY clauses for search_flights(sort_by=...); flight_id keeps pages stable
+FLIGHT_SORT_ORDERS = {
+    'recommended': "al.is_preferred_vendor DESC, final_price ASC",
+    'price': "final_price ASC, al.is_preferred_vendor DESC",
+    'preferred': "al.is_preferred_vendor DESC, al.quality_rating DESC NULLS LAST, final_price ASC",
+    'rating': "al.quality_rating DESC NULLS LAST, final_price ASC",
+    'duration': "f.duration_minutes ASC, final_price ASC"
+}
+
+def reserve_seat(cursor, inventory_id: int) -> Optional[int]:
+    """
+    Atomically take one seat from an inventory row.
+    
+    The guard in the WHERE clause is re-checked after any concurrent update
+    commits, so the last seat can only be taken once. Returns the remaining
+    seat count, or None when the row is sold out.
+    """
+    cursor.execute("""
+        UPDATE flight_inventory
+        SET available_seats = available_seats - 1
+        WHERE inventory_id = %s AND available_seats > 0
+        RETURNING available_seats
+    """, (inventory_id,))
+    row = cursor.fetchone()
+    return row['available_seats'] if row else None
 
 @mcp.tool()
 def search_flights(
@@ -89,11 +195,17 @@ def search_flights(
     employee_grade: str = "E5",
     cabin_class: str = "economy",
     preferred_only: bool = False,
-    max_price: Optional[float] = None
+    max_price: Optional[float] = None,
+    sort_by: str = "recommended",
+    limit: int = 10,
+    offset: int = 0,
+    response_mode: str = "full"
 ) -> str:
     """
     Search for flights with YASH policy compliance.
     
+    Results are paged; use `paging.next_offset` to fetch more.
+    
     Args:
         origin: Departure city
         destination: Arrival city  
@@ -102,30 +214,32 @@ def search_flights(
         cabin_class: Preferred cabin class
         preferred_only: Show only preferred airlines
         max_price: Maximum ticket price
+        sort_by: "recommended" (preferred vendors, then price), "price", "preferred", "rating" or "duration"
+        limit: Flights per page (capped server-side)
+        offset: Number of ranked flights to skip
+        response_mode: "full" for complete flight details, "summary" for a compact top-N list
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Check if route is international
-        cursor.execute("""
-            SELECT DISTINCT orig.country as origin_country, dest.country as dest_country
-            FROM airports orig, airports dest
-            WHERE LOWER(orig.city) = LOWER(%s) AND LOWER(dest.city) = LOWER(%s)
-        """, (origin, destination))
+        if sort_by not in FLIGHT_SORT_ORDERS:
+            return dumps({'error': f'Invalid sort_by. Use one of: {", ".join(FLIGHT_SORT_ORDERS)}'})
+        if response_mode not in RESPONSE_MODES:
+            return dumps({'error': f'Invalid response_mode. Use one of: {", ".join(RESPONSE_MODES)}'})
+        limit, offset = clamp_page(limit, offset)
         
-        route_info = cursor.fetchone()
-        if not route_info:
-            return json.dumps({'error': 'Route not found'}, indent=2)
+        # Resolve cities to airports from the in-memory directory
+        origin_airports = airport_directory.resolve(origin)
+        dest_airports = airport_directory.resolve(destination)
+        if not origin_airports or not dest_airports:
+            return dumps({'error': 'Route not found'})
         
-        is_international = route_info['origin_country'] != route_info['dest_country']
+        is_international = airport_directory.is_international(origin_airports, dest_airports)
         
         # Policy compliance: Check allowed cabin classes
         allowed_classes = get_allowed_cabin_classes(employee_grade, is_international)
         if cabin_class not in allowed_classes:
-            return json.dumps({
+            return dumps({
                 'error': f'Policy violation: Employee grade {employee_grade} not allowed {cabin_class} class for {"international" if is_international else "domestic"} travel. Allowed: {", ".join(allowed_classes)}'
-            }, indent=2)
+            })
         
         # Build search query
         query = """
@@ -142,21 +256,29 @@ def search_flights(
                 CASE 
                     WHEN orig.country != dest.country THEN 'international'
                     ELSE 'domestic'
-                END as travel_type
+                END as travel_type,
+                COUNT(*) OVER () as total_count,
+                MIN(ROUND(fi.base_price * (1 - al.corporate_discount_percent/100), 2)) OVER () as min_final_price,
+                MAX(ROUND(fi.base_price * (1 - al.corporate_discount_percent/100), 2)) OVER () as max_final_price
             FROM flights f
             JOIN airlines al ON f.airline_id = al.airline_id
             JOIN airports orig ON f.origin_airport_id = orig.airport_id
             JOIN airports dest ON f.destination_airport_id = dest.airport_id
             JOIN flight_inventory fi ON f.flight_id = fi.flight_id
             LEFT JOIN baggage_allowance ba ON al.airline_id = ba.airline_id AND fi.cabin_class = ba.cabin_class
-            WHERE LOWER(orig.city) = LOWER(%s)
-            AND LOWER(dest.city) = LOWER(%s)
+            WHERE f.origin_airport_id = ANY(%s)
+            AND f.destination_airport_id = ANY(%s)
             AND fi.flight_date = %s
             AND fi.cabin_class = %s
             AND fi.available_seats > 0
         """
         
-        params = [origin, destination, travel_date, cabin_class]
+        params = [
+            list(origin_airports.airport_ids),
+            list(dest_airports.airport_ids),
+            travel_date,
+            cabin_class
+        ]
         
         # Add filters
         if preferred_only:
@@ -166,14 +288,41 @@ def search_flights(
             query += " AND (fi.base_price * (1 - al.corporate_discount_percent/100)) <= %s"
             params.append(max_price)
         
-        query += " ORDER BY al.is_preferred_vendor DESC, final_price ASC"
+        page_query = query + f" ORDER BY {FLIGHT_SORT_ORDERS[sort_by]}, f.flight_id LIMIT %s OFFSET %s"
         
-        cursor.execute(query, params)
+        conn = get_db_connection(read_only=True)
+        cursor = conn.cursor()
+        cursor.execute(page_query, params + [limit, offset])
         flights = cursor.fetchall()
         
+        if flights:
+            total = flights[0]['total_count']
+            price_range = {'min': flights[0]['min_final_price'], 'max': flights[0]['max_final_price']}
+        elif offset:
+            # Page past the end: the window aggregates are not available
+            cursor.execute(f"SELECT COUNT(*) AS total_count FROM ({query}) matches", params)
+            total = cursor.fetchone()['total_count']
+            price_range = None
+        else:
+            total, price_range = 0, None
+        
         # Format results
         formatted_flights = []
         for flight in flights:
+            if response_mode == "summary":
+                formatted_flights.append({
+                    'flight_id': flight['flight_id'],
+                    'flight_number': f"{flight['airline_code']}{flight['flight_number']}",
+                    'airline': flight['airline_name'],
+                    'departure_time': str(flight['departure_time']),
+                    'arrival_time': str(flight['arrival_time']),
+                    'duration_minutes': flight['duration_minutes'],
+                    'is_direct': flight['is_direct'],
+                    'final_price': flight['final_price'],
+                    'is_preferred_vendor': flight['is_preferred_vendor']
+                })
+                continue
+            
             flight_data = {
                 'flight_id': flight['flight_id'],
                 'flight_number': f"{flight['airline_code']}{flight['flight_number']}",
@@ -187,12 +336,12 @@ def search_flights(
                 'aircraft': flight['aircraft_type'],
                 'is_direct': flight['is_direct'],
                 'cabin_class': cabin_class,
-                'base_price': float(flight['base_price']),
-                'corporate_discount_percent': float(flight['corporate_discount_percent']),
-                'final_price': float(flight['final_price']),
+                'base_price': flight['base_price'],
+                'corporate_discount_percent': flight['corporate_discount_percent'],
+                'final_price': flight['final_price'],
                 'available_seats': flight['available_seats'],
                 'is_preferred_vendor': flight['is_preferred_vendor'],
-                'quality_rating': float(flight['quality_rating']),
+                'quality_rating': flight['quality_rating'],
                 'travel_type': flight['travel_type'],
                 'baggage': {
                     'checked_bags': flight['checked_bags'],
@@ -216,21 +365,27 @@ def search_flights(
             'search_criteria': {
                 'origin': origin,
                 'destination': destination,
+                'resolved_origin': origin_airports.city,
+                'resolved_destination': dest_airports.city,
                 'travel_date': travel_date,
                 'employee_grade': employee_grade,
                 'cabin_class': cabin_class,
                 'is_international': is_international
             },
             'policy_info': policy_info,
-            'flights_found': len(formatted_flights),
+            'sort_by': sort_by,
+            'response_mode': response_mode,
+            'flights_found': total,
+            'price_range': price_range,
+            'paging': page_info(total, limit, offset, len(formatted_flights)),
             'flights': formatted_flights
         }
         
-        return json.dumps(response, indent=2, default=str)
+        return dumps(response)
         
     except Exception as e:
         logger.error(f"Flight search error: {e}")
-        return json.dumps({'error': f'Flight search failed: {str(e)}'}, indent=2)
+        return dumps({'error': f'Flight search failed: {str(e)}'})
     finally:
         if 'conn' in locals():
             conn.close()
@@ -245,7 +400,7 @@ def get_flight_details(flight_id: int, travel_date: str) -> str:
         travel_date: Travel date (YYYY-MM-DD)
     """
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -271,23 +426,15 @@ def get_flight_details(flight_id: int, travel_date: str) -> str:
         flight = cursor.fetchone()
         
         if not flight:
-            return json.dumps({'error': 'Flight not found'}, indent=2)
+            return dumps({'error': 'Flight not found'})
         
         flight_details = dict(flight)
         
-        # Convert decimal to float for JSON
-        flight_details['base_price'] = float(flight_details['base_price'])
-        flight_details['final_price'] = float(flight_details['final_price'])
-        flight_details['corporate_discount_percent'] = float(flight_details['corporate_discount_percent'])
-        flight_details['quality_rating'] = float(flight_details['quality_rating'])
-        flight_details['on_time_performance'] = float(flight_details['on_time_performance'])
-        flight_details['price_multiplier'] = float(flight_details['price_multiplier'])
-        
-        return json.dumps(flight_details, indent=2, default=str)
+        return dumps(flight_details)
         
     except Exception as e:
         logger.error(f"Flight details error: {e}")
-        return json.dumps({'error': f'Failed to get flight details: {str(e)}'}, indent=2)
+        return dumps({'error': f'Failed to get flight details: {str(e)}'})
     finally:
         if 'conn' in locals():
             conn.close()
@@ -303,7 +450,7 @@ def check_availability(flight_id: int, travel_date: str, cabin_class: str = "eco
         cabin_class: Cabin class to check
     """
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -324,7 +471,7 @@ def check_availability(flight_id: int, travel_date: str, cabin_class: str = "eco
         availability = cursor.fetchone()
         
         if not availability:
-            return json.dumps({'error': 'Flight availability not found'}, indent=2)
+            return dumps({'error': 'Flight availability not found'})
         
         base_price = float(availability['base_price'])
         discount = base_price * (float(availability['corporate_discount_percent']) / 100)
@@ -341,10 +488,10 @@ def check_availability(flight_id: int, travel_date: str, cabin_class: str = "eco
             },
             'pricing': {
                 'base_price': base_price,
-                'corporate_discount_percent': float(availability['corporate_discount_percent']),
+                'corporate_discount_percent': availability['corporate_discount_percent'],
                 'discount_amount': round(discount, 2),
                 'final_price': round(final_price, 2),
-                'price_multiplier': float(availability['price_multiplier'])
+                'price_multiplier': availability['price_multiplier']
             },
             'baggage': {
                 'checked_bags': availability['checked_bags'],
@@ -352,15 +499,182 @@ def check_availability(flight_id: int, travel_date: str, cabin_class: str = "eco
             }
         }
         
-        return json.dumps(availability_info, indent=2, default=str)
+        return dumps(availability_info)
         
     except Exception as e:
         logger.error(f"Availability check error: {e}")
-        return json.dumps({'error': f'Availability check failed: {str(e)}'}, indent=2)
+        return dumps({'error': f'Availability check failed: {str(e)}'})
     finally:
         if 'conn' in locals():
             conn.close()
 
+def get_or_create_traveler(cursor, passenger_name: str, passenger_email: str, employee_grade: str) -> int:
+    """Find the traveler by email, creating a corporate traveler record if missing"""
+    cursor.execute("SELECT traveler_id FROM travelers WHERE email = %s", (passenger_email,))
+    traveler_result = cursor.fetchone()
+    
+    if traveler_result:
+        return traveler_result['traveler_id']
+    
+    # If traveler not found by email, create a new traveler record
+    logger.info(f"Traveler not found with email {passenger_email}, creating new traveler...")
+    cursor.execute("""
+        INSERT INTO travelers (traveler_code, first_name, last_name, email, employee_id, employee_grade, is_corporate, company_name)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        RETURNING traveler_id
+    """, (
+        f"EMP-TEMP-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+        passenger_name.split()[0] if passenger_name else "Unknown",
+        passenger_name.split()[-1] if passenger_name and ' ' in passenger_name else "Unknown",
+        passenger_email,
+        f"TEMP-{datetime.now().strftime('%H%M%S')}",
+        employee_grade,
+        True,
+        'YASH Technologies'
+    ))
+    traveler_id = cursor.fetchone()['traveler_id']
+    logger.info(f"Created new traveler with ID: {traveler_id}")
+    return traveler_id
+
+def fetch_bookable_flight(cursor, flight_id: int, travel_date: str, cabin_class: str):
+    """Get the flight and inventory row needed to book or hold a seat"""
+    cursor.execute("""
+        SELECT 
+            f.flight_id, f.flight_number, f.airline_id,
+            al.airline_name, al.corporate_discount_percent,
+            orig.country as origin_country, dest.country as dest_country,
+            fi.base_price, fi.available_seats, fi.inventory_id, fi.cabin_class,
+            orig.city as origin_city, dest.city as dest_city
+        FROM flights f
+        JOIN airlines al ON f.airline_id = al.airline_id
+        JOIN airports orig ON f.origin_airport_id = orig.airport_id
+        JOIN airports dest ON f.destination_airport_id = dest.airport_id
+        JOIN flight_inventory fi ON f.flight_id = fi.flight_id
+        WHERE f.flight_id = %s AND fi.flight_date = %s AND fi.cabin_class = %s
+    """, (flight_id, travel_date, cabin_class))
+    return cursor.fetchone()
+
+def cabin_policy_error(employee_grade: str, cabin_class: str, is_international: bool) -> Optional[str]:
+    """Return a policy violation message, or None when the cabin is allowed"""
+    allowed_classes = get_allowed_cabin_classes(employee_grade, is_international)
+    if cabin_class in allowed_classes:
+        return None
+    return f'Policy violation: Employee grade {employee_grade} not allowed {cabin_class} class for {"international" if is_international else "domestic"} travel. Allowed: {", ".join(allowed_classes)}'
+
+def flight_pricing(flight_info) -> Dict[str, float]:
+    """Corporate-discounted fare breakdown for a flight inventory row"""
+    base_price = float(flight_info['base_price'])
+    discount_percent = float(flight_info['corporate_discount_percent'])
+    discount_amount = base_price * (discount_percent / 100)
+    return {
+        'base_fare': round(base_price, 2),
+        'corporate_discount_percent': discount_percent,
+        'discount_amount': round(discount_amount, 2),
+        'final_price': round(base_price - discount_amount, 2),
+        'currency': 'INR'
+    }
+
+def insert_flight_booking(
+    cursor,
+    traveler_id: int,
+    flight_id: int,
+    travel_date: str,
+    cabin_class: str,
+    is_international: bool,
+    seat_preference: str,
+    special_requests: str
+) -> int:
+    """Insert a confirmed booking for a seat that has already been reserved"""
+    # Create booking - SIMPLIFIED to match actual schema
+    cursor.execute("""
+        INSERT INTO flight_bookings (
+            traveler_id, flight_id, booking_date, travel_date, cabin_class, status
+        ) VALUES (%s, %s, %s, %s, %s, %s)
+        RETURNING booking_id
+    """, (
+        traveler_id, flight_id, datetime.now(), travel_date, cabin_class, 'confirmed'
+    ))
+    
+    booking_id = cursor.fetchone()['booking_id']
+    logger.info(f"Created booking with ID: {booking_id}")
+    
+    # Create approval record if international travel
+    if is_international:
+        cursor.execute("""
+            INSERT INTO booking_approvals (
+                booking_id, approver_name, status, approval_date
+            ) VALUES (%s, %s, %s, %s)
+        """, (booking_id, 'BGH Approval Required', 'pending', datetime.now()))
+        logger.info(f"Created international travel approval record for booking {booking_id}")
+    
+    # Add seat preference and special requests if supported by schema.
+    # A savepoint keeps a failure here from aborting the booking transaction.
+    cursor.execute("SAVEPOINT booking_details")
+    try:
+        cursor.execute("""
+            INSERT INTO booking_details (
+                booking_id, seat_preference, special_requests
+            ) VALUES (%s, %s, %s)
+        """, (booking_id, seat_preference, special_requests))
+        cursor.execute("RELEASE SAVEPOINT booking_details")
+    except Exception as detail_error:
+        logger.warning(f"Could not add booking details: {detail_error}")
+        cursor.execute("ROLLBACK TO SAVEPOINT booking_details")
+        # Continue without details if table doesn't exist
+    
+    return booking_id
+
+def build_booking_confirmation(
+    booking_id: int,
+    flight_info,
+    travel_date: str,
+    cabin_class: str,
+    passenger_name: str,
+    passenger_email: str,
+    employee_grade: str,
+    seat_preference: str,
+    special_requests: str
+) -> Dict[str, Any]:
+    """Booking confirmation payload shared by book_flight and confirm_flight_hold"""
+    is_international = flight_info['origin_country'] != flight_info['dest_country']
+    return {
+        'success': True,
+        'booking_id': booking_id,
+        'booking_reference': f"YASH-BK-{booking_id:06d}",
+        'status': 'confirmed',
+        'flight': {
+            'airline': flight_info['airline_name'],
+            'flight_number': flight_info['flight_number'],
+            'route': f"{flight_info['origin_city']} → {flight_info['dest_city']}",
+            'travel_date': travel_date,
+            'cabin_class': cabin_class,
+            'is_international': is_international
+        },
+        'passenger_info': {
+            'name': passenger_name,
+            'email': passenger_email,
+            'employee_grade': employee_grade
+        },
+        'pricing': flight_pricing(flight_info),
+        'policy_compliance': {
+            'status': 'compliant',
+            'employee_grade': employee_grade,
+            'cabin_class_approved': True,
+            'approval_required': is_international,
+            'approval_level': 'BGH' if is_international else 'None',
+            'allowed_cabin_classes': get_allowed_cabin_classes(employee_grade, is_international)
+        },
+        'preferences': {
+            'seat_preference': seat_preference,
+            'special_requests': special_requests
+        },
+        'next_steps': [
+            'Check email for booking confirmation',
+            'Complete web check-in 48 hours before flight',
+            'Carry valid ID proof for airport security'
+        ] + (['International travel approval pending from BGH'] if is_international else [])
+    }
+
 @mcp.tool()
 def book_flight(
     flight_id: int,
@@ -390,129 +704,115 @@ def book_flight(
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # First, try to find the traveler by email
-        cursor.execute("SELECT traveler_id FROM travelers WHERE email = %s", (passenger_email,))
-        traveler_result = cursor.fetchone()
-        
-        traveler_id = None
-        if traveler_result:
-            traveler_id = traveler_result['traveler_id']
-        else:
-            # If traveler not found by email, create a new traveler record
-            logger.info(f"Traveler not found with email {passenger_email}, creating new traveler...")
-            cursor.execute("""
-                INSERT INTO travelers (traveler_code, first_name, last_name, email, employee_id, employee_grade, is_corporate, company_name)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING traveler_id
-            """, (
-                f"EMP-TEMP-{datetime.now().strftime('%Y%m%d%H%M%S')}",
-                passenger_name.split()[0] if passenger_name else "Unknown",
-                passenger_name.split()[-1] if passenger_name and ' ' in passenger_name else "Unknown",
-                passenger_email,
-                f"TEMP-{datetime.now().strftime('%H%M%S')}",
-                employee_grade,
-                True,
-                'YASH Technologies'
-            ))
-            traveler_id = cursor.fetchone()['traveler_id']
-            logger.info(f"Created new traveler with ID: {traveler_id}")
-        
-        # Get flight details and check policy compliance - FIXED QUERY
-        cursor.execute("""
-            SELECT 
-                f.flight_id, f.flight_number, f.airline_id,
-                al.airline_name, al.corporate_discount_percent,
-                orig.country as origin_country, dest.country as dest_country,
-                fi.base_price, fi.available_seats, fi.inventory_id, fi.cabin_class,
-                orig.city as origin_city, dest.city as dest_city
-            FROM flights f
-            JOIN airlines al ON f.airline_id = al.airline_id
-            JOIN airports orig ON f.origin_airport_id = orig.airport_id
-            JOIN airports dest ON f.destination_airport_id = dest.airport_id
-            JOIN flight_inventory fi ON f.flight_id = fi.flight_id
-            WHERE f.flight_id = %s AND fi.flight_date = %s AND fi.cabin_class = %s
-        """, (flight_id, travel_date, cabin_class))
+        traveler_id = get_or_create_traveler(cursor, passenger_name, passenger_email, employee_grade)
         
-        flight_info = cursor.fetchone()
+        flight_info = fetch_bookable_flight(cursor, flight_id, travel_date, cabin_class)
         
         if not flight_info:
             logger.error(f"Flight {flight_id} not found for date {travel_date} in cabin class {cabin_class}")
-            return json.dumps({'error': f'Flight {flight_id} not found for date {travel_date} in cabin class {cabin_class}'}, indent=2)
+            return dumps({'error': f'Flight {flight_id} not found for date {travel_date} in cabin class {cabin_class}'})
         
         logger.info(f"Found flight: {flight_info['airline_name']} {flight_info['flight_number']}")
         
-        # Check availability
-        if flight_info['available_seats'] <= 0:
-            return json.dumps({'error': 'No seats available'}, indent=2)
-        
         # Policy compliance check
         is_international = flight_info['origin_country'] != flight_info['dest_country']
-        allowed_classes = get_allowed_cabin_classes(employee_grade, is_international)
-        
-        if cabin_class not in allowed_classes:
-            return json.dumps({
-                'error': f'Policy violation: Employee grade {employee_grade} not allowed {cabin_class} class for {"international" if is_international else "domestic"} travel. Allowed: {", ".join(allowed_classes)}'
-            }, indent=2)
+        policy_error = cabin_policy_error(employee_grade, cabin_class, is_international)
+        if policy_error:
+            return dumps({'error': policy_error})
         
-        # Calculate pricing
-        base_price = float(flight_info['base_price'])
-        discount_percent = float(flight_info['corporate_discount_percent'])
-        discount_amount = base_price * (discount_percent / 100)
-        final_price = base_price - discount_amount
+        # Reserve the seat first; the booking insert below runs in the same transaction
+        if reserve_seat(cursor, flight_info['inventory_id']) is None:
+            conn.rollback()
+            return dumps({'error': 'No seats available'})
         
-        # Create booking - SIMPLIFIED to match actual schema
-        cursor.execute("""
-            INSERT INTO flight_bookings (
-                traveler_id, flight_id, booking_date, travel_date, cabin_class, status
-            ) VALUES (%s, %s, %s, %s, %s, %s)
-            RETURNING booking_id
-        """, (
-            traveler_id, flight_id, datetime.now(), travel_date, cabin_class, 'confirmed'
-        ))
-        
-        booking_id = cursor.fetchone()['booking_id']
-        logger.info(f"Created booking with ID: {booking_id}")
-        
-        # Create approval record if international travel
-        if is_international:
-            cursor.execute("""
-                INSERT INTO booking_approvals (
-                    booking_id, approver_name, status, approval_date
-                ) VALUES (%s, %s, %s, %s)
-            """, (booking_id, 'BGH Approval Required', 'pending', datetime.now()))
-            logger.info(f"Created international travel approval record for booking {booking_id}")
-        
-        # Update inventory
-        cursor.execute("""
-            UPDATE flight_inventory 
-            SET available_seats = available_seats - 1
-            WHERE inventory_id = %s
-        """, (flight_info['inventory_id'],))
-        
-        # Add seat preference and special requests if supported by schema
-        try:
-            cursor.execute("""
-                INSERT INTO booking_details (
-                    booking_id, seat_preference, special_requests
-                ) VALUES (%s, %s, %s)
-            """, (booking_id, seat_preference, special_requests))
-        except Exception as detail_error:
-            logger.warning(f"Could not add booking details: {detail_error}")
-            # Continue without details if table doesn't exist
+        booking_id = insert_flight_booking(
+            cursor, traveler_id, flight_id, travel_date, cabin_class,
+            is_international, seat_preference, special_requests
+        )
         
         conn.commit()
         logger.info(f"Booking {booking_id} committed successfully")
         
-        # Generate booking reference
-        booking_ref = f"YASH-BK-{booking_id:06d}"
+        booking_confirmation = build_booking_confirmation(
+            booking_id, flight_info, travel_date, cabin_class,
+            passenger_name, passenger_email, employee_grade,
+            seat_preference, special_requests
+        )
+        
+        return dumps(booking_confirmation)
+        
+    except psycopg2.Error as db_error:
+        logger.error(f"Database error during booking: {db_error}")
+        if conn:
+            conn.rollback()
+        return dumps({'error': f'Database error: {str(db_error)}'})
+    except Exception as e:
+        logger.error(f"Booking error: {e}")
+        if conn:
+            conn.rollback()
+        return dumps({'error': f'Booking failed: {str(e)}'})
+    finally:
+        if conn:
+            conn.close()
+
+@mcp.tool()
+def hold_flight(
+    flight_id: int,
+    travel_date: str,
+    passenger_email: str,
+    employee_grade: str = "E5",
+    cabin_class: str = "economy",
+    ttl_seconds: Optional[int] = None
+) -> str:
+    """
+    Temporarily reserve a seat while the rest of the trip is planned.
+    
+    The seat is taken out of inventory until the hold is confirmed with
+    confirm_flight_hold, released with release_flight_hold, or expires.
+    
+    Args:
+        flight_id: Flight ID to hold
+        travel_date: Travel date (YYYY-MM-DD)
+        passenger_email: Email address of passenger
+        employee_grade: YASH employee grade
+        cabin_class: Cabin class to hold
+        ttl_seconds: Hold duration in seconds (server default if omitted)
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        flight_info = fetch_bookable_flight(cursor, flight_id, travel_date, cabin_class)
+        if not flight_info:
+            return dumps({'error': f'Flight {flight_id} not found for date {travel_date} in cabin class {cabin_class}'})
+        
+        is_international = flight_info['origin_country'] != flight_info['dest_country']
+        policy_error = cabin_policy_error(employee_grade, cabin_class, is_international)
+        if policy_error:
+            return dumps({'error': policy_error})
+        
+        if reserve_seat(cursor, flight_info['inventory_id']) is None:
+            conn.rollback()
+            return dumps({'error': 'No seats available'})
         
-        # Prepare response
-        booking_confirmation = {
+        ttl = flight_holds.resolve_ttl(ttl_seconds)
+        hold_reference = f"YASH-AIR-HOLD-{os.urandom(4).hex().upper()}"
+        hold = flight_holds.create_hold(
+            cursor, hold_reference, flight_info, travel_date,
+            passenger_email, employee_grade, ttl
+        )
+        conn.commit()
+        logger.info(f"Created flight hold {hold_reference} for inventory {flight_info['inventory_id']}")
+        
+        return dumps({
             'success': True,
-            'booking_id': booking_id,
-            'booking_reference': booking_ref,
-            'status': 'confirmed',
+            'hold_reference': hold_reference,
+            'status': 'held',
+            'expires_at': hold['expires_at'],
+            'ttl_seconds': ttl,
             'flight': {
+                'flight_id': flight_id,
                 'airline': flight_info['airline_name'],
                 'flight_number': flight_info['flight_number'],
                 'route': f"{flight_info['origin_city']} → {flight_info['dest_city']}",
@@ -520,53 +820,169 @@ def book_flight(
                 'cabin_class': cabin_class,
                 'is_international': is_international
             },
-            'passenger_info': {
-                'name': passenger_name,
-                'email': passenger_email,
-                'employee_grade': employee_grade
-            },
-            'pricing': {
-                'base_fare': round(base_price, 2),
-                'corporate_discount_percent': discount_percent,
-                'discount_amount': round(discount_amount, 2),
-                'final_price': round(final_price, 2),
-                'currency': 'INR'
-            },
-            'policy_compliance': {
-                'status': 'compliant',
-                'employee_grade': employee_grade,
-                'cabin_class_approved': True,
-                'approval_required': is_international,
-                'approval_level': 'BGH' if is_international else 'None',
-                'allowed_cabin_classes': allowed_classes
-            },
-            'preferences': {
-                'seat_preference': seat_preference,
-                'special_requests': special_requests
-            },
+            'pricing': flight_pricing(flight_info),
             'next_steps': [
-                'Check email for booking confirmation',
-                'Complete web check-in 48 hours before flight',
-                'Carry valid ID proof for airport security'
-            ] + (['International travel approval pending from BGH'] if is_international else [])
-        }
+                'Call confirm_flight_hold to book the held seat',
+                'Call release_flight_hold if the trip is not going ahead'
+            ]
+        })
+        
+    except Exception as e:
+        logger.error(f"Hold error: {e}")
+        if conn:
+            conn.rollback()
+        return dumps({'error': f'Hold failed: {str(e)}'})
+    finally:
+        if conn:
+            conn.close()
+
+@mcp.tool()
+def confirm_flight_hold(
+    hold_reference: str,
+    passenger_name: str,
+    passenger_email: str,
+    seat_preference: str = "No Preference",
+    special_requests: str = ""
+) -> str:
+    """
+    Turn an active seat hold into a confirmed booking.
+    
+    Args:
+        hold_reference: Reference returned by hold_flight
+        passenger_name: Full name of passenger
+        passenger_email: Email address of passenger
+        seat_preference: Seat preference
+        special_requests: Any special requests
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
         
-        return json.dumps(booking_confirmation, indent=2, default=str)
+        hold = flight_holds.lock_hold(cursor, hold_reference)
+        if not hold:
+            return dumps({'error': 'Hold not found'})
         
-    except psycopg2.Error as db_error:
-        logger.error(f"Database error during booking: {db_error}")
+        if not flight_holds.is_owner(hold, passenger_email):
+            return dumps({'error': 'Hold was placed for a different passenger'})
+        
+        if hold['status'] != 'held':
+            return dumps({'error': f"Hold is {hold['status']}", 'booking_id': hold['booking_id']})
+        
+        if hold['is_expired']:
+            flight_holds.return_hold(cursor, hold, 'expired')
+            conn.commit()
+            return dumps({'error': 'Hold expired; seat returned to inventory'})
+        
+        travel_date = str(hold['travel_date'])
+        cabin_class = hold['cabin_class']
+        employee_grade = hold['employee_grade'] or "E5"
+        flight_info = fetch_bookable_flight(cursor, hold['flight_id'], travel_date, cabin_class)
+        if not flight_info:
+            flight_holds.return_hold(cursor, hold, 'released')
+            conn.commit()
+            return dumps({'error': 'Flight is no longer bookable; hold released'})
+        is_international = flight_info['origin_country'] != flight_info['dest_country']
+        
+        traveler_id = get_or_create_traveler(cursor, passenger_name, passenger_email, employee_grade)
+        booking_id = insert_flight_booking(
+            cursor, traveler_id, hold['flight_id'], travel_date, cabin_class,
+            is_international, seat_preference, special_requests
+        )
+        
+        cursor.execute("""
+            UPDATE flight_holds SET status = 'confirmed', booking_id = %s
+            WHERE hold_id = %s
+        """, (booking_id, hold['hold_id']))
+        
+        conn.commit()
+        logger.info(f"Hold {hold_reference} confirmed as booking {booking_id}")
+        
+        booking_confirmation = build_booking_confirmation(
+            booking_id, flight_info, travel_date, cabin_class,
+            passenger_name, passenger_email, employee_grade,
+            seat_preference, special_requests
+        )
+        booking_confirmation['hold_reference'] = hold_reference
+        
+        return dumps(booking_confirmation)
+        
+    except Exception as e:
+        logger.error(f"Hold confirmation error: {e}")
         if conn:
             conn.rollback()
-        return json.dumps({'error': f'Database error: {str(db_error)}'}, indent=2)
+        return dumps({'error': f'Hold confirmation failed: {str(e)}'})
+    finally:
+        if conn:
+            conn.close()
+
+@mcp.tool()
+def release_flight_hold(hold_reference: str) -> str:
+    """
+    Release an active seat hold and return the seat to inventory.
+    
+    Args:
+        hold_reference: Reference returned by hold_flight
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        hold = flight_holds.lock_hold(cursor, hold_reference)
+        if not hold:
+            return dumps({'error': 'Hold not found'})
+        
+        if hold['status'] != 'held':
+            return dumps({'error': f"Hold is already {hold['status']}"})
+        
+        flight_holds.return_hold(cursor, hold, 'released')
+        conn.commit()
+        
+        return dumps({
+            'success': True,
+            'hold_reference': hold_reference,
+            'status': 'released'
+        })
+        
     except Exception as e:
-        logger.error(f"Booking error: {e}")
+        logger.error(f"Hold release error: {e}")
         if conn:
             conn.rollback()
-        return json.dumps({'error': f'Booking failed: {str(e)}'}, indent=2)
+        return dumps({'error': f'Hold release failed: {str(e)}'})
     finally:
         if conn:
             conn.close()
             
+# Inventory is keyed by (flight, date, cabin); joining on flight_id alone
+# would multiply rows across every inventory date of the flight
+BOOKING_STATUS_SQL = """
+    SELECT 
+        fb.booking_id, fb.booking_date, fb.status,
+        t.first_name, t.last_name, t.email, t.employee_grade,
+        al.airline_name, f.flight_number,
+        orig.city as origin_city, dest.city as dest_city,
+        fb.travel_date as flight_date, fb.cabin_class, fi.base_price,
+        ba.status as approval_status
+    FROM flight_bookings fb
+    JOIN travelers t ON fb.traveler_id = t.traveler_id
+    JOIN flights f ON fb.flight_id = f.flight_id
+    JOIN airlines al ON f.airline_id = al.airline_id
+    JOIN airports orig ON f.origin_airport_id = orig.airport_id
+    JOIN airports dest ON f.destination_airport_id = dest.airport_id
+    LEFT JOIN flight_inventory fi ON fi.flight_id = fb.flight_id
+        AND fi.flight_date = fb.travel_date
+        AND fi.cabin_class = fb.cabin_class
+    LEFT JOIN booking_approvals ba ON fb.booking_id = ba.booking_id
+"""
+
+BOOKING_STATUS_BATCH_LIMIT = int(os.getenv("BOOKING_STATUS_BATCH_LIMIT", 200))
+
+def parse_booking_reference(reference: str) -> Optional[int]:
+    """Booking ID from a YASH-BK-000123 style reference"""
+    match = re.fullmatch(r"YASH-BK-(\d+)", (reference or "").strip().upper())
+    return int(match.group(1)) if match else None
+
 @mcp.tool()
 def get_booking_status(booking_id: int) -> str:
     """
@@ -576,99 +992,136 @@ def get_booking_status(booking_id: int) -> str:
         booking_id: Booking ID number
     """
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT 
-                fb.booking_id, fb.booking_date, fb.status,
-                t.first_name, t.last_name, t.email, t.employee_grade,
-                al.airline_name, f.flight_number,
-                orig.city as origin_city, dest.city as dest_city,
-                fi.flight_date, fi.cabin_class, fi.base_price,
-                ba.status as approval_status
-            FROM flight_bookings fb
-            JOIN travelers t ON fb.traveler_id = t.traveler_id
-            JOIN flights f ON fb.flight_id = f.flight_id
-            JOIN airlines al ON f.airline_id = al.airline_id
-            JOIN airports orig ON f.origin_airport_id = orig.airport_id
-            JOIN airports dest ON f.destination_airport_id = dest.airport_id
-            JOIN flight_inventory fi ON f.flight_id = fi.flight_id
-            LEFT JOIN booking_approvals ba ON fb.booking_id = ba.booking_id
-            WHERE fb.booking_id = %s
-        """, (booking_id,))
+        cursor.execute(BOOKING_STATUS_SQL + " WHERE fb.booking_id = %s", (booking_id,))
         
         booking = cursor.fetchone()
         
         if not booking:
-            return json.dumps({'error': 'Booking not found'}, indent=2)
+            return dumps({'error': 'Booking not found'})
         
         booking_info = dict(booking)
-        # Convert decimal to float
-        if booking_info['base_price']:
-            booking_info['base_price'] = float(booking_info['base_price'])
         
-        return json.dumps(booking_info, indent=2, default=str)
+        return dumps(booking_info)
         
     except Exception as e:
         logger.error(f"Status check error: {e}")
-        return json.dumps({'error': f'Status check failed: {str(e)}'}, indent=2)
+        return dumps({'error': f'Status check failed: {str(e)}'})
     finally:
         if 'conn' in locals():
             conn.close()
 
 @mcp.tool()
-def get_preferred_airlines(route_type: str = "both") -> str:
+def get_flight_booking_statuses(
+    booking_ids: Optional[List[int]] = None,
+    booking_references: Optional[List[str]] = None
+) -> str:
     """
-    Get list of YASH preferred airlines.
+    Get the status of many flight bookings in one call.
     
     Args:
-        route_type: "domestic", "international", or "both"
+        booking_ids: Booking ID numbers
+        booking_references: Booking references (YASH-BK-000123)
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        query = """
-            SELECT airline_code, airline_name, country, corporate_discount_percent,
-                   quality_rating, on_time_performance, is_preferred_vendor
-            FROM airlines 
-            WHERE is_preferred_vendor = TRUE
-        """
+        requested = {}
+        invalid_references = []
+        for booking_id in booking_ids or []:
+            requested.setdefault(int(booking_id), str(booking_id))
+        for reference in booking_references or []:
+            booking_id = parse_booking_reference(reference)
+            if booking_id is None:
+                invalid_references.append(reference)
+            else:
+                requested.setdefault(booking_id, reference)
         
-        if route_type == "domestic":
-            query += " AND is_domestic_approved = TRUE"
-        elif route_type == "international":
-            query += " AND is_international_approved = TRUE"
+        if not requested and not invalid_references:
+            return dumps({'error': 'Provide booking_ids or booking_references'})
+        if len(requested) > BOOKING_STATUS_BATCH_LIMIT:
+            return dumps({'error': f'At most {BOOKING_STATUS_BATCH_LIMIT} bookings per call'})
         
-        query += " ORDER BY corporate_discount_percent DESC, quality_rating DESC"
+        bookings = {}
+        if requested:
+            conn = get_db_connection(read_only=True)
+            cursor = conn.cursor()
+            cursor.execute(BOOKING_STATUS_SQL + " WHERE fb.booking_id = ANY(%s)", (list(requested),))
+            for row in cursor.fetchall():
+                bookings.setdefault(row['booking_id'], dict(row))
         
-        cursor.execute(query)
-        airlines = cursor.fetchall()
+        return dumps({
+            'requested': len(requested) + len(invalid_references),
+            'found': len(bookings),
+            'bookings': [bookings[booking_id] for booking_id in requested if booking_id in bookings],
+            'not_found': [key for booking_id, key in requested.items() if booking_id not in bookings] + invalid_references
+        })
         
-        preferred_airlines = []
-        for airline in airlines:
-            airline_dict = dict(airline)
-            airline_dict['corporate_discount_percent'] = float(airline_dict['corporate_discount_percent'])
-            airline_dict['quality_rating'] = float(airline_dict['quality_rating'])
-            airline_dict['on_time_performance'] = float(airline_dict['on_time_performance'])
-            preferred_airlines.append(airline_dict)
+    except Exception as e:
+        logger.error(f"Batch status check error: {e}")
+        return dumps({'error': f'Status check failed: {str(e)}'})
+    finally:
+        if 'conn' in locals():
+            conn.close()
+
+@mcp.tool()
+def get_preferred_airlines(route_type: str = "both") -> str:
+    """
+    Get list of YASH preferred airlines.
+    
+    Args:
+        route_type: "domestic", "international", or "both"
+    """
+    try:
+        catalog = vendor_catalog.get()
+        preferred_airlines = catalog.get(route_type, catalog['both'])
         
-        return json.dumps({
+        return dumps({
             'route_type': route_type,
             'preferred_airlines_count': len(preferred_airlines),
             'preferred_airlines': preferred_airlines
-        }, indent=2, default=str)
+        })
         
     except Exception as e:
         logger.error(f"Preferred airlines error: {e}")
-        return json.dumps({'error': f'Failed to get preferred airlines: {str(e)}'}, indent=2)
-    finally:
-        if 'conn' in locals():
-            conn.close()
+        return dumps({'error': f'Failed to get preferred airlines: {str(e)}'})
+
+@mcp.tool()
+def refresh_airline_vendor_catalog() -> str:
+    """
+    Admin: reload the preferred-airline catalog from the database now.
+    """
+    try:
+        return dumps(vendor_catalog.refresh())
+    except Exception as e:
+        logger.error(f"Vendor catalog refresh error: {e}")
+        return dumps({'error': f'Vendor catalog refresh failed: {str(e)}', 'cache': vendor_catalog.stats()})
+
+@mcp.tool()
+def get_airline_cache_health() -> str:
+    """
+    Report freshness of the airline server's in-memory reference caches.
+    """
+    airports_age = time.time() - airport_directory.loaded_at if airport_directory.loaded_at else None
+    return dumps({
+        'database': db_router.stats(),
+        'vendor_catalog': vendor_catalog.stats(),
+        'airport_directory': {
+            'loaded': airport_directory.loaded_at is not None,
+            'age_seconds': round(airports_age, 1) if airports_age is not None else None
+        }
+    })
 
 if __name__ == "__main__":
     print("✈️ Starting Enhanced Airlines MCP Server...")
     print("📍 YASH Policy Compliant Flight Booking")
     print("✅ Features: Policy enforcement, Corporate discounts, Real-time availability")
+    airport_directory.start()
+    vendor_catalog.start()
+    flight_holds.ensure_schema(get_db_connection)
+    PeriodicTask(
+        "flight-hold-sweeper",
+        lambda: flight_holds.sweep_expired_holds(get_db_connection),
+        flight_holds.HOLD_SWEEP_INTERVAL_SECONDS
+    ).start()
     mcp.run(transport="http", host="0.0.0.0", port=8001)
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+Airport reference cache for the airline MCP server.
+
+Loads the `airports` table once at startup and refreshes it periodically so
+that city → airport resolution is an in-memory lookup instead of a
+`LOWER(city)` scan on every search.
+"""
+
+import difflib
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from common.background import PeriodicTask
+
+logger = logging.getLogger("airline-booking")
+
+# Alternate spellings / former names that refer to the same city
+CITY_ALIAS_GROUPS = (
+    ("mumbai", "bombay"),
+    ("bengaluru", "bangalore", "bengalooru"),
+    ("chennai", "madras"),
+    ("kolkata", "calcutta"),
+    ("delhi", "new delhi"),
+    ("gurugram", "gurgaon"),
+    ("pune", "poona"),
+    ("vadodara", "baroda"),
+    ("thiruvananthapuram", "trivandrum"),
+    ("kochi", "cochin"),
+    ("mysuru", "mysore"),
+    ("visakhapatnam", "vizag"),
+    ("new york", "new york city", "nyc"),
+    ("san francisco", "sf"),
+    ("los angeles", "la"),
+)
+
+FUZZY_MATCH_CUTOFF = 0.85
+
+
+def normalize_city(value: Optional[str]) -> str:
+    """Lowercase, strip punctuation and collapse whitespace"""
+    text = re.sub(r"[^\w\s]", " ", (value or "").lower())
+    return " ".join(text.split())
+
+
+@dataclass(frozen=True)
+class CityAirports:
+    """Resolved airports for a single city"""
+    city: str
+    country: str
+    airport_ids: Tuple[int, ...]
+    airport_codes: Tuple[str, ...] = field(default_factory=tuple)
+
+
+class AirportDirectory:
+    """In-memory city/airport lookup table with periodic refresh"""
+
+    def __init__(self, connection_factory: Callable, refresh_seconds: int = 3600):
+        self._connection_factory = connection_factory
+        self._refresher = PeriodicTask("airport-directory-refresh", self.refresh, max(60, refresh_seconds))
+        # (by_city, by_code, city_keys) swapped as one tuple so readers never
+        # see maps from two different loads
+        self._snapshot: Tuple[Dict[str, CityAirports], Dict[str, CityAirports], List[str]] = ({}, {}, [])
+        self.loaded_at: Optional[float] = None
+
+    # ─────────────────────────────
+    # Loading
+    # ─────────────────────────────
+    def refresh(self) -> None:
+        """Reload the airports table and atomically swap the lookup maps"""
+        conn = self._connection_factory()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT airport_id, airport_code, city, country
+                FROM airports
+                ORDER BY airport_id
+            """)
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        grouped: Dict[str, Dict] = {}
+        for row in rows:
+            key = normalize_city(row['city'])
+            if not key:
+                continue
+            entry = grouped.setdefault(key, {
+                'city': row['city'],
+                'country': row['country'],
+                'ids': [],
+                'codes': []
+            })
+            entry['ids'].append(row['airport_id'])
+            if row['airport_code']:
+                entry['codes'].append(row['airport_code'].upper())
+
+        by_city = {
+            key: CityAirports(
+                city=entry['city'],
+                country=entry['country'],
+                airport_ids=tuple(entry['ids']),
+                airport_codes=tuple(entry['codes'])
+            )
+            for key, entry in grouped.items()
+        }
+        by_code = {}
+        for record in by_city.values():
+            for code in record.airport_codes:
+                by_code[code] = record
+
+        city_count = len(by_city)
+        for group in CITY_ALIAS_GROUPS:
+            record = next((by_city[name] for name in group if name in by_city), None)
+            if record:
+                for name in group:
+                    by_city.setdefault(name, record)
+
+        self._snapshot = (by_city, by_code, list(by_city.keys()))
+        self.loaded_at = time.time()
+
+        logger.info(f"Airport directory loaded: {city_count} cities, {len(by_code)} airports")
+
+    def start(self) -> None:
+        """Load the directory and start the background refresh thread"""
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Initial airport directory load failed: {e}")
+        self._refresher.start()
+
+    def stop(self) -> None:
+        self._refresher.stop()
+
+    # ─────────────────────────────
+    # Lookups
+    # ─────────────────────────────
+    def resolve(self, city: str) -> Optional[CityAirports]:
+        """Resolve a city name, alias or airport code to its airports"""
+        if self.loaded_at is None:
+            self.refresh()
+
+        key = normalize_city(city)
+        if not key:
+            return None
+
+        by_city, by_code, city_keys = self._snapshot
+
+        record = by_city.get(key) or by_code.get(key.upper())
+        if record:
+            return record
+
+        matches = difflib.get_close_matches(key, city_keys, n=1, cutoff=FUZZY_MATCH_CUTOFF)
+        if matches:
+            logger.info(f"Fuzzy matched city '{city}' to '{by_city[matches[0]].city}'")
+            return by_city[matches[0]]
+        return None
+
+    @staticmethod
+    def is_international(origin: CityAirports, destination: CityAirports) -> bool:
+        """Route is international when the two cities are in different countries"""
+        return normalize_city(origin.country) != normalize_city(destination.country)
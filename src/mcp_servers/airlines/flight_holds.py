@@ -0,0 +1,152 @@
+"""
+Temporary seat holds for the airline MCP server.
+
+A hold takes a seat out of `flight_inventory` for a limited time so HR can
+finish planning the trip before confirming it. Expired holds are returned
+to inventory in batches by a background sweeper.
+"""
+
+import logging
+import os
+from typing import Callable, Optional
+
+logger = logging.getLogger("airline-booking")
+
+HOLD_TTL_SECONDS = int(os.getenv("FLIGHT_HOLD_TTL_SECONDS", 900))
+HOLD_MAX_TTL_SECONDS = int(os.getenv("HOLD_MAX_TTL_SECONDS", 3600))
+HOLD_SWEEP_INTERVAL_SECONDS = int(os.getenv("HOLD_SWEEP_INTERVAL_SECONDS", 60))
+HOLD_SWEEP_BATCH_SIZE = int(os.getenv("HOLD_SWEEP_BATCH_SIZE", 200))
+
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS flight_holds (
+        hold_id SERIAL PRIMARY KEY,
+        hold_reference VARCHAR(40) NOT NULL UNIQUE,
+        inventory_id INTEGER NOT NULL,
+        flight_id INTEGER NOT NULL,
+        travel_date DATE NOT NULL,
+        cabin_class VARCHAR(30) NOT NULL,
+        passenger_email VARCHAR(255),
+        employee_grade VARCHAR(20),
+        status VARCHAR(20) NOT NULL DEFAULT 'held',
+        booking_id INTEGER,
+        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        expires_at TIMESTAMP NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_flight_holds_active_expiry
+        ON flight_holds (expires_at) WHERE status = 'held';
+"""
+
+SWEEP_SQL = """
+    WITH expired AS (
+        SELECT hold_id
+        FROM flight_holds
+        WHERE status = 'held' AND expires_at <= NOW()
+        ORDER BY expires_at
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    ), released AS (
+        UPDATE flight_holds h
+        SET status = 'expired'
+        FROM expired e
+        WHERE h.hold_id = e.hold_id
+        RETURNING h.inventory_id
+    ), restored AS (
+        UPDATE flight_inventory fi
+        SET available_seats = fi.available_seats + r.holds
+        FROM (
+            SELECT inventory_id, COUNT(*) AS holds
+            FROM released
+            GROUP BY inventory_id
+        ) r
+        WHERE fi.inventory_id = r.inventory_id
+    )
+    SELECT COUNT(*) AS released FROM released
+"""
+
+
+def resolve_ttl(ttl_seconds: Optional[int]) -> int:
+    """Clamp a requested hold TTL to the configured bounds"""
+    if not ttl_seconds or ttl_seconds <= 0:
+        return HOLD_TTL_SECONDS
+    return min(int(ttl_seconds), HOLD_MAX_TTL_SECONDS)
+
+
+def ensure_schema(connection_factory: Callable) -> None:
+    """Create the holds table if it does not exist yet"""
+    conn = connection_factory()
+    try:
+        conn.cursor().execute(SCHEMA_SQL)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def create_hold(cursor, hold_reference: str, flight_info, travel_date: str,
+                passenger_email: str, employee_grade: str, ttl_seconds: int):
+    """Insert a hold row for a seat that has already been reserved"""
+    cursor.execute("""
+        INSERT INTO flight_holds (
+            hold_reference, inventory_id, flight_id, travel_date, cabin_class,
+            passenger_email, employee_grade, status, expires_at
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, 'held', NOW() + make_interval(secs => %s))
+        RETURNING hold_id, expires_at
+    """, (
+        hold_reference, flight_info['inventory_id'], flight_info['flight_id'], travel_date,
+        flight_info['cabin_class'], passenger_email, employee_grade, ttl_seconds
+    ))
+    return cursor.fetchone()
+
+
+def is_owner(hold, email: str) -> bool:
+    """Whether `email` is the one the hold was placed for (case-insensitive)"""
+    return (hold['passenger_email'] or '').strip().lower() == (email or '').strip().lower()
+
+
+def lock_hold(cursor, hold_reference: str):
+    """Lock a hold row for the rest of the transaction"""
+    cursor.execute("""
+        SELECT hold_id, hold_reference, inventory_id, flight_id, travel_date, cabin_class,
+               passenger_email, employee_grade, status, booking_id, expires_at,
+               expires_at <= NOW() AS is_expired
+        FROM flight_holds
+        WHERE hold_reference = %s
+        FOR UPDATE
+    """, (hold_reference,))
+    return cursor.fetchone()
+
+
+def return_hold(cursor, hold, status: str) -> None:
+    """Close a held hold and give its seat back to inventory"""
+    cursor.execute("""
+        UPDATE flight_holds SET status = %s
+        WHERE hold_id = %s AND status = 'held'
+    """, (status, hold['hold_id']))
+    if cursor.rowcount:
+        cursor.execute("""
+            UPDATE flight_inventory
+            SET available_seats = available_seats + 1
+            WHERE inventory_id = %s
+        """, (hold['inventory_id'],))
+
+
+def sweep_expired_holds(connection_factory: Callable) -> int:
+    """Return expired holds to inventory in batches; returns holds released"""
+    total = 0
+    while True:
+        conn = connection_factory()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(SWEEP_SQL, (HOLD_SWEEP_BATCH_SIZE,))
+            released = cursor.fetchone()['released']
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        total += released
+        if released < HOLD_SWEEP_BATCH_SIZE:
+            break
+    if total:
+        logger.info(f"Released {total} expired flight holds")
+    return total
@@ -0,0 +1,187 @@
+"""
+Concurrency check for the last-unit guards in book_flight and book_hotel.
+
+Forces one flight inventory row (or every night of one room's stay) down
+to a single unit, fires N book_flight / book_hotel calls at it in
+parallel threads, each on its own database connection, and asserts that
+exactly one succeeds and the inventory ends at zero. The bookings made by
+the run are deleted and the original inventory restored afterwards.
+
+Run against a development database (the servers' usual DB_* settings):
+
+    python src/mcp_servers/booking_race_check.py flight --flight-id 12 --travel-date 2026-11-02
+    python src/mcp_servers/booking_race_check.py hotel --hotel-id 3 --room-id 7 \\
+        --check-in 2026-11-02 --check-out 2026-11-05
+
+Exits non-zero when the guard lets more than one booking through.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_server(subdir: str, module: str):
+    """Import a server module the way it runs (its own directory and src/mcp_servers on sys.path)"""
+    for path in (os.path.join(_HERE, subdir), _HERE):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    return importlib.import_module(module)
+
+
+def tool_function(tool) -> Callable:
+    """The plain function behind an @mcp.tool() (FastMCP 2 wraps it in a FunctionTool)"""
+    return getattr(tool, "fn", tool)
+
+
+def fire(call: Callable[[int], str], workers: int) -> List[Dict]:
+    """Run `call(i)` on `workers` threads released together by a barrier"""
+    barrier = threading.Barrier(workers)
+
+    def worker(i: int) -> Dict:
+        barrier.wait()
+        return json.loads(call(i))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(worker, range(workers)))
+
+
+def check_flight(args) -> bool:
+    server = load_server("airlines", "airline_booking_server")
+    book_flight = tool_function(server.book_flight)
+
+    conn = server.get_db_connection()
+    try:
+        cursor = conn.cursor()
+        flight = server.fetch_bookable_flight(cursor, args.flight_id, args.travel_date, args.cabin_class)
+        if not flight:
+            sys.exit(f"No {args.cabin_class} inventory for flight {args.flight_id} on {args.travel_date}")
+        inventory_id, original_seats = flight["inventory_id"], flight["available_seats"]
+        cursor.execute("UPDATE flight_inventory SET available_seats = 1 WHERE inventory_id = %s", (inventory_id,))
+        conn.commit()
+
+        results = fire(lambda i: book_flight(
+            flight_id=args.flight_id,
+            travel_date=args.travel_date,
+            passenger_name=f"Race Check {i}",
+            passenger_email=f"race-check-{i}@example.com",
+            employee_grade=args.grade,
+            cabin_class=args.cabin_class,
+        ), args.workers)
+
+        cursor.execute("SELECT available_seats FROM flight_inventory WHERE inventory_id = %s", (inventory_id,))
+        remaining = cursor.fetchone()["available_seats"]
+        booking_ids = [r["booking_id"] for r in results if not r.get("error") and r.get("booking_id")]
+        if booking_ids:
+            for table in ("booking_details", "booking_approvals", "flight_bookings"):
+                cursor.execute("SAVEPOINT cleanup")
+                try:
+                    cursor.execute(f"DELETE FROM {table} WHERE booking_id = ANY(%s)", (booking_ids,))
+                    cursor.execute("RELEASE SAVEPOINT cleanup")
+                except Exception:
+                    # booking_details is optional in the airline schema
+                    cursor.execute("ROLLBACK TO SAVEPOINT cleanup")
+        cursor.execute(
+            "UPDATE flight_inventory SET available_seats = %s WHERE inventory_id = %s", (original_seats, inventory_id)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return report("book_flight", results, remaining)
+
+
+def check_hotel(args) -> bool:
+    server = load_server("hotel", "hotel_booking_mcp_server")
+    book_hotel = tool_function(server.book_hotel)
+
+    conn = server.get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT date, available_count FROM room_inventory
+            WHERE room_id = %s AND date >= %s AND date < %s
+            ORDER BY date
+        """, (args.room_id, args.check_in, args.check_out))
+        original = [(row["date"], row["available_count"]) for row in cursor.fetchall()]
+        if not original or len(original) != server.calculate_nights(args.check_in, args.check_out):
+            sys.exit(f"Room {args.room_id} has no inventory for every night of {args.check_in} to {args.check_out}")
+        cursor.execute("""
+            UPDATE room_inventory SET available_count = 1
+            WHERE room_id = %s AND date >= %s AND date < %s
+        """, (args.room_id, args.check_in, args.check_out))
+        conn.commit()
+
+        results = fire(lambda i: book_hotel(
+            hotel_id=args.hotel_id,
+            room_id=args.room_id,
+            check_in=args.check_in,
+            check_out=args.check_out,
+            guest_name=f"Race Check {i}",
+            guest_email=f"race-check-{i}@example.com",
+            employee_grade=args.grade,
+        ), args.workers)
+
+        cursor.execute("""
+            SELECT MAX(available_count) AS remaining FROM room_inventory
+            WHERE room_id = %s AND date >= %s AND date < %s
+        """, (args.room_id, args.check_in, args.check_out))
+        remaining = cursor.fetchone()["remaining"]
+        booking_ids = [r["booking_id"] for r in results if not r.get("error") and r.get("booking_id")]
+        if booking_ids:
+            cursor.execute("DELETE FROM hotel_bookings WHERE booking_id = ANY(%s)", (booking_ids,))
+        for date, count in original:
+            cursor.execute(
+                "UPDATE room_inventory SET available_count = %s WHERE room_id = %s AND date = %s",
+                (count, args.room_id, date)
+            )
+        conn.commit()
+    finally:
+        conn.close()
+    return report("book_hotel", results, remaining)
+
+
+def report(tool: str, results: List[Dict], remaining: int) -> bool:
+    succeeded = [r for r in results if not r.get("error")]
+    errors: Dict[str, int] = {}
+    for r in results:
+        if r.get("error"):
+            errors[r["error"]] = errors.get(r["error"], 0) + 1
+    print(f"{tool}: {len(results)} parallel calls, {len(succeeded)} succeeded, {remaining} unit(s) left")
+    for error, count in sorted(errors.items(), key=lambda item: -item[1]):
+        print(f"  {count} x {error}")
+    ok = len(succeeded) == 1 and remaining == 0
+    print("PASS" if ok else "FAIL: expected exactly one booking of the last unit")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fire parallel bookings at the last unit of inventory")
+    parser.add_argument("--workers", type=int, default=20)
+    parser.add_argument("--grade", default="E5")
+    sub = parser.add_subparsers(dest="target", required=True)
+
+    flight = sub.add_parser("flight")
+    flight.add_argument("--flight-id", type=int, required=True)
+    flight.add_argument("--travel-date", required=True)
+    flight.add_argument("--cabin-class", default="economy")
+
+    hotel = sub.add_parser("hotel")
+    hotel.add_argument("--hotel-id", type=int, required=True)
+    hotel.add_argument("--room-id", type=int, required=True)
+    hotel.add_argument("--check-in", required=True)
+    hotel.add_argument("--check-out", required=True)
+
+    args = parser.parse_args()
+    ok = check_flight(args) if args.target == "flight" else check_hotel(args)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Background task helpers for the MCP servers.
+"""
+
+import logging
+import threading
+from typing import Callable, Optional
+
+logger = logging.getLogger("mcp-common")
+
+
+class PeriodicTask:
+    """Run a callable on a daemon thread every `interval_seconds`"""
+
+    def __init__(self, name: str, func: Callable[[], None], interval_seconds: float):
+        self.name = name
+        self._func = func
+        self._interval = max(1.0, float(interval_seconds))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self._func()
+            except Exception as e:
+                logger.error(f"Background task '{self.name}' failed: {e}")
+
+    def start(self) -> None:
+        """Start the worker thread (idempotent)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
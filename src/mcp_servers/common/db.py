@@ -0,0 +1,114 @@
+"""
+Primary/replica connection routing for the MCP servers.
+
+Writes always go to the primary. Read-only tools may use a streaming
+replica when one is configured, as long as its replay lag is within
+`max_lag_seconds`; otherwise (or if the replica cannot be reached) they
+fall back to the primary. A replica whose WAL receiver is not streaming counts as stale.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+import psycopg2
+
+logger = logging.getLogger("mcp-common")
+
+# Zero when the replica has replayed everything it has received, so an idle
+# primary does not make the replica look stale. That only holds while the WAL
+# receiver is streaming: a disconnected replica has also replayed all it
+# received, so without a streaming receiver the lag is unknown (NULL) and the
+# replica is treated as stale. Reading pg_stat_wal_receiver.status needs
+# pg_read_all_stats (or pg_monitor) on the replica user.
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END AS lag_seconds
+"""
+
+
+class ReplicaRouter:
+    """Opens primary or replica connections depending on the workload"""
+
+    def __init__(
+        self,
+        primary_config: Dict,
+        replica_config: Optional[Dict] = None,
+        max_lag_seconds: float = 30,
+        lag_check_seconds: float = 10,
+        retry_after_seconds: float = 30
+    ):
+        self._primary_config = primary_config
+        self._replica_config = replica_config
+        self._max_lag = max_lag_seconds
+        self._lag_check_seconds = lag_check_seconds
+        self._retry_after_seconds = retry_after_seconds
+        self._lock = threading.Lock()
+        self._lag_checked_at = 0.0
+        self._lag_seconds: Optional[float] = None
+        self._replica_down_until = 0.0
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+
+    @property
+    def has_replica(self) -> bool:
+        return bool(self._replica_config and self._replica_config.get("host"))
+
+    def connect(self, read_only: bool = False):
+        """Primary connection, or a replica connection for read-only work when it is healthy"""
+        if read_only and self.has_replica and time.time() >= self._replica_down_until:
+            conn = self._connect_replica()
+            if conn is not None:
+                return conn
+            with self._lock:
+                self.primary_fallbacks += 1
+        return psycopg2.connect(**self._primary_config)
+
+    def _connect_replica(self):
+        try:
+            conn = psycopg2.connect(**self._replica_config)
+        except Exception as e:
+            logger.warning(f"Replica unavailable, reading from primary for {self._retry_after_seconds:.0f}s: {e}")
+            self._replica_down_until = time.time() + self._retry_after_seconds
+            return None
+
+        if time.time() - self._lag_checked_at >= self._lag_check_seconds:
+            try:
+                cursor = conn.cursor()
+                cursor.execute(REPLICA_LAG_SQL)
+                value = cursor.fetchone()[0]
+                conn.rollback()
+                lag = float(value) if value is not None else None
+                if lag is None:
+                    logger.warning("Replica WAL receiver is not streaming; reading from primary")
+            except Exception as e:
+                logger.warning(f"Replica lag check failed: {e}")
+                lag = None
+            with self._lock:
+                self._lag_seconds = lag
+                self._lag_checked_at = time.time()
+
+        if self._lag_seconds is None or self._lag_seconds > self._max_lag:
+            conn.close()
+            return None
+
+        conn.set_session(readonly=True)
+        with self._lock:
+            self.replica_reads += 1
+        return conn
+
+    def stats(self) -> Dict:
+        """Replica routing state for health reporting"""
+        return {
+            'replica_configured': self.has_replica,
+            'replica_lag_seconds': self._lag_seconds,
+            'max_lag_seconds': self._max_lag,
+            'replica_available': self.has_replica and time.time() >= self._replica_down_until,
+            'replica_reads': self.replica_reads,
+            'primary_fallbacks': self.primary_fallbacks
+        }
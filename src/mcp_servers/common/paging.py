@@ -0,0 +1,31 @@
+"""
+Paging helpers shared by the MCP search tools.
+"""
+
+import os
+from typing import Dict, Optional, Tuple
+
+SEARCH_DEFAULT_LIMIT = int(os.getenv("SEARCH_DEFAULT_LIMIT", 10))
+SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", 50))
+
+RESPONSE_MODES = ("full", "summary")
+
+
+def clamp_page(limit: Optional[int], offset: Optional[int]) -> Tuple[int, int]:
+    """Bound a requested page to [1, SEARCH_MAX_LIMIT] rows from a non-negative offset"""
+    if not limit or limit <= 0:
+        limit = SEARCH_DEFAULT_LIMIT
+    return min(int(limit), SEARCH_MAX_LIMIT), max(0, int(offset or 0))
+
+
+def page_info(total: int, limit: int, offset: int, returned: int) -> Dict:
+    """Paging block included in search responses so the model can ask for the next page"""
+    has_more = offset + returned < total
+    return {
+        'total': total,
+        'offset': offset,
+        'limit': limit,
+        'returned': returned,
+        'has_more': has_more,
+        'next_offset': offset + returned if has_more else None
+    }
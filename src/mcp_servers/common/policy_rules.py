@@ -0,0 +1,276 @@
+"""
+YASH travel policy rules shared by the MCP servers and the API.
+
+Grade entitlements (cabin classes, single occupancy, nightly hotel caps by
+city tier and per-diem) are compiled once into frozen lookup tables. The
+defaults encode the cabin and occupancy rules only: nightly caps and
+per-diem amounts are not in code, so POLICY_RULES_PATH must point to a
+JSON file that sets them (without it no nightly cap is enforced), e.g.
+
+    {
+      "grades": {
+        "M1": {"international_cabins": ["economy", "premium_economy", "business"],
+               "single_occupancy": true,
+               "nightly_cap": {"1": 9000, "2": 7000},
+               "per_diem": {"domestic": 3000, "international": 100}}
+      }
+    }
+
+This module has no dependencies on the rest of either server so the API
+can import it as `src.mcp_servers.common.policy_rules`.
+"""
+
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("mcp-common")
+
+CABIN_CLASSES = ("economy", "premium_economy", "business", "first")
+
+_STANDARD_CABINS = ("economy", "premium_economy")
+_SENIOR_GRADES = ("M1", "M2", "M3")
+_SINGLE_OCCUPANCY_GRADES = ("E5", "E6", "E7", "E8", "M1", "M2", "M3")
+
+DEFAULT_RULES = {
+    "grades": {
+        grade: {
+            "domestic_cabins": list(_STANDARD_CABINS),
+            "international_cabins": list(_STANDARD_CABINS) + (["business"] if grade in _SENIOR_GRADES else []),
+            "single_occupancy": grade in _SINGLE_OCCUPANCY_GRADES,
+            "nightly_cap": {},
+            "per_diem": {}
+        }
+        for grade in ("M1", "M2", "M3", "E1", "E2", "E3", "E4", "E5", "E6", "E7", "E8", "T", "AT", "Contract")
+    }
+}
+
+
+_CITY_TIER = re.compile(r"^(?:tier\s*)?(\d+)$", re.IGNORECASE)
+_warned_tiers = set()
+
+
+def _normalize_grade(grade: Optional[str]) -> str:
+    return (grade or "").strip().upper()
+
+
+def parse_city_tier(tier) -> Optional[int]:
+    """City tier as an int (1, "1", "Tier 1"); None, logged once per value, when it is not a tier number"""
+    if tier is None or isinstance(tier, bool):
+        return None
+    if isinstance(tier, int):
+        return tier
+    match = _CITY_TIER.match(str(tier).strip())
+    if match:
+        return int(match.group(1))
+    if tier not in _warned_tiers:
+        _warned_tiers.add(tier)
+        logger.warning(f"Unrecognised city tier {tier!r}; no nightly cap applied")
+    return None
+
+
+@dataclass(frozen=True)
+class GradeEntitlement:
+    """What one employee grade is entitled to"""
+    grade: str
+    domestic_cabins: frozenset = frozenset(_STANDARD_CABINS)
+    international_cabins: frozenset = frozenset(_STANDARD_CABINS)
+    single_occupancy: bool = False
+    nightly_cap: Mapping[int, float] = field(default_factory=lambda: MappingProxyType({}))
+    per_diem: Mapping[str, float] = field(default_factory=lambda: MappingProxyType({}))
+
+    def cabins(self, is_international: bool) -> frozenset:
+        return self.international_cabins if is_international else self.domestic_cabins
+
+    def to_dict(self) -> Dict:
+        return {
+            'grade': self.grade,
+            'domestic_cabins': [c for c in CABIN_CLASSES if c in self.domestic_cabins],
+            'international_cabins': [c for c in CABIN_CLASSES if c in self.international_cabins],
+            'single_occupancy': self.single_occupancy,
+            'nightly_cap_by_city_tier': dict(self.nightly_cap),
+            'per_diem': dict(self.per_diem)
+        }
+
+
+# Grades not in the table get the most restrictive entitlement
+RESTRICTED_ENTITLEMENT = GradeEntitlement(grade="")
+
+
+@dataclass(frozen=True)
+class PolicyEvaluation:
+    """Per-option policy outcome, aligned with the evaluated options"""
+    compliant: np.ndarray                  # bool[n]
+    violations: Tuple[Tuple[str, ...], ...]
+
+    def filter(self, options: Sequence) -> List:
+        return [option for option, ok in zip(options, self.compliant.tolist()) if ok]
+
+    def annotate(self, options: Sequence[Dict]) -> List[Dict]:
+        """Copies of the options with policy_compliant / policy_violations added"""
+        return [
+            {**option, 'policy_compliant': ok, 'policy_violations': list(reasons)}
+            for option, ok, reasons in zip(options, self.compliant.tolist(), self.violations)
+        ]
+
+
+class PolicyRules:
+    """Frozen grade → entitlement tables with vectorized evaluation"""
+
+    def __init__(self, rules: Mapping):
+        entitlements = {}
+        for grade, spec in (rules.get("grades") or {}).items():
+            key = _normalize_grade(grade)
+            entitlements[key] = GradeEntitlement(
+                grade=grade,
+                domestic_cabins=frozenset(spec.get("domestic_cabins", _STANDARD_CABINS)),
+                international_cabins=frozenset(spec.get("international_cabins", _STANDARD_CABINS)),
+                single_occupancy=bool(spec.get("single_occupancy", False)),
+                nightly_cap=MappingProxyType({
+                    parse_city_tier(tier): float(cap) for tier, cap in (spec.get("nightly_cap") or {}).items()
+                    if parse_city_tier(tier) is not None
+                }),
+                per_diem=MappingProxyType({k: float(v) for k, v in (spec.get("per_diem") or {}).items()})
+            )
+        self._entitlements: Mapping[str, GradeEntitlement] = MappingProxyType(entitlements)
+
+    @property
+    def grades(self) -> Tuple[str, ...]:
+        return tuple(e.grade for e in self._entitlements.values())
+
+    def entitlement(self, grade: Optional[str]) -> GradeEntitlement:
+        return self._entitlements.get(_normalize_grade(grade), RESTRICTED_ENTITLEMENT)
+
+    # ─────────────────────────────
+    # Single-answer lookups
+    # ─────────────────────────────
+    def allowed_cabins(self, grade: Optional[str], is_international: bool) -> List[str]:
+        """Allowed cabin classes in policy order (economy first)"""
+        allowed = self.entitlement(grade).cabins(is_international)
+        return [cabin for cabin in CABIN_CLASSES if cabin in allowed]
+
+    def is_cabin_allowed(self, grade: Optional[str], cabin_class: str, is_international: bool) -> bool:
+        return cabin_class in self.entitlement(grade).cabins(is_international)
+
+    def single_occupancy_allowed(self, grade: Optional[str]) -> bool:
+        return self.entitlement(grade).single_occupancy
+
+    def nightly_cap(self, grade: Optional[str], city_tier: Optional[int]) -> Optional[float]:
+        tier = parse_city_tier(city_tier)
+        if tier is None:
+            return None
+        return self.entitlement(grade).nightly_cap.get(tier)
+
+    def per_diem(self, grade: Optional[str], travel_type: str) -> Optional[float]:
+        return self.entitlement(grade).per_diem.get(travel_type)
+
+    # ─────────────────────────────
+    # Batch evaluation
+    # ─────────────────────────────
+    def evaluate(
+        self,
+        options: Sequence[Mapping],
+        grade: Optional[str],
+        is_international: Optional[bool] = None,
+        price_field: str = "final_price_per_night"
+    ) -> PolicyEvaluation:
+        """
+        Check a whole result set against one grade in a single pass.
+
+        Each rule is applied only to options that carry its field:
+        `cabin_class` (flights), `is_twin_sharing` (rooms), and
+        `city_tier` plus `price_field` (nightly cap). An option's own
+        `is_international` / `travel_type` wins over the argument.
+        """
+        n = len(options)
+        if n == 0:
+            return PolicyEvaluation(compliant=np.ones(0, dtype=bool), violations=())
+
+        entitlement = self.entitlement(grade)
+
+        def column(name, default=None):
+            return [option.get(name, default) for option in options]
+
+        international = np.array([
+            (opt_intl if opt_intl is not None
+             else (travel_type == "international") if travel_type is not None
+             else bool(is_international))
+            for opt_intl, travel_type in zip(column('is_international'), column('travel_type'))
+        ], dtype=bool)
+
+        cabins = np.array([cabin or '' for cabin in column('cabin_class')], dtype=object)
+        has_cabin = cabins != ''
+        cabin_ok = ~has_cabin | np.where(
+            international,
+            np.isin(cabins, list(entitlement.international_cabins)),
+            np.isin(cabins, list(entitlement.domestic_cabins))
+        )
+
+        twin_values = column('is_twin_sharing')
+        has_twin = np.array([v is not None for v in twin_values], dtype=bool)
+        is_twin = np.array([bool(v) for v in twin_values], dtype=bool)
+        occupancy_ok = ~has_twin | is_twin | entitlement.single_occupancy
+
+        tiers = [parse_city_tier(tier) for tier in column('city_tier')]
+        caps = np.array([
+            entitlement.nightly_cap.get(tier, np.nan) if tier is not None else np.nan
+            for tier in tiers
+        ], dtype=float)
+        prices = np.array([float(p) if p is not None else np.nan for p in column(price_field)], dtype=float)
+        cap_ok = np.isnan(caps) | np.isnan(prices) | (prices <= caps)
+
+        compliant = cabin_ok & occupancy_ok & cap_ok
+
+        violations = []
+        for i in range(n):
+            if compliant[i]:
+                violations.append(())
+                continue
+            reasons = []
+            if not cabin_ok[i]:
+                reasons.append(
+                    f"{cabins[i]} class not allowed for grade {entitlement.grade or grade} on "
+                    f"{'international' if international[i] else 'domestic'} travel"
+                )
+            if not occupancy_ok[i]:
+                reasons.append(f"grade {entitlement.grade or grade} requires twin sharing")
+            if not cap_ok[i]:
+                reasons.append(f"nightly rate {prices[i]:.2f} exceeds cap {caps[i]:.2f}")
+            violations.append(tuple(reasons))
+
+        return PolicyEvaluation(compliant=compliant, violations=tuple(violations))
+
+
+def load_policy_rules(path: Optional[str] = None) -> PolicyRules:
+    """Built-in rules, with per-grade overrides from a JSON file when configured"""
+    grades = {grade: dict(spec) for grade, spec in DEFAULT_RULES["grades"].items()}
+    path = path or os.getenv("POLICY_RULES_PATH")
+    if path:
+        try:
+            with open(path, encoding="utf-8") as f:
+                overrides = json.load(f).get("grades") or {}
+            for grade, spec in overrides.items():
+                grades.setdefault(grade, {}).update(spec)
+            logger.info(f"Loaded policy overrides for {len(overrides)} grades from {path}")
+        except Exception as e:
+            logger.error(f"Failed to load policy rules from {path}, using defaults: {e}")
+    if not any(spec.get("nightly_cap") for spec in grades.values()):
+        logger.warning("No nightly hotel caps configured; set POLICY_RULES_PATH to enforce them")
+    return PolicyRules({"grades": grades})
+
+
+_policy_rules: Optional[PolicyRules] = None
+
+
+def get_policy_rules() -> PolicyRules:
+    """Get the process-wide policy rules"""
+    global _policy_rules
+    if _policy_rules is None:
+        _policy_rules = load_policy_rules()
+    return _policy_rules
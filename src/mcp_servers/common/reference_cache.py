@@ -0,0 +1,87 @@
+"""
+In-memory cache for slow-changing reference data in the MCP servers.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from common.background import PeriodicTask
+
+logger = logging.getLogger("mcp-common")
+
+
+class ReferenceCache:
+    """
+    Holds the result of `loader()` in memory, reloading it every
+    `refresh_seconds` on a background thread. A failed reload keeps serving
+    the previous value and is reported through `stats()`.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any], refresh_seconds: int = 900):
+        self.name = name
+        self._loader = loader
+        self._refresh_seconds = max(60, refresh_seconds)
+        self._refresher = PeriodicTask(f"{name}-refresh", self.refresh, self._refresh_seconds)
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self._loaded_at: Optional[float] = None
+        self._last_refresh_ms: Optional[float] = None
+        self._refresh_count = 0
+        self._last_error: Optional[str] = None
+        self._last_error_at: Optional[float] = None
+
+    def refresh(self) -> Dict:
+        """Reload now; returns the cache stats"""
+        started = time.perf_counter()
+        try:
+            value = self._loader()
+        except Exception as e:
+            with self._lock:
+                self._last_error = str(e)
+                self._last_error_at = time.time()
+            raise
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        with self._lock:
+            self._value = value
+            self._loaded_at = time.time()
+            self._last_refresh_ms = elapsed_ms
+            self._refresh_count += 1
+            self._last_error = None
+        logger.info(f"Reference cache '{self.name}' refreshed in {elapsed_ms:.0f} ms")
+        return self.stats()
+
+    def get(self) -> Any:
+        """Cached value, loading it synchronously on first use"""
+        if self._loaded_at is None:
+            self.refresh()
+        return self._value
+
+    def start(self) -> None:
+        """Warm the cache and start the background refresh thread"""
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Initial load of reference cache '{self.name}' failed: {e}")
+        self._refresher.start()
+
+    def stats(self) -> Dict:
+        """Freshness and refresh timings for health reporting"""
+        with self._lock:
+            loaded_at = self._loaded_at
+            age = time.time() - loaded_at if loaded_at else None
+            return {
+                'name': self.name,
+                'loaded': loaded_at is not None,
+                'loaded_at': datetime.fromtimestamp(loaded_at).isoformat() if loaded_at else None,
+                'age_seconds': round(age, 1) if age is not None else None,
+                'refresh_interval_seconds': self._refresh_seconds,
+                'is_stale': age is None or age > 2 * self._refresh_seconds,
+                'last_refresh_ms': self._last_refresh_ms,
+                'refresh_count': self._refresh_count,
+                'refresher_running': self._refresher.is_running(),
+                'last_error': self._last_error,
+                'last_error_at': datetime.fromtimestamp(self._last_error_at).isoformat() if self._last_error_at else None
+            }
@@ -0,0 +1,83 @@
+"""
+JSON serialization for MCP tool responses.
+
+Uses orjson, which encodes datetime/date/time, dataclasses and NumPy values
+natively; Decimals from psycopg2 are emitted as JSON numbers. Responses are
+pretty-printed by default; set MCP_COMPACT_JSON=true (or pass compact=True)
+for compact output, which is several times smaller for large result sets.
+"""
+
+import os
+from decimal import Decimal
+from typing import Any, Optional
+
+import orjson
+
+COMPACT_JSON = os.getenv("MCP_COMPACT_JSON", "false").lower() == "true"
+
+_BASE_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for types orjson does not encode natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def dumps(payload: Any, compact: Optional[bool] = None) -> str:
+    """Serialize a tool response to a JSON string"""
+    option = _BASE_OPTIONS
+    if not (COMPACT_JSON if compact is None else compact):
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(payload, default=_default, option=option).decode("utf-8")
+
+
+if __name__ == "__main__":
+    # Encode-time / payload-size comparison on a synthetic large hotel search
+    import json
+    import timeit
+    from datetime import date
+
+    rooms = [
+        {
+            'room_id': i,
+            'room_type': 'Deluxe Twin' if i % 2 else 'Executive King',
+            'base_price': Decimal("4500.00") + i,
+            'final_price_per_night': Decimal("3825.00") + i,
+            'total_stay_price': 11475.0 + i,
+            'max_occupancy': 2,
+            'bed_type': 'twin' if i % 2 else 'king',
+            'is_twin_sharing': bool(i % 2),
+            'women_only': False,
+            'min_availability': 7,
+            'nights': 3
+        }
+        for i in range(600)
+    ]
+    payload = {
+        'search_criteria': {'city': 'Bengaluru', 'check_in': date(2025, 1, 10), 'check_out': date(2025, 1, 13)},
+        'hotels_found': 60,
+        'hotels': [
+            {
+                'hotel_id': h,
+                'hotel_name': f'Hotel {h}',
+                'star_rating': 4,
+                'corporate_discount_percent': Decimal("15.00"),
+                'rooms': rooms[h * 10:(h + 1) * 10]
+            }
+            for h in range(60)
+        ]
+    }
+
+    candidates = {
+        'json indent=2': lambda: json.dumps(payload, indent=2, default=str),
+        'orjson indent=2': lambda: dumps(payload, compact=False),
+        'orjson compact': lambda: dumps(payload, compact=True),
+    }
+    for name, encode in candidates.items():
+        runs = 50
+        seconds = timeit.timeit(encode, number=runs) / runs
+        print(f"{name:<16} {seconds * 1000:8.3f} ms  {len(encode().encode('utf-8')) / 1024:8.1f} KiB")
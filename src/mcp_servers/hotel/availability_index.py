@@ -0,0 +1,287 @@
+"""
+In-process availability index for the hotel MCP server.
+
+Keeps, per city, a NumPy matrix of nightly `available_count` (rooms × days)
+plus per-room price and attribute vectors, so `search_hotels` can answer a
+stay-window query with one vectorized range-minimum instead of a
+hotels/rooms/room_inventory join and GROUP BY. Postgres stays the source
+of truth for bookings; the index is refreshed periodically and patched in
+place after writes made by this process. Patches made while a refresh is
+reading inventory are logged and replayed onto the new snapshot, so a
+refresh never swaps in counts that miss this process's latest writes.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from common.background import PeriodicTask
+
+logger = logging.getLogger("hotel-booking")
+
+
+def _city_key(city: Optional[str]) -> str:
+    return " ".join((city or "").lower().split())
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value), "%Y-%m-%d").date()
+
+
+@dataclass
+class CityBlock:
+    """Column-oriented room data for one city"""
+    rooms: List[Dict]                 # hotel/room attributes, row-aligned with arrays below
+    room_ids: np.ndarray              # int64[n]
+    star_rating: np.ndarray           # int16[n]
+    is_preferred: np.ndarray          # bool[n]
+    is_twin_sharing: np.ndarray       # bool[n]
+    is_women_safe: np.ndarray         # bool[n] (room women_only or women-centric hotel)
+    base_price: np.ndarray            # float64[n]
+    final_price: np.ndarray           # float64[n], corporate discount applied
+    availability: np.ndarray          # int32[n, horizon_days]
+
+
+@dataclass
+class AvailabilityMatch:
+    """Rooms that are available for every night of a stay"""
+    block: Optional[CityBlock]
+    rows: np.ndarray                  # indices into block arrays, in ranking order
+    min_availability: np.ndarray      # int32, aligned with rows
+
+
+class HotelAvailabilityIndex:
+    """Per-city NumPy availability matrices with periodic refresh"""
+
+    def __init__(
+        self,
+        connection_factory: Callable,
+        horizon_days: int = 180,
+        inventory_refresh_seconds: int = 60,
+        catalog_refresh_seconds: int = 900
+    ):
+        self._connection_factory = connection_factory
+        self.horizon_days = max(1, horizon_days)
+        self._catalog_refresh_seconds = max(60, catalog_refresh_seconds)
+        self._refresher = PeriodicTask("availability-index-refresh", self.refresh, inventory_refresh_seconds)
+        self._lock = threading.Lock()
+        self._blocks: Dict[str, CityBlock] = {}
+        self._room_pos: Dict[int, tuple] = {}
+        self._start_date: Optional[date] = None
+        self._catalog_loaded_at = 0.0
+        self.loaded_at: Optional[float] = None
+        # Every apply_delta bumps the generation; while a refresh is running
+        # the deltas are also logged so they can be replayed onto its snapshot
+        self._generation = 0
+        self._refreshes_running = 0
+        self._delta_log: List[tuple] = []
+
+    # ─────────────────────────────
+    # Loading
+    # ─────────────────────────────
+    def _load_catalog(self, cursor) -> Dict[str, List[Dict]]:
+        cursor.execute("""
+            SELECT
+                h.hotel_id, h.hotel_name, h.city, h.country, h.region, h.city_tier,
+                h.star_rating, h.accommodation_type, h.is_yash_arranged,
+                h.is_preferred_vendor, h.corporate_discount_percent, h.is_women_centric,
+                r.room_id, r.room_type, r.base_price, r.max_occupancy,
+                r.bed_type, r.is_twin_sharing, r.women_only
+            FROM hotels h
+            JOIN rooms r ON h.hotel_id = r.hotel_id
+            ORDER BY h.city, h.hotel_id, r.room_id
+        """)
+        by_city: Dict[str, List[Dict]] = {}
+        for row in cursor.fetchall():
+            by_city.setdefault(_city_key(row['city']), []).append(dict(row))
+        return by_city
+
+    def _build_blocks(self, by_city: Dict[str, List[Dict]]) -> Dict[str, CityBlock]:
+        blocks = {}
+        for key, rooms in by_city.items():
+            discount = np.array([float(r['corporate_discount_percent'] or 0) for r in rooms])
+            base_price = np.array([float(r['base_price'] or 0) for r in rooms])
+            blocks[key] = CityBlock(
+                rooms=rooms,
+                room_ids=np.array([r['room_id'] for r in rooms], dtype=np.int64),
+                star_rating=np.array([r['star_rating'] or 0 for r in rooms], dtype=np.int16),
+                is_preferred=np.array([bool(r['is_preferred_vendor']) for r in rooms]),
+                is_twin_sharing=np.array([bool(r['is_twin_sharing']) for r in rooms]),
+                is_women_safe=np.array([bool(r['women_only']) or bool(r['is_women_centric']) for r in rooms]),
+                base_price=base_price,
+                final_price=np.round(base_price * (1 - discount / 100), 2),
+                availability=np.zeros((len(rooms), self.horizon_days), dtype=np.int32)
+            )
+        return blocks
+
+    def refresh(self) -> None:
+        """Reload the inventory window (and the room catalog when it is due)"""
+        start_date = date.today()
+        end_date = start_date + timedelta(days=self.horizon_days)
+        reload_catalog = (
+            not self._blocks
+            or time.time() - self._catalog_loaded_at >= self._catalog_refresh_seconds
+        )
+
+        started = time.perf_counter()
+        with self._lock:
+            self._refreshes_running += 1
+        try:
+            self._refresh(start_date, end_date, reload_catalog, started)
+        finally:
+            with self._lock:
+                self._refreshes_running -= 1
+                if not self._refreshes_running:
+                    self._delta_log.clear()
+
+    def _refresh(self, start_date: date, end_date: date, reload_catalog: bool, started: float) -> None:
+        conn = self._connection_factory()
+        try:
+            cursor = conn.cursor()
+            by_city = self._load_catalog(cursor) if reload_catalog else None
+            # Deltas after this point may be missing from the snapshot and are replayed below.
+            # Writers commit just before apply_delta, so only a write committing in the instant
+            # before the SELECT can be counted twice; the next refresh corrects it.
+            with self._lock:
+                snapshot_generation = self._generation
+            cursor.execute("""
+                SELECT room_id, date, available_count
+                FROM room_inventory
+                WHERE date >= %s AND date < %s
+            """, (start_date, end_date))
+            inventory = cursor.fetchall()
+        finally:
+            conn.close()
+
+        if by_city is not None:
+            blocks = self._build_blocks(by_city)
+        else:
+            blocks = {
+                key: CityBlock(**{
+                    **block.__dict__,
+                    'availability': np.zeros_like(block.availability)
+                })
+                for key, block in self._blocks.items()
+            }
+
+        room_pos = {}
+        for key, block in blocks.items():
+            for row, room_id in enumerate(block.room_ids.tolist()):
+                room_pos[room_id] = (key, row)
+
+        for item in inventory:
+            pos = room_pos.get(item['room_id'])
+            if pos is None:
+                continue
+            day = (_as_date(item['date']) - start_date).days
+            blocks[pos[0]].availability[pos[1], day] = item['available_count'] or 0
+
+        with self._lock:
+            replayed = 0
+            for generation, room_id, check_in, check_out, delta in self._delta_log:
+                if generation > snapshot_generation:
+                    self._patch(blocks, room_pos, start_date, room_id, check_in, check_out, delta)
+                    replayed += 1
+            self._blocks = blocks
+            self._room_pos = room_pos
+            self._start_date = start_date
+            if by_city is not None:
+                self._catalog_loaded_at = time.time()
+            self.loaded_at = time.time()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"Availability index refreshed: {len(room_pos)} rooms in {len(blocks)} cities, "
+            f"{len(inventory)} inventory rows, {replayed} deltas replayed ({elapsed_ms:.0f} ms)"
+        )
+
+    def start(self) -> None:
+        """Build the index and start the background refresh thread"""
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Initial availability index load failed: {e}")
+        self._refresher.start()
+
+    # ─────────────────────────────
+    # Updates from this process
+    # ─────────────────────────────
+    def apply_delta(self, room_id: int, check_in, check_out, delta: int) -> None:
+        """Patch nights [check_in, check_out) after a booking, hold or cancellation"""
+        with self._lock:
+            self._generation += 1
+            if self._refreshes_running:
+                self._delta_log.append((self._generation, room_id, check_in, check_out, delta))
+            self._patch(self._blocks, self._room_pos, self._start_date, room_id, check_in, check_out, delta)
+
+    def _patch(self, blocks, room_pos, start_date, room_id: int, check_in, check_out, delta: int) -> None:
+        pos = room_pos.get(room_id)
+        if pos is None or start_date is None:
+            return
+        start = max(0, (_as_date(check_in) - start_date).days)
+        end = min(self.horizon_days, (_as_date(check_out) - start_date).days)
+        if end > start:
+            blocks[pos[0]].availability[pos[1], start:end] += delta
+
+    # ─────────────────────────────
+    # Queries
+    # ─────────────────────────────
+    def search(
+        self,
+        city: str,
+        check_in: str,
+        check_out: str,
+        min_stars: int = 0,
+        preferred_only: bool = False,
+        women_only: bool = False,
+        twin_sharing_only: bool = False,
+        max_price: Optional[float] = None
+    ) -> Optional[AvailabilityMatch]:
+        """
+        Rooms in a city available for every night in [check_in, check_out).
+
+        Returns None when the index cannot answer (not loaded yet, or the
+        stay falls outside the indexed window) so the caller can fall back
+        to Postgres.
+        """
+        with self._lock:
+            start_date, blocks = self._start_date, self._blocks
+        if start_date is None:
+            return None
+        start = (_as_date(check_in) - start_date).days
+        end = (_as_date(check_out) - start_date).days
+        if start < 0 or end > self.horizon_days or end <= start:
+            return None
+
+        block = blocks.get(_city_key(city))
+        if block is None:
+            return AvailabilityMatch(block=None, rows=np.empty(0, dtype=np.int64),
+                                     min_availability=np.empty(0, dtype=np.int32))
+
+        mask = block.star_rating >= min_stars
+        if preferred_only:
+            mask &= block.is_preferred
+        if women_only:
+            mask &= block.is_women_safe
+        if twin_sharing_only:
+            mask &= block.is_twin_sharing
+        if max_price:
+            mask &= block.final_price <= max_price
+
+        rows = np.flatnonzero(mask)
+        min_availability = block.availability[rows, start:end].min(axis=1)
+        available = min_availability > 0
+        rows, min_availability = rows[available], min_availability[available]
+
+        # Preferred vendors first, then cheapest
+        order = np.lexsort((block.final_price[rows], ~block.is_preferred[rows]))
+        return AvailabilityMatch(block=block, rows=rows[order], min_availability=min_availability[order])
@@ -4,22 +4,37 @@ Enhanced Hotel MCP Server - Minimal but Powerful
 YASH Travel Policy Compliant
 """
 
-import json
 import psycopg2
 import psycopg2.extras
 from fastmcp import FastMCP
 import os
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import logging
+import sys
+import time
 from dotenv import load_dotenv
 
+# Shared MCP helpers live one level up (src/mcp_servers/common) when run from
+# the repository, and next to this file inside the container image
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("hotel-booking")
 
 load_dotenv()
 
+from common.background import PeriodicTask
+from common.serialization import dumps
+from common.paging import RESPONSE_MODES, clamp_page, page_info
+from common.reference_cache import ReferenceCache
+from common.db import ReplicaRouter
+from common.policy_rules import get_policy_rules
+import room_holds
+from availability_index import HotelAvailabilityIndex
+import hotel_details
+
 # Initialize FastMCP server
 mcp = FastMCP(
     name="hotel-booking",
@@ -33,6 +48,8 @@ mcp = FastMCP(
     - Twin sharing policy enforcement
     - Women safety accommodations
     - Real-time availability checking
+    - Temporary room holds (hold_room → confirm_room_hold / release_room_hold)
+    - Batch booking status lookups (get_hotel_booking_statuses)
     
     POLICY RULES:
     - E1-E4, T, AT, Contract: Twin sharing mandatory
@@ -52,27 +69,149 @@ DB_CONFIG = {
     "sslmode": "require"
 }
 
+# Optional streaming replica for read-only tools
+REPLICA_DB_CONFIG = {
+    **DB_CONFIG,
+    "host": os.getenv("HOTEL_DB_REPLICA_HOST"),
+    "port": os.getenv("HOTEL_DB_REPLICA_PORT", DB_CONFIG["port"])
+}
+
+db_router = ReplicaRouter(
+    DB_CONFIG,
+    REPLICA_DB_CONFIG,
+    max_lag_seconds=float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", 30)),
+    lag_check_seconds=float(os.getenv("DB_REPLICA_LAG_CHECK_SECONDS", 10))
+)
 
-def get_db_connection():
-    """Get database connection with error handling"""
+
+def get_db_connection(read_only: bool = False):
+    """
+    Get database connection with error handling.
+    
+    Read-only callers may be routed to the replica; anything that writes
+    (bookings, holds, cancellations) must use the default primary connection.
+    """
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
+        conn = db_router.connect(read_only=read_only)
         conn.cursor_factory = psycopg2.extras.RealDictCursor
         return conn
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
         raise
 
+# Per-city nightly availability matrices used by search_hotels. Refreshed from
+# the primary: the booking deltas patched in between refreshes are dropped
+# once a refresh lands, so its snapshot must already include them, which a
+# lagging replica's would not.
+availability_index = HotelAvailabilityIndex(
+    get_db_connection,
+    horizon_days=int(os.getenv("AVAILABILITY_INDEX_HORIZON_DAYS", 180)),
+    inventory_refresh_seconds=int(os.getenv("AVAILABILITY_INDEX_REFRESH_SECONDS", 60)),
+    catalog_refresh_seconds=int(os.getenv("AVAILABILITY_INDEX_CATALOG_REFRESH_SECONDS", 900))
+)
+
+# Read-through cache for get_hotel_details, invalidated by catalog triggers.
+# Stays on the primary: NOTIFY is not delivered to LISTENers on a replica.
+hotel_details_cache = hotel_details.HotelDetailsCache(
+    get_db_connection,
+    ttl_seconds=int(os.getenv("HOTEL_DETAILS_CACHE_TTL_SECONDS", 600)),
+    max_entries=int(os.getenv("HOTEL_DETAILS_CACHE_MAX_ENTRIES", 1000)),
+    listen_interval_seconds=int(os.getenv("HOTEL_CATALOG_LISTEN_INTERVAL_SECONDS", 5))
+)
+
+def city_key(city: Optional[str]) -> str:
+    return " ".join((city or "").lower().split())
+
+def load_preferred_hotels() -> Dict[str, List[Dict]]:
+    """Preferred vendor hotels by city, highest rated and best discount first"""
+    conn = get_db_connection(read_only=True)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT 
+                hotel_id, hotel_name, city, star_rating, 
+                accommodation_type, corporate_discount_percent,
+                is_yash_arranged, has_caretaker, is_women_centric
+            FROM hotels 
+            WHERE is_preferred_vendor = TRUE
+            ORDER BY star_rating DESC, corporate_discount_percent DESC
+        """)
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
+    
+    catalog: Dict[str, List[Dict]] = {}
+    for row in rows:
+        catalog.setdefault(city_key(row['city']), []).append(dict(row))
+    return catalog
+
+# Preferred-vendor catalog served from memory (warmed at startup)
+vendor_catalog = ReferenceCache(
+    "hotel-vendor-catalog",
+    load_preferred_hotels,
+    refresh_seconds=int(os.getenv("VENDOR_CATALOG_REFRESH_SECONDS", 900))
+)
+
 def calculate_nights(check_in: str, check_out: str) -> int:
     """Calculate number of nights between dates"""
     check_in_date = datetime.strptime(check_in, "%Y-%m-%d")
     check_out_date = datetime.strptime(check_out, "%Y-%m-%d")
     return (check_out_date - check_in_date).days
 
+def reserve_room_nights(cursor, room_id: int, check_in: str, check_out: str) -> bool:
+    """
+    Atomically take one room for every night in [check_in, check_out).
+    
+    All nights are locked in date order (so overlapping stays cannot
+    deadlock) and decremented in a single guarded statement. If any night
+    is sold out or has no inventory row, fewer rows are updated than there
+    are nights and the caller must roll the transaction back.
+    """
+    nights = calculate_nights(str(check_in), str(check_out))
+    if nights <= 0:
+        return False
+    cursor.execute("""
+        WITH stay AS (
+            SELECT room_id, date
+            FROM room_inventory
+            WHERE room_id = %s AND date >= %s AND date < %s
+            AND available_count > 0
+            ORDER BY date
+            FOR UPDATE
+        )
+        UPDATE room_inventory ri
+        SET available_count = ri.available_count - 1
+        FROM stay
+        WHERE ri.room_id = stay.room_id AND ri.date = stay.date
+        AND ri.available_count > 0
+    """, (room_id, check_in, check_out))
+    return cursor.rowcount == nights
+
+# Bookings with a lower booking_id were reserved before stays became half-open
+# and also took the check-out night (BETWEEN check_in AND check_out). Set it to
+# the first booking_id issued by the half-open server; 0 disables the correction.
+LEGACY_CHECKOUT_NIGHT_BEFORE_BOOKING_ID = int(os.getenv("HOTEL_LEGACY_CHECKOUT_NIGHT_BEFORE_BOOKING_ID", 0))
+
+def booked_until(booking: Dict):
+    """End (exclusive) of the nights a booking actually took from room_inventory"""
+    if booking['booking_id'] < LEGACY_CHECKOUT_NIGHT_BEFORE_BOOKING_ID:
+        return booking['check_out_date'] + timedelta(days=1)
+    return booking['check_out_date']
+
+def release_room_nights(cursor, room_id: int, check_in, check_out) -> None:
+    """Give one room back for every night in [check_in, check_out)"""
+    cursor.execute("""
+        UPDATE room_inventory
+        SET available_count = available_count + 1
+        WHERE room_id = %s AND date >= %s AND date < %s
+    """, (room_id, check_in, check_out))
+
+# Grade entitlements shared with the airline server and the API
+policy_rules = get_policy_rules()
+
 def is_single_occupancy_allowed(employee_grade: str) -> bool:
     """Check if employee grade allows single occupancy"""
-    single_allowed_grades = ['E5', 'E6', 'E7', 'E8', 'M1', 'M2', 'M3']
-    return employee_grade in single_allowed_grades
+    return policy_rules.single_occupancy_allowed(employee_grade)
 
 def generate_booking_reference() -> str:
     """Generate unique booking reference"""
@@ -80,6 +219,35 @@ def generate_booking_reference() -> str:
     random_suffix = os.urandom(2).hex()
     return f"YASH-HTL-{timestamp}-{random_suffix}"
 
+def _cheapest_rate(hotel: Dict) -> float:
+    return float(min(room['final_price_per_night'] for room in hotel['rooms']))
+
+# Ranking keys for search_hotels(sort_by=...); hotel_id keeps pages stable
+HOTEL_SORT_KEYS = {
+    'recommended': lambda h: (not h['is_preferred_vendor'], _cheapest_rate(h), h['hotel_id']),
+    'price': lambda h: (_cheapest_rate(h), not h['is_preferred_vendor'], h['hotel_id']),
+    'preferred': lambda h: (not h['is_preferred_vendor'], -(h['star_rating'] or 0), _cheapest_rate(h), h['hotel_id']),
+    'rating': lambda h: (-(h['star_rating'] or 0), _cheapest_rate(h), h['hotel_id'])
+}
+
+def summarize_hotel(hotel: Dict) -> Dict:
+    """Compact hotel entry for response_mode="summary": cheapest room instead of every room type"""
+    cheapest = min(hotel['rooms'], key=lambda room: room['final_price_per_night'])
+    return {
+        'hotel_id': hotel['hotel_id'],
+        'hotel_name': hotel['hotel_name'],
+        'star_rating': hotel['star_rating'],
+        'accommodation_type': hotel['accommodation_type'],
+        'is_preferred_vendor': hotel['is_preferred_vendor'],
+        'room_types_available': len(hotel['rooms']),
+        'cheapest_room': {
+            'room_id': cheapest['room_id'],
+            'room_type': cheapest['room_type'],
+            'final_price_per_night': cheapest['final_price_per_night'],
+            'total_stay_price': cheapest['total_stay_price']
+        }
+    }
+
 @mcp.tool()
 def search_hotels(
     city: str,
@@ -89,11 +257,17 @@ def search_hotels(
     max_price: Optional[float] = None,
     min_stars: int = 3,
     preferred_only: bool = False,
-    women_only: bool = False
+    women_only: bool = False,
+    sort_by: str = "recommended",
+    limit: int = 10,
+    offset: int = 0,
+    response_mode: str = "full"
 ) -> str:
     """
     Search for hotels in a city with YASH policy compliance.
     
+    Results are paged by hotel; use `paging.next_offset` to fetch more.
+    
     Args:
         city: City to search in
         check_in: Check-in date (YYYY-MM-DD)
@@ -103,66 +277,101 @@ def search_hotels(
         min_stars: Minimum star rating (1-5)
         preferred_only: Show only preferred vendors
         women_only: Show only women-safe accommodations
+        sort_by: "recommended" (preferred vendors, then price), "price", "preferred" or "rating"
+        limit: Hotels per page (capped server-side)
+        offset: Number of ranked hotels to skip
+        response_mode: "full" for every matching room type, "summary" for the cheapest room per hotel
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        if sort_by not in HOTEL_SORT_KEYS:
+            return dumps({'error': f'Invalid sort_by. Use one of: {", ".join(HOTEL_SORT_KEYS)}'})
+        if response_mode not in RESPONSE_MODES:
+            return dumps({'error': f'Invalid response_mode. Use one of: {", ".join(RESPONSE_MODES)}'})
+        limit, offset = clamp_page(limit, offset)
         
         nights = calculate_nights(check_in, check_out)
         single_allowed = is_single_occupancy_allowed(employee_grade)
         
-        # Build base query
-        query = """
-            SELECT 
-                h.hotel_id, h.hotel_name, h.city, h.country, h.region, h.city_tier,
-                h.star_rating, h.accommodation_type, h.is_yash_arranged,
-                h.is_preferred_vendor, h.corporate_discount_percent,
-                r.room_id, r.room_type, r.base_price, r.max_occupancy,
-                r.bed_type, r.is_twin_sharing, r.women_only,
-                MIN(ri.available_count) as min_availability,
-                ROUND(r.base_price * (1 - h.corporate_discount_percent/100), 2) as final_price_per_night
-            FROM hotels h
-            JOIN rooms r ON h.hotel_id = r.hotel_id
-            JOIN room_inventory ri ON r.room_id = ri.room_id
-            WHERE LOWER(h.city) = LOWER(%s)
-            AND ri.date BETWEEN %s AND %s
-            AND ri.available_count > 0
-            AND h.star_rating >= %s
-        """
-        
-        params = [city, check_in, check_out, min_stars]
-        
-        # Add filters
-        if preferred_only:
-            query += " AND h.is_preferred_vendor = TRUE"
-        
-        if women_only:
-            query += " AND (r.women_only = TRUE OR h.is_women_centric = TRUE)"
-        
-        # Policy compliance: Room type filtering based on employee grade
-        if not single_allowed:
-            query += " AND r.is_twin_sharing = TRUE"
-        
-        if max_price:
-            query += " AND (r.base_price * (1 - h.corporate_discount_percent/100)) <= %s"
-            params.append(max_price)
-        
-        query += """
-            GROUP BY h.hotel_id, h.hotel_name, h.city, h.country, h.region, h.city_tier,
-                     h.star_rating, h.accommodation_type, h.is_yash_arranged,
-                     h.is_preferred_vendor, h.corporate_discount_percent,
-                     r.room_id, r.room_type, r.base_price, r.max_occupancy,
-                     r.bed_type, r.is_twin_sharing, r.women_only
-            HAVING MIN(ri.available_count) > 0
-            ORDER BY h.is_preferred_vendor DESC, final_price_per_night ASC
-        """
-        
-        cursor.execute(query, params)
-        results = cursor.fetchall()
+        # Answer from the in-memory availability index when it covers the stay
+        match = availability_index.search(
+            city, check_in, check_out,
+            min_stars=min_stars,
+            preferred_only=preferred_only,
+            women_only=women_only,
+            twin_sharing_only=not single_allowed,
+            max_price=max_price
+        )
+        
+        if match is not None:
+            results = [
+                {
+                    **match.block.rooms[row],
+                    'final_price_per_night': float(match.block.final_price[row]),
+                    'min_availability': int(min_availability)
+                }
+                for row, min_availability in zip(match.rows.tolist(), match.min_availability.tolist())
+            ]
+        else:
+            conn = get_db_connection(read_only=True)
+            cursor = conn.cursor()
+            
+            # Build base query
+            query = """
+                SELECT 
+                    h.hotel_id, h.hotel_name, h.city, h.country, h.region, h.city_tier,
+                    h.star_rating, h.accommodation_type, h.is_yash_arranged,
+                    h.is_preferred_vendor, h.corporate_discount_percent,
+                    r.room_id, r.room_type, r.base_price, r.max_occupancy,
+                    r.bed_type, r.is_twin_sharing, r.women_only,
+                    MIN(ri.available_count) as min_availability,
+                    ROUND(r.base_price * (1 - h.corporate_discount_percent/100), 2) as final_price_per_night
+                FROM hotels h
+                JOIN rooms r ON h.hotel_id = r.hotel_id
+                JOIN room_inventory ri ON r.room_id = ri.room_id
+                WHERE LOWER(h.city) = LOWER(%s)
+                AND ri.date >= %s AND ri.date < %s
+                AND h.star_rating >= %s
+            """
+            
+            params = [city, check_in, check_out, min_stars]
+            
+            # Add filters
+            if preferred_only:
+                query += " AND h.is_preferred_vendor = TRUE"
+            
+            if women_only:
+                query += " AND (r.women_only = TRUE OR h.is_women_centric = TRUE)"
+            
+            # Policy compliance: Room type filtering based on employee grade
+            if not single_allowed:
+                query += " AND r.is_twin_sharing = TRUE"
+            
+            if max_price:
+                query += " AND (r.base_price * (1 - h.corporate_discount_percent/100)) <= %s"
+                params.append(max_price)
+            
+            query += """
+                GROUP BY h.hotel_id, h.hotel_name, h.city, h.country, h.region, h.city_tier,
+                         h.star_rating, h.accommodation_type, h.is_yash_arranged,
+                         h.is_preferred_vendor, h.corporate_discount_percent,
+                         r.room_id, r.room_type, r.base_price, r.max_occupancy,
+                         r.bed_type, r.is_twin_sharing, r.women_only
+                HAVING MIN(ri.available_count) > 0
+                AND COUNT(ri.date) = %s
+                ORDER BY h.is_preferred_vendor DESC, final_price_per_night ASC
+            """
+            
+            params.append(nights)
+            
+            cursor.execute(query, params)
+            results = cursor.fetchall()
+            
+        # Nightly caps by city tier; occupancy rules are already applied as filters
+        evaluation = policy_rules.evaluate(results, employee_grade)
         
         hotels_map = {}
         
-        for row in results:
+        for row, compliant, violations in zip(results, evaluation.compliant.tolist(), evaluation.violations):
             hotel_id = row['hotel_id']
             
             if hotel_id not in hotels_map:
@@ -177,27 +386,39 @@ def search_hotels(
                     'accommodation_type': row['accommodation_type'],
                     'is_yash_arranged': row['is_yash_arranged'],
                     'is_preferred_vendor': row['is_preferred_vendor'],
-                    'corporate_discount_percent': float(row['corporate_discount_percent']),
+                    'corporate_discount_percent': row['corporate_discount_percent'],
                     'rooms': []
                 }
             
             room = {
                 'room_id': row['room_id'],
                 'room_type': row['room_type'],
-                'base_price': float(row['base_price']),
-                'final_price_per_night': float(row['final_price_per_night']),
+                'base_price': row['base_price'],
+                'final_price_per_night': row['final_price_per_night'],
                 'total_stay_price': round(float(row['final_price_per_night']) * nights, 2),
                 'max_occupancy': row['max_occupancy'],
                 'bed_type': row['bed_type'],
                 'is_twin_sharing': row['is_twin_sharing'],
                 'women_only': row['women_only'],
                 'min_availability': row['min_availability'],
-                'nights': nights
+                'nights': nights,
+                'policy_compliant': compliant,
+                'policy_violations': list(violations)
             }
             
             hotels_map[hotel_id]['rooms'].append(room)
         
-        hotels_list = list(hotels_map.values())
+        hotels_list = sorted(hotels_map.values(), key=HOTEL_SORT_KEYS[sort_by])
+        total = len(hotels_list)
+        page = hotels_list[offset:offset + limit]
+        if response_mode == "summary":
+            page = [summarize_hotel(hotel) for hotel in page]
+        
+        # Range of each hotel's cheapest nightly rate across all matches
+        price_range = None
+        if hotels_list:
+            rates = [_cheapest_rate(hotel) for hotel in hotels_list]
+            price_range = {'min': min(rates), 'max': max(rates)}
         
         # Add policy information
         policy_info = {
@@ -205,7 +426,8 @@ def search_hotels(
             'single_occupancy_allowed': single_allowed,
             'twin_sharing_required': not single_allowed,
             'preferred_vendor_priority': True,
-            'corporate_discount_applied': True
+            'corporate_discount_applied': True,
+            'nightly_cap_by_city_tier': dict(policy_rules.entitlement(employee_grade).nightly_cap)
         }
         
         response = {
@@ -219,15 +441,19 @@ def search_hotels(
                 'min_stars': min_stars
             },
             'policy_info': policy_info,
-            'hotels_found': len(hotels_list),
-            'hotels': hotels_list
+            'sort_by': sort_by,
+            'response_mode': response_mode,
+            'hotels_found': total,
+            'price_range': price_range,
+            'paging': page_info(total, limit, offset, len(page)),
+            'hotels': page
         }
         
-        return json.dumps(response, indent=2, default=str)
+        return dumps(response)
         
     except Exception as e:
         logger.error(f"Search error: {e}")
-        return json.dumps({'error': f'Search failed: {str(e)}'}, indent=2)
+        return dumps({'error': f'Search failed: {str(e)}'})
     finally:
         if 'conn' in locals():
             conn.close()
@@ -241,62 +467,16 @@ def get_hotel_details(hotel_id: int) -> str:
         hotel_id: ID of the hotel to get details for
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get hotel basic info
-        cursor.execute("""
-            SELECT h.*, 
-                   COUNT(DISTINCT r.room_id) as room_types_count,
-                   COUNT(DISTINCT ha.amenity_id) as amenities_count
-            FROM hotels h
-            LEFT JOIN rooms r ON h.hotel_id = r.hotel_id
-            LEFT JOIN hotel_amenities ha ON h.hotel_id = ha.hotel_id
-            WHERE h.hotel_id = %s
-            GROUP BY h.hotel_id
-        """, (hotel_id,))
-        
-        hotel = cursor.fetchone()
+        hotel = hotel_details_cache.get(hotel_id)
         
         if not hotel:
-            return json.dumps({'error': 'Hotel not found'}, indent=2)
-        
-        # Get amenities
-        cursor.execute("""
-            SELECT amenity_name, amenity_type 
-            FROM hotel_amenities 
-            WHERE hotel_id = %s
-            ORDER BY amenity_type, amenity_name
-        """, (hotel_id,))
-        
-        amenities = cursor.fetchall()
-        
-        # Get room types
-        cursor.execute("""
-            SELECT room_id, room_type, base_price, max_occupancy, 
-                   bed_type, is_twin_sharing, women_only
-            FROM rooms 
-            WHERE hotel_id = %s
-            ORDER BY base_price ASC
-        """, (hotel_id,))
-        
-        rooms = cursor.fetchall()
+            return dumps({'error': 'Hotel not found'})
         
-        hotel_details = dict(hotel)
-        hotel_details['amenities'] = [dict(amenity) for amenity in amenities]
-        hotel_details['room_types'] = [dict(room) for room in rooms]
-        
-        # Convert decimal to float for JSON serialization
-        hotel_details['corporate_discount_percent'] = float(hotel_details['corporate_discount_percent'])
-        
-        return json.dumps(hotel_details, indent=2, default=str)
+        return dumps(hotel)
         
     except Exception as e:
         logger.error(f"Hotel details error: {e}")
-        return json.dumps({'error': f'Failed to get hotel details: {str(e)}'}, indent=2)
-    finally:
-        if 'conn' in locals():
-            conn.close()
+        return dumps({'error': f'Failed to get hotel details: {str(e)}'})
 
 @mcp.tool()
 def check_availability(
@@ -315,10 +495,10 @@ def check_availability(
         check_out: Check-out date (YYYY-MM-DD)
     """
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
-        # Check availability for all dates in the range
+        # Check availability for every night of the stay [check_in, check_out)
         cursor.execute("""
             SELECT 
                 MIN(available_count) as min_availability,
@@ -326,7 +506,7 @@ def check_availability(
                 COUNT(*) as days_checked
             FROM room_inventory
             WHERE room_id = %s 
-            AND date BETWEEN %s AND %s
+            AND date >= %s AND date < %s
         """, (room_id, check_in, check_out))
         
         availability = cursor.fetchone()
@@ -342,7 +522,7 @@ def check_availability(
         room_info = cursor.fetchone()
         
         if not room_info:
-            return json.dumps({'error': 'Room not found'}, indent=2)
+            return dumps({'error': 'Room not found'})
         
         nights = calculate_nights(check_in, check_out)
         base_price = float(room_info['base_price'])
@@ -359,28 +539,148 @@ def check_availability(
             'nights': nights,
             'availability': {
                 'min_available': availability['min_availability'],
-                'avg_available': float(availability['avg_availability']),
+                'avg_available': availability['avg_availability'] or 0,
                 'days_checked': availability['days_checked'],
-                'is_available': availability['min_availability'] > 0
+                'is_available': (
+                    nights > 0
+                    and availability['days_checked'] == nights
+                    and (availability['min_availability'] or 0) > 0
+                )
             },
             'pricing': {
                 'base_price_per_night': base_price,
-                'corporate_discount_percent': float(room_info['corporate_discount_percent']),
+                'corporate_discount_percent': room_info['corporate_discount_percent'],
                 'discount_per_night': round(discount, 2),
                 'final_price_per_night': round(final_price_per_night, 2),
                 'total_stay_price': round(total_price, 2)
             }
         }
         
-        return json.dumps(availability_info, indent=2, default=str)
+        return dumps(availability_info)
         
     except Exception as e:
         logger.error(f"Availability check error: {e}")
-        return json.dumps({'error': f'Availability check failed: {str(e)}'}, indent=2)
+        return dumps({'error': f'Availability check failed: {str(e)}'})
     finally:
         if 'conn' in locals():
             conn.close()
 
+def fetch_room(cursor, hotel_id: int, room_id: int):
+    """Get room and hotel details needed to book or hold a room"""
+    cursor.execute("""
+        SELECT r.*, h.hotel_name, h.city, h.corporate_discount_percent,
+               h.is_yash_arranged, h.accommodation_type
+        FROM rooms r
+        JOIN hotels h ON r.hotel_id = h.hotel_id
+        WHERE r.room_id = %s AND h.hotel_id = %s
+    """, (room_id, hotel_id))
+    return cursor.fetchone()
+
+def occupancy_policy_error(employee_grade: str, room_info) -> Optional[str]:
+    """Return a policy violation message, or None when the room is allowed"""
+    if not is_single_occupancy_allowed(employee_grade) and not room_info['is_twin_sharing']:
+        return f'Policy violation: Employee grade {employee_grade} requires twin sharing accommodation'
+    return None
+
+def room_pricing(room_info, nights: int) -> Dict[str, float]:
+    """Corporate-discounted stay pricing for a room"""
+    base_price = float(room_info['base_price'])
+    discount_percent = float(room_info.get('corporate_discount_percent') or 0)
+    discount_amount = base_price * (discount_percent / 100)
+    final_price_per_night = base_price - discount_amount
+    return {
+        'base_price_per_night': base_price,
+        'corporate_discount_percent': discount_percent,
+        'discount_per_night': round(discount_amount, 2),
+        'final_price_per_night': round(final_price_per_night, 2),
+        'total_amount': round(final_price_per_night * nights, 2),
+        'currency': 'USD'  # Changed to USD for international hotel
+    }
+
+def insert_hotel_booking(
+    cursor,
+    hotel_id: int,
+    room_id: int,
+    room_info,
+    check_in: str,
+    check_out: str,
+    guest_name: str,
+    guest_count: int
+) -> Tuple[int, str]:
+    """Insert a confirmed booking for room nights that have already been reserved"""
+    nights = calculate_nights(check_in, check_out)
+    pricing = room_pricing(room_info, nights)
+    booking_ref = generate_booking_reference()
+    
+    # Create booking - using CORRECT travel_type values from the constraint
+    cursor.execute("""
+        INSERT INTO hotel_bookings (
+            booking_reference, hotel_id, room_id, check_in_date, check_out_date,
+            nights, guest_name, guest_count, total_amount, per_night_rate,
+            corporate_discount, status, travel_type,
+            is_twin_sharing, arranged_by_travel_desk
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        RETURNING booking_id
+    """, (
+        booking_ref, hotel_id, room_id, check_in, check_out,
+        nights, guest_name, guest_count, pricing['total_amount'], pricing['final_price_per_night'],
+        pricing['discount_per_night'] * nights, 'confirmed', 'short_term',  # Changed 'corporate' to 'short_term'
+        room_info['is_twin_sharing'], True
+    ))
+    
+    return cursor.fetchone()['booking_id'], booking_ref
+
+def build_booking_confirmation(
+    booking_id: int,
+    booking_ref: str,
+    room_info,
+    check_in: str,
+    check_out: str,
+    guest_name: str,
+    guest_email: str,
+    employee_grade: str,
+    guest_count: int,
+    special_requests: str
+) -> Dict[str, Any]:
+    """Booking confirmation payload shared by book_hotel and confirm_room_hold"""
+    nights = calculate_nights(check_in, check_out)
+    return {
+        'success': True,
+        'booking_id': booking_id,
+        'booking_reference': booking_ref,
+        'status': 'confirmed',
+        'hotel': {
+            'name': room_info['hotel_name'],
+            'city': room_info['city'],
+            'accommodation_type': room_info['accommodation_type'],
+            'is_yash_arranged': room_info['is_yash_arranged']
+        },
+        'room': {
+            'type': room_info['room_type'],
+            'bed_type': room_info['bed_type'],
+            'is_twin_sharing': room_info['is_twin_sharing']
+        },
+        'dates': {
+            'check_in': check_in,
+            'check_out': check_out,
+            'nights': nights
+        },
+        'guest_info': {
+            'name': guest_name,
+            'email': guest_email,
+            'employee_grade': employee_grade,
+            'guest_count': guest_count
+        },
+        'pricing': room_pricing(room_info, nights),
+        'policy_compliance': {
+            'status': 'compliant',
+            'employee_grade': employee_grade,
+            'twin_sharing_required': not is_single_occupancy_allowed(employee_grade),
+            'accommodation_type_approved': True
+        },
+        'special_requests': special_requests
+    }
+
 @mcp.tool()
 def book_hotel(
     hotel_id: int,
@@ -413,93 +713,117 @@ def book_hotel(
         cursor = conn.cursor()
         
         # Verify room exists and get details
-        cursor.execute("""
-            SELECT r.*, h.hotel_name, h.city, h.corporate_discount_percent,
-                   h.is_yash_arranged, h.accommodation_type
-            FROM rooms r
-            JOIN hotels h ON r.hotel_id = h.hotel_id
-            WHERE r.room_id = %s AND h.hotel_id = %s
-        """, (room_id, hotel_id))
-        
-        room_info = cursor.fetchone()
+        room_info = fetch_room(cursor, hotel_id, room_id)
         
         if not room_info:
-            return json.dumps({'error': 'Room not found'}, indent=2)
+            return dumps({'error': 'Room not found'})
         
         # Policy compliance check
-        single_allowed = is_single_occupancy_allowed(employee_grade)
-        if not single_allowed and not room_info['is_twin_sharing']:
-            return json.dumps({
-                'error': f'Policy violation: Employee grade {employee_grade} requires twin sharing accommodation'
-            }, indent=2)
+        policy_error = occupancy_policy_error(employee_grade, room_info)
+        if policy_error:
+            return dumps({'error': policy_error})
         
-        # Check availability manually
-        cursor.execute("""
-            SELECT 
-                MIN(available_count) as min_availability
-            FROM room_inventory
-            WHERE room_id = %s 
-            AND date BETWEEN %s AND %s
-        """, (room_id, check_in, check_out))
+        # Reserve every night of the stay; the booking insert runs in the same transaction
+        if not reserve_room_nights(cursor, room_id, check_in, check_out):
+            conn.rollback()
+            return dumps({'error': 'Room not available for selected dates'})
         
-        availability = cursor.fetchone()
+        booking_id, booking_ref = insert_hotel_booking(
+            cursor, hotel_id, room_id, room_info, check_in, check_out, guest_name, guest_count
+        )
+        
+        conn.commit()
+        availability_index.apply_delta(room_id, check_in, check_out, -1)
         
-        if not availability or availability['min_availability'] <= 0:
-            return json.dumps({'error': 'Room not available for selected dates'}, indent=2)
+        booking_confirmation = build_booking_confirmation(
+            booking_id, booking_ref, room_info, check_in, check_out,
+            guest_name, guest_email, employee_grade, guest_count, special_requests
+        )
         
-        # Calculate pricing
+        return dumps(booking_confirmation)
+        
+    except Exception as e:
+        logger.error(f"Booking error: {e}")
+        if conn:
+            conn.rollback()
+        return dumps({'error': f'Booking failed: {str(e)}'})
+    finally:
+        if conn:
+            conn.close()
+
+@mcp.tool()
+def hold_room(
+    hotel_id: int,
+    room_id: int,
+    check_in: str,
+    check_out: str,
+    guest_email: str,
+    employee_grade: str = "E5",
+    guest_count: int = 1,
+    ttl_seconds: Optional[int] = None
+) -> str:
+    """
+    Temporarily reserve a room for every night of a stay while the rest of
+    the trip is planned.
+    
+    The room is taken out of inventory until the hold is confirmed with
+    confirm_room_hold, released with release_room_hold, or expires.
+    
+    Args:
+        hotel_id: Hotel ID
+        room_id: Room ID to hold
+        check_in: Check-in date (YYYY-MM-DD)
+        check_out: Check-out date (YYYY-MM-DD)
+        guest_email: Email address of guest
+        employee_grade: YASH employee grade
+        guest_count: Number of guests (default 1)
+        ttl_seconds: Hold duration in seconds (server default if omitted)
+    """
+    conn = None
+    try:
         nights = calculate_nights(check_in, check_out)
-        base_price = float(room_info['base_price'])
-        discount_percent = float(room_info.get('corporate_discount_percent', 0))
-        discount_amount = base_price * (discount_percent / 100)
-        final_price_per_night = base_price - discount_amount
-        total_amount = final_price_per_night * nights
+        if nights <= 0:
+            return dumps({'error': 'Check-out must be after check-in'})
         
-        # Generate booking reference
-        booking_ref = generate_booking_reference()
+        conn = get_db_connection()
+        cursor = conn.cursor()
         
-        # Create booking - using CORRECT travel_type values from the constraint
-        cursor.execute("""
-            INSERT INTO hotel_bookings (
-                booking_reference, hotel_id, room_id, check_in_date, check_out_date,
-                nights, guest_name, guest_count, total_amount, per_night_rate,
-                corporate_discount, status, travel_type,
-                is_twin_sharing, arranged_by_travel_desk
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING booking_id
-        """, (
-            booking_ref, hotel_id, room_id, check_in, check_out,
-            nights, guest_name, guest_count, total_amount, final_price_per_night,
-            discount_amount * nights, 'confirmed', 'short_term',  # Changed 'corporate' to 'short_term'
-            room_info['is_twin_sharing'], True
-        ))
-        
-        booking_id = cursor.fetchone()['booking_id']
-        
-        # Update inventory
-        cursor.execute("""
-            UPDATE room_inventory 
-            SET available_count = available_count - 1
-            WHERE room_id = %s AND date BETWEEN %s AND %s
-        """, (room_id, check_in, check_out))
+        room_info = fetch_room(cursor, hotel_id, room_id)
+        if not room_info:
+            return dumps({'error': 'Room not found'})
         
+        policy_error = occupancy_policy_error(employee_grade, room_info)
+        if policy_error:
+            return dumps({'error': policy_error})
+        
+        if not reserve_room_nights(cursor, room_id, check_in, check_out):
+            conn.rollback()
+            return dumps({'error': 'Room not available for selected dates'})
+        
+        ttl = room_holds.resolve_ttl(ttl_seconds)
+        hold_reference = f"YASH-HTL-HOLD-{os.urandom(4).hex().upper()}"
+        hold = room_holds.create_hold(
+            cursor, hold_reference, hotel_id, room_id, check_in, check_out,
+            guest_email, employee_grade, guest_count, ttl
+        )
         conn.commit()
+        availability_index.apply_delta(room_id, check_in, check_out, -1)
+        logger.info(f"Created room hold {hold_reference} for room {room_id}")
         
-        # Prepare response
-        booking_confirmation = {
+        return dumps({
             'success': True,
-            'booking_id': booking_id,
-            'booking_reference': booking_ref,
-            'status': 'confirmed',
+            'hold_reference': hold_reference,
+            'status': 'held',
+            'expires_at': hold['expires_at'],
+            'ttl_seconds': ttl,
             'hotel': {
+                'hotel_id': hotel_id,
                 'name': room_info['hotel_name'],
-                'city': room_info['city'],
-                'accommodation_type': room_info['accommodation_type'],
-                'is_yash_arranged': room_info['is_yash_arranged']
+                'city': room_info['city']
             },
             'room': {
+                'room_id': room_id,
                 'type': room_info['room_type'],
-                'bed_type': room_info['bed_type'],
                 'is_twin_sharing': room_info['is_twin_sharing']
             },
             'dates': {
@@ -507,40 +831,149 @@ def book_hotel(
                 'check_out': check_out,
                 'nights': nights
             },
-            'guest_info': {
-                'name': guest_name,
-                'email': guest_email,
-                'employee_grade': employee_grade,
-                'guest_count': guest_count
-            },
-            'pricing': {
-                'base_price_per_night': base_price,
-                'corporate_discount_percent': discount_percent,
-                'discount_per_night': round(discount_amount, 2),
-                'final_price_per_night': round(final_price_per_night, 2),
-                'total_amount': round(total_amount, 2),
-                'currency': 'USD'  # Changed to USD for international hotel
-            },
-            'policy_compliance': {
-                'status': 'compliant',
-                'employee_grade': employee_grade,
-                'twin_sharing_required': not single_allowed,
-                'accommodation_type_approved': True
-            },
-            'special_requests': special_requests
-        }
+            'pricing': room_pricing(room_info, nights),
+            'next_steps': [
+                'Call confirm_room_hold to book the held room',
+                'Call release_room_hold if the trip is not going ahead'
+            ]
+        })
+        
+    except Exception as e:
+        logger.error(f"Hold error: {e}")
+        if conn:
+            conn.rollback()
+        return dumps({'error': f'Hold failed: {str(e)}'})
+    finally:
+        if conn:
+            conn.close()
+
+@mcp.tool()
+def confirm_room_hold(
+    hold_reference: str,
+    guest_name: str,
+    guest_email: str,
+    special_requests: str = ""
+) -> str:
+    """
+    Turn an active room hold into a confirmed booking.
+    
+    Args:
+        hold_reference: Reference returned by hold_room
+        guest_name: Full name of guest
+        guest_email: Email address of guest
+        special_requests: Any special requests
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        hold = room_holds.lock_hold(cursor, hold_reference)
+        if not hold:
+            return dumps({'error': 'Hold not found'})
+        
+        if not room_holds.is_owner(hold, guest_email):
+            return dumps({'error': 'Hold was placed for a different guest'})
         
-        return json.dumps(booking_confirmation, indent=2, default=str)
+        if hold['status'] != 'held':
+            return dumps({'error': f"Hold is {hold['status']}", 'booking_id': hold['booking_id']})
+        
+        check_in = str(hold['check_in_date'])
+        check_out = str(hold['check_out_date'])
+        
+        if hold['is_expired']:
+            if room_holds.close_hold(cursor, hold, 'expired'):
+                release_room_nights(cursor, hold['room_id'], check_in, check_out)
+                conn.commit()
+                availability_index.apply_delta(hold['room_id'], check_in, check_out, 1)
+            return dumps({'error': 'Hold expired; room returned to inventory'})
+        
+        room_info = fetch_room(cursor, hold['hotel_id'], hold['room_id'])
+        if not room_info:
+            if room_holds.close_hold(cursor, hold, 'released'):
+                release_room_nights(cursor, hold['room_id'], check_in, check_out)
+                conn.commit()
+                availability_index.apply_delta(hold['room_id'], check_in, check_out, 1)
+            return dumps({'error': 'Room is no longer bookable; hold released'})
+        
+        booking_id, booking_ref = insert_hotel_booking(
+            cursor, hold['hotel_id'], hold['room_id'], room_info,
+            check_in, check_out, guest_name, hold['guest_count']
+        )
+        
+        cursor.execute("""
+            UPDATE room_holds SET status = 'confirmed', booking_id = %s
+            WHERE hold_id = %s
+        """, (booking_id, hold['hold_id']))
+        
+        conn.commit()
+        logger.info(f"Hold {hold_reference} confirmed as booking {booking_ref}")
+        
+        booking_confirmation = build_booking_confirmation(
+            booking_id, booking_ref, room_info, check_in, check_out,
+            guest_name, guest_email, hold['employee_grade'] or "E5",
+            hold['guest_count'], special_requests
+        )
+        booking_confirmation['hold_reference'] = hold_reference
+        
+        return dumps(booking_confirmation)
         
     except Exception as e:
-        logger.error(f"Booking error: {e}")
+        logger.error(f"Hold confirmation error: {e}")
         if conn:
             conn.rollback()
-        return json.dumps({'error': f'Booking failed: {str(e)}'}, indent=2)
+        return dumps({'error': f'Hold confirmation failed: {str(e)}'})
     finally:
         if conn:
             conn.close()
 
+@mcp.tool()
+def release_room_hold(hold_reference: str) -> str:
+    """
+    Release an active room hold and return its nights to inventory.
+    
+    Args:
+        hold_reference: Reference returned by hold_room
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        hold = room_holds.lock_hold(cursor, hold_reference)
+        if not hold:
+            return dumps({'error': 'Hold not found'})
+        
+        if not room_holds.close_hold(cursor, hold, 'released'):
+            return dumps({'error': f"Hold is already {hold['status']}"})
+        
+        release_room_nights(cursor, hold['room_id'], hold['check_in_date'], hold['check_out_date'])
+        conn.commit()
+        availability_index.apply_delta(hold['room_id'], hold['check_in_date'], hold['check_out_date'], 1)
+        
+        return dumps({
+            'success': True,
+            'hold_reference': hold_reference,
+            'status': 'released'
+        })
+        
+    except Exception as e:
+        logger.error(f"Hold release error: {e}")
+        if conn:
+            conn.rollback()
+        return dumps({'error': f'Hold release failed: {str(e)}'})
+    finally:
+        if conn:
+            conn.close()
+
+BOOKING_STATUS_SQL = """
+    SELECT hb.*, h.hotel_name, h.city, r.room_type
+    FROM hotel_bookings hb
+    JOIN hotels h ON hb.hotel_id = h.hotel_id
+    JOIN rooms r ON hb.room_id = r.room_id
+"""
+
+BOOKING_STATUS_BATCH_LIMIT = int(os.getenv("BOOKING_STATUS_BATCH_LIMIT", 200))
 
 @mcp.tool()
 def get_booking_status(booking_reference: str) -> str:
@@ -551,33 +984,58 @@ def get_booking_status(booking_reference: str) -> str:
         booking_reference: Booking reference number
     """
     try:
-        conn = get_db_connection()
+        conn = get_db_connection(read_only=True)
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT hb.*, h.hotel_name, h.city, r.room_type
-            FROM hotel_bookings hb
-            JOIN hotels h ON hb.hotel_id = h.hotel_id
-            JOIN rooms r ON hb.room_id = r.room_id
-            WHERE hb.booking_reference = %s
-        """, (booking_reference,))
+        cursor.execute(BOOKING_STATUS_SQL + " WHERE hb.booking_reference = %s", (booking_reference,))
         
         booking = cursor.fetchone()
         
         if not booking:
-            return json.dumps({'error': 'Booking not found'}, indent=2)
+            return dumps({'error': 'Booking not found'})
         
         booking_info = dict(booking)
-        # Convert decimal to float
-        booking_info['total_amount'] = float(booking_info['total_amount'])
-        booking_info['per_night_rate'] = float(booking_info['per_night_rate'])
-        booking_info['corporate_discount'] = float(booking_info['corporate_discount'])
         
-        return json.dumps(booking_info, indent=2, default=str)
+        return dumps(booking_info)
         
     except Exception as e:
         logger.error(f"Status check error: {e}")
-        return json.dumps({'error': f'Status check failed: {str(e)}'}, indent=2)
+        return dumps({'error': f'Status check failed: {str(e)}'})
+    finally:
+        if 'conn' in locals():
+            conn.close()
+
+@mcp.tool()
+def get_hotel_booking_statuses(booking_references: List[str]) -> str:
+    """
+    Get the status of many hotel bookings in one call.
+    
+    Args:
+        booking_references: Booking reference numbers
+    """
+    try:
+        references = list(dict.fromkeys(ref.strip() for ref in booking_references or [] if ref and ref.strip()))
+        
+        if not references:
+            return dumps({'error': 'Provide booking_references'})
+        if len(references) > BOOKING_STATUS_BATCH_LIMIT:
+            return dumps({'error': f'At most {BOOKING_STATUS_BATCH_LIMIT} bookings per call'})
+        
+        conn = get_db_connection(read_only=True)
+        cursor = conn.cursor()
+        cursor.execute(BOOKING_STATUS_SQL + " WHERE hb.booking_reference = ANY(%s)", (references,))
+        bookings = {row['booking_reference']: dict(row) for row in cursor.fetchall()}
+        
+        return dumps({
+            'requested': len(references),
+            'found': len(bookings),
+            'bookings': [bookings[ref] for ref in references if ref in bookings],
+            'not_found': [ref for ref in references if ref not in bookings]
+        })
+        
+    except Exception as e:
+        logger.error(f"Batch status check error: {e}")
+        return dumps({'error': f'Status check failed: {str(e)}'})
     finally:
         if 'conn' in locals():
             conn.close()
@@ -606,39 +1064,41 @@ def cancel_booking(booking_reference: str, guest_email: str) -> str:
         booking = cursor.fetchone()
         
         if not booking:
-            return json.dumps({'error': 'Booking not found'}, indent=2)
+            return dumps({'error': 'Booking not found'})
         
         if booking['status'] == 'cancelled':
-            return json.dumps({'error': 'Booking already cancelled'}, indent=2)
+            return dumps({'error': 'Booking already cancelled'})
         
-        # Update booking status
+        # Update booking status; the status guard makes concurrent cancels restore inventory once
         cursor.execute("""
             UPDATE hotel_bookings 
             SET status = 'cancelled' 
-            WHERE booking_reference = %s
+            WHERE booking_reference = %s AND status <> 'cancelled'
         """, (booking_reference,))
         
-        # Restore inventory
-        cursor.execute("""
-            UPDATE room_inventory 
-            SET available_count = available_count + 1
-            WHERE room_id = %s AND date BETWEEN %s AND %s
-        """, (booking['room_id'], booking['check_in_date'], booking['check_out_date']))
+        if cursor.rowcount == 0:
+            conn.rollback()
+            return dumps({'error': 'Booking already cancelled'})
+        
+        # Restore inventory, including the check-out night for pre-half-open bookings
+        release_until = booked_until(booking)
+        release_room_nights(cursor, booking['room_id'], booking['check_in_date'], release_until)
         
         conn.commit()
+        availability_index.apply_delta(booking['room_id'], booking['check_in_date'], release_until, 1)
         
-        return json.dumps({
+        return dumps({
             'success': True,
             'message': 'Booking cancelled successfully',
             'booking_reference': booking_reference,
             'status': 'cancelled'
-        }, indent=2)
+        })
         
     except Exception as e:
         logger.error(f"Cancellation error: {e}")
         if conn:
             conn.rollback()
-        return json.dumps({'error': f'Cancellation failed: {str(e)}'}, indent=2)
+        return dumps({'error': f'Cancellation failed: {str(e)}'})
     finally:
         if conn:
             conn.close()
@@ -652,43 +1112,65 @@ def get_preferred_hotels(city: str) -> str:
         city: City to search for preferred hotels
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        preferred_hotels = vendor_catalog.get().get(city_key(city), [])
         
-        cursor.execute("""
-            SELECT 
-                hotel_id, hotel_name, city, star_rating, 
-                accommodation_type, corporate_discount_percent,
-                is_yash_arranged, has_caretaker, is_women_centric
-            FROM hotels 
-            WHERE LOWER(city) = LOWER(%s) 
-            AND is_preferred_vendor = TRUE
-            ORDER BY star_rating DESC, corporate_discount_percent DESC
-        """, (city,))
-        
-        hotels = cursor.fetchall()
-        
-        preferred_hotels = []
-        for hotel in hotels:
-            hotel_dict = dict(hotel)
-            hotel_dict['corporate_discount_percent'] = float(hotel_dict['corporate_discount_percent'])
-            preferred_hotels.append(hotel_dict)
-        
-        return json.dumps({
+        return dumps({
             'city': city,
             'preferred_hotels_count': len(preferred_hotels),
             'preferred_hotels': preferred_hotels
-        }, indent=2, default=str)
+        })
         
     except Exception as e:
         logger.error(f"Preferred hotels error: {e}")
-        return json.dumps({'error': f'Failed to get preferred hotels: {str(e)}'}, indent=2)
-    finally:
-        if 'conn' in locals():
-            conn.close()
+        return dumps({'error': f'Failed to get preferred hotels: {str(e)}'})
+
+@mcp.tool()
+def refresh_hotel_vendor_catalog() -> str:
+    """
+    Admin: reload the preferred-hotel catalog from the database now.
+    """
+    try:
+        return dumps(vendor_catalog.refresh())
+    except Exception as e:
+        logger.error(f"Vendor catalog refresh error: {e}")
+        return dumps({'error': f'Vendor catalog refresh failed: {str(e)}', 'cache': vendor_catalog.stats()})
+
+@mcp.tool()
+def get_hotel_cache_health() -> str:
+    """
+    Report freshness of the hotel server's in-memory reference caches.
+    """
+    index_age = time.time() - availability_index.loaded_at if availability_index.loaded_at else None
+    return dumps({
+        'database': db_router.stats(),
+        'vendor_catalog': vendor_catalog.stats(),
+        'availability_index': {
+            'loaded': availability_index.loaded_at is not None,
+            'age_seconds': round(index_age, 1) if index_age is not None else None
+        }
+    })
 
 if __name__ == "__main__":
     print("🚀 Starting Enhanced Hotel MCP Server...")
     print("📍 YASH Policy Compliant Hotel Booking")
     print("✅ Features: Policy enforcement, Corporate discounts, Real-time availability")
+    room_holds.ensure_schema(get_db_connection)
+    try:
+        hotel_details.ensure_schema(get_db_connection)
+    except Exception as e:
+        logger.warning(f"Catalog change triggers not installed, hotel details rely on TTL only: {e}")
+    availability_index.start()
+    hotel_details_cache.start()
+    vendor_catalog.start()
+    
+    def sweep_holds():
+        # Released holds change inventory outside apply_delta, so resync the index
+        if room_holds.sweep_expired_holds(get_db_connection):
+            availability_index.refresh()
+    
+    PeriodicTask(
+        "room-hold-sweeper",
+        sweep_holds,
+        room_holds.HOLD_SWEEP_INTERVAL_SECONDS
+    ).start()
     mcp.run(transport="http", host="0.0.0.0", port=8002)
\ No newline at end of file
@@ -0,0 +1,186 @@
+"""
+Hotel detail documents for the hotel MCP server.
+
+`get_hotel_details` is served from a read-through cache keyed by hotel_id.
+A miss loads the whole document (hotel row, amenities and room types) in
+one round trip using json_agg subselects. Triggers on hotels, rooms and
+hotel_amenities publish the changed hotel_id on a NOTIFY channel, and the
+cache drops those entries as soon as the listener sees them; the TTL
+bounds staleness if notifications are missed.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional
+
+from common.background import PeriodicTask
+
+logger = logging.getLogger("hotel-booking")
+
+NOTIFY_CHANNEL = "hotel_catalog_changed"
+
+SCHEMA_SQL = f"""
+    CREATE OR REPLACE FUNCTION notify_hotel_catalog_change() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM pg_notify('{NOTIFY_CHANNEL}', OLD.hotel_id::text);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM pg_notify('{NOTIFY_CHANNEL}', NEW.hotel_id::text);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS hotels_catalog_change ON hotels;
+    CREATE TRIGGER hotels_catalog_change
+        AFTER INSERT OR UPDATE OR DELETE ON hotels
+        FOR EACH ROW EXECUTE FUNCTION notify_hotel_catalog_change();
+
+    DROP TRIGGER IF EXISTS rooms_catalog_change ON rooms;
+    CREATE TRIGGER rooms_catalog_change
+        AFTER INSERT OR UPDATE OR DELETE ON rooms
+        FOR EACH ROW EXECUTE FUNCTION notify_hotel_catalog_change();
+
+    DROP TRIGGER IF EXISTS hotel_amenities_catalog_change ON hotel_amenities;
+    CREATE TRIGGER hotel_amenities_catalog_change
+        AFTER INSERT OR UPDATE OR DELETE ON hotel_amenities
+        FOR EACH ROW EXECUTE FUNCTION notify_hotel_catalog_change();
+"""
+
+HOTEL_DETAILS_SQL = """
+    SELECT h.*,
+           (SELECT COUNT(*) FROM rooms r WHERE r.hotel_id = h.hotel_id) AS room_types_count,
+           (SELECT COUNT(DISTINCT ha.amenity_id) FROM hotel_amenities ha
+             WHERE ha.hotel_id = h.hotel_id) AS amenities_count,
+           COALESCE((
+               SELECT json_agg(json_build_object(
+                          'amenity_name', ha.amenity_name,
+                          'amenity_type', ha.amenity_type
+                      ) ORDER BY ha.amenity_type, ha.amenity_name)
+               FROM hotel_amenities ha
+               WHERE ha.hotel_id = h.hotel_id
+           ), '[]'::json) AS amenities,
+           COALESCE((
+               SELECT json_agg(json_build_object(
+                          'room_id', r.room_id,
+                          'room_type', r.room_type,
+                          'base_price', r.base_price,
+                          'max_occupancy', r.max_occupancy,
+                          'bed_type', r.bed_type,
+                          'is_twin_sharing', r.is_twin_sharing,
+                          'women_only', r.women_only
+                      ) ORDER BY r.base_price)
+               FROM rooms r
+               WHERE r.hotel_id = h.hotel_id
+           ), '[]'::json) AS room_types
+    FROM hotels h
+    WHERE h.hotel_id = %s
+"""
+
+
+def ensure_schema(connection_factory: Callable) -> None:
+    """Install the catalog change triggers"""
+    conn = connection_factory()
+    try:
+        conn.cursor().execute(SCHEMA_SQL)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def load_hotel_details(cursor, hotel_id: int) -> Optional[Dict]:
+    """Hotel row with amenities and room types, in a single query"""
+    cursor.execute(HOTEL_DETAILS_SQL, (hotel_id,))
+    row = cursor.fetchone()
+    return dict(row) if row else None
+
+
+class HotelDetailsCache:
+    """Read-through, TTL-bounded LRU of hotel detail documents"""
+
+    def __init__(
+        self,
+        connection_factory: Callable,
+        ttl_seconds: int = 600,
+        max_entries: int = 1000,
+        listen_interval_seconds: int = 5
+    ):
+        self._connection_factory = connection_factory
+        self._ttl = max(1, ttl_seconds)
+        self._max_entries = max(1, max_entries)
+        self._listener = PeriodicTask("hotel-details-invalidation", self._drain_notifications, listen_interval_seconds)
+        self._listen_conn = None
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+
+    def get(self, hotel_id: int) -> Optional[Dict]:
+        """Cached document for a hotel, loading it on a miss; None if the hotel does not exist"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(hotel_id)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(hotel_id)
+                return entry[1]
+
+        conn = self._connection_factory()
+        try:
+            document = load_hotel_details(conn.cursor(), hotel_id)
+        finally:
+            conn.close()
+
+        if document is not None:
+            with self._lock:
+                self._entries[hotel_id] = (now + self._ttl, document)
+                self._entries.move_to_end(hotel_id)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return document
+
+    def invalidate(self, hotel_ids: Optional[Iterable[int]] = None) -> None:
+        """Drop the given hotels, or everything when no ids are passed"""
+        with self._lock:
+            if hotel_ids is None:
+                self._entries.clear()
+            else:
+                for hotel_id in hotel_ids:
+                    self._entries.pop(hotel_id, None)
+
+    # ─────────────────────────────
+    # Change notifications
+    # ─────────────────────────────
+    def _drain_notifications(self) -> None:
+        if self._listen_conn is None or self._listen_conn.closed:
+            conn = self._connection_factory()
+            conn.autocommit = True
+            conn.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+            self._listen_conn = conn
+            # Anything may have changed while we were not listening
+            self.invalidate()
+
+        conn = self._listen_conn
+        try:
+            conn.poll()
+        except Exception:
+            conn.close()
+            self._listen_conn = None
+            raise
+
+        hotel_ids = set()
+        while conn.notifies:
+            payload = conn.notifies.pop(0).payload
+            if payload.isdigit():
+                hotel_ids.add(int(payload))
+        if hotel_ids:
+            self.invalidate(hotel_ids)
+            logger.info(f"Hotel details invalidated for hotels {sorted(hotel_ids)}")
+
+    def start(self) -> None:
+        """Start listening for catalog change notifications"""
+        try:
+            self._drain_notifications()
+        except Exception as e:
+            logger.error(f"Hotel catalog listener failed to start: {e}")
+        self._listener.start()
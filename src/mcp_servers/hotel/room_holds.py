@@ -0,0 +1,152 @@
+"""
+Temporary room holds for the hotel MCP server.
+
+A hold takes one room out of `room_inventory` for every night of the stay
+for a limited time so HR can finish planning the trip before confirming it.
+Expired holds are returned to inventory in batches by a background sweeper.
+"""
+
+import logging
+import os
+from typing import Callable, Optional
+
+logger = logging.getLogger("hotel-booking")
+
+HOLD_TTL_SECONDS = int(os.getenv("HOTEL_HOLD_TTL_SECONDS", 900))
+HOLD_MAX_TTL_SECONDS = int(os.getenv("HOLD_MAX_TTL_SECONDS", 3600))
+HOLD_SWEEP_INTERVAL_SECONDS = int(os.getenv("HOLD_SWEEP_INTERVAL_SECONDS", 60))
+HOLD_SWEEP_BATCH_SIZE = int(os.getenv("HOLD_SWEEP_BATCH_SIZE", 200))
+
+SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS room_holds (
+        hold_id SERIAL PRIMARY KEY,
+        hold_reference VARCHAR(40) NOT NULL UNIQUE,
+        hotel_id INTEGER NOT NULL,
+        room_id INTEGER NOT NULL,
+        check_in_date DATE NOT NULL,
+        check_out_date DATE NOT NULL,
+        guest_email VARCHAR(255),
+        employee_grade VARCHAR(20),
+        guest_count INTEGER NOT NULL DEFAULT 1,
+        status VARCHAR(20) NOT NULL DEFAULT 'held',
+        booking_id INTEGER,
+        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        expires_at TIMESTAMP NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_room_holds_active_expiry
+        ON room_holds (expires_at) WHERE status = 'held';
+"""
+
+# Expand each expired hold into its nights [check_in, check_out) and give
+# them back to room_inventory in one statement
+SWEEP_SQL = """
+    WITH expired AS (
+        SELECT hold_id
+        FROM room_holds
+        WHERE status = 'held' AND expires_at <= NOW()
+        ORDER BY expires_at
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    ), released AS (
+        UPDATE room_holds h
+        SET status = 'expired'
+        FROM expired e
+        WHERE h.hold_id = e.hold_id
+        RETURNING h.room_id, h.check_in_date, h.check_out_date
+    ), restored AS (
+        UPDATE room_inventory ri
+        SET available_count = ri.available_count + r.holds
+        FROM (
+            SELECT released.room_id, night::date AS date, COUNT(*) AS holds
+            FROM released,
+                 generate_series(released.check_in_date, released.check_out_date - 1, interval '1 day') AS night
+            GROUP BY released.room_id, night::date
+        ) r
+        WHERE ri.room_id = r.room_id AND ri.date = r.date
+    )
+    SELECT COUNT(*) AS released FROM released
+"""
+
+
+def resolve_ttl(ttl_seconds: Optional[int]) -> int:
+    """Clamp a requested hold TTL to the configured bounds"""
+    if not ttl_seconds or ttl_seconds <= 0:
+        return HOLD_TTL_SECONDS
+    return min(int(ttl_seconds), HOLD_MAX_TTL_SECONDS)
+
+
+def ensure_schema(connection_factory: Callable) -> None:
+    """Create the holds table if it does not exist yet"""
+    conn = connection_factory()
+    try:
+        conn.cursor().execute(SCHEMA_SQL)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def create_hold(cursor, hold_reference: str, hotel_id: int, room_id: int, check_in: str,
+                check_out: str, guest_email: str, employee_grade: str, guest_count: int,
+                ttl_seconds: int):
+    """Insert a hold row for room nights that have already been reserved"""
+    cursor.execute("""
+        INSERT INTO room_holds (
+            hold_reference, hotel_id, room_id, check_in_date, check_out_date,
+            guest_email, employee_grade, guest_count, status, expires_at
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 'held', NOW() + make_interval(secs => %s))
+        RETURNING hold_id, expires_at
+    """, (
+        hold_reference, hotel_id, room_id, check_in, check_out,
+        guest_email, employee_grade, guest_count, ttl_seconds
+    ))
+    return cursor.fetchone()
+
+
+def is_owner(hold, email: str) -> bool:
+    """Whether `email` is the one the hold was placed for (case-insensitive)"""
+    return (hold['guest_email'] or '').strip().lower() == (email or '').strip().lower()
+
+
+def lock_hold(cursor, hold_reference: str):
+    """Lock a hold row for the rest of the transaction"""
+    cursor.execute("""
+        SELECT hold_id, hold_reference, hotel_id, room_id, check_in_date, check_out_date,
+               guest_email, employee_grade, guest_count, status, booking_id, expires_at,
+               expires_at <= NOW() AS is_expired
+        FROM room_holds
+        WHERE hold_reference = %s
+        FOR UPDATE
+    """, (hold_reference,))
+    return cursor.fetchone()
+
+
+def close_hold(cursor, hold, status: str) -> bool:
+    """Mark a held hold with a final status; False if it was no longer held"""
+    cursor.execute("""
+        UPDATE room_holds SET status = %s
+        WHERE hold_id = %s AND status = 'held'
+    """, (status, hold['hold_id']))
+    return cursor.rowcount > 0
+
+
+def sweep_expired_holds(connection_factory: Callable) -> int:
+    """Return expired holds to inventory in batches; returns holds released"""
+    total = 0
+    while True:
+        conn = connection_factory()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(SWEEP_SQL, (HOLD_SWEEP_BATCH_SIZE,))
+            released = cursor.fetchone()['released']
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        total += released
+        if released < HOLD_SWEEP_BATCH_SIZE:
+            break
+    if total:
+        logger.info(f"Released {total} expired room holds")
+    return total
@@ -0,0 +1,134 @@
+"""Token-budgeted packing of retrieved policy chunks into prompt context."""
+import logging
+import re
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+_WHITESPACE = re.compile(r"\s+")
+# Shorter lines (table cells, "Yes.") legitimately repeat across sections
+_MIN_DEDUPE_CHARS = 20
+
+
+@lru_cache(maxsize=8)
+def token_counter(model: str) -> Callable[[str], int]:
+	"""Token count under the chat model's tokenizer; ~4 characters per token without tiktoken."""
+	try:
+		import tiktoken
+	except ImportError:
+		logger.warning("tiktoken is not installed; approximating context tokens from characters")
+		return lambda text: (len(text) + 3) // 4
+	try:
+		# Provider prefixes ("azure/gpt-4o") are not part of tiktoken's model names
+		encoding = tiktoken.encoding_for_model(model.split("/")[-1])
+	except KeyError:
+		encoding = tiktoken.get_encoding("cl100k_base")
+	return lambda text: len(encoding.encode(text))
+
+
+def split_sentences(text: str) -> List[Tuple[str, bool]]:
+	"""(sentence, starts a line) pairs, so packed excerpts keep list and table lines."""
+	sentences = []
+	for line in (text or "").splitlines():
+		for position, sentence in enumerate(s for s in _SENTENCE_BREAK.split(line.strip()) if s):
+			sentences.append((sentence, position == 0))
+	return sentences
+
+
+def _join(sentences: List[Tuple[str, bool]]) -> str:
+	parts = []
+	for sentence, new_line in sentences:
+		if parts:
+			parts.append("\n" if new_line else " ")
+		parts.append(sentence)
+	return "".join(parts)
+
+
+def _sentence_key(sentence: str) -> str:
+	return _WHITESPACE.sub(" ", sentence.lower())
+
+
+class ContextPacker:
+	"""
+	Fits ranked hits into a token budget. Hits are taken best first;
+	sentences already packed from an earlier hit (the overlap between
+	adjacent chunks) are dropped, and a hit that does not fit whole is cut
+	at a sentence boundary rather than mid-sentence.
+	"""
+
+	SOURCE_PREFIX = "Source {index} -> "
+
+	def __init__(self, count_tokens: Callable[[str], int], max_tokens: int) -> None:
+		self.count_tokens = count_tokens
+		self.max_tokens = max(1, max_tokens)
+		self._lock = threading.Lock()
+		self.packed_turns = 0
+		self.packed_tokens = 0
+		self.dropped_sentences = 0
+
+	def pack(self, hits: List[Dict]) -> List[Dict[str, str]]:
+		"""Excerpts as {"id", "text"}, in rank order, within max_tokens once rendered."""
+		excerpts: List[Dict[str, str]] = []
+		seen = set()
+		used = 0
+		duplicates = 0
+		for idx, hit in enumerate(hits, 1):
+			sentences = []
+			for sentence, new_line in split_sentences(hit.get("text") or ""):
+				key = _sentence_key(sentence)
+				if len(key) >= _MIN_DEDUPE_CHARS:
+					if key in seen:
+						duplicates += 1
+						continue
+					seen.add(key)
+				sentences.append((sentence, new_line))
+			if not sentences:
+				continue
+
+			overhead = self.count_tokens(self.SOURCE_PREFIX.format(index=len(excerpts) + 1)) + 1
+			kept: List[Tuple[str, bool]] = []
+			tokens = overhead
+			for sentence, new_line in sentences:
+				cost = self.count_tokens(sentence) + 1
+				if used + tokens + cost > self.max_tokens:
+					break
+				kept.append((sentence, new_line))
+				tokens += cost
+			if kept:
+				excerpts.append({"id": str(hit.get("id") or idx), "text": _join(kept)})
+				used += tokens
+			if len(kept) < len(sentences):
+				break
+
+		with self._lock:
+			self.packed_turns += 1
+			self.packed_tokens += used
+			self.dropped_sentences += duplicates
+		return excerpts
+
+	@classmethod
+	def render(cls, excerpts: List[Dict[str, str]]) -> str:
+		if not excerpts:
+			return "No matching travel policy excerpts were retrieved."
+		return "\n\n".join(
+			f"{cls.SOURCE_PREFIX.format(index=idx)}{excerpt['text']}" for idx, excerpt in enumerate(excerpts, 1)
+		)
+
+	def stats(self) -> Dict:
+		with self._lock:
+			return {
+				"max_tokens": self.max_tokens,
+				"turns": self.packed_turns,
+				"avg_context_tokens": round(self.packed_tokens / self.packed_turns, 1) if self.packed_turns else None,
+				"duplicate_sentences_dropped": self.dropped_sentences,
+			}
+
+
+def create_context_packer() -> ContextPacker:
+	"""Context packer for the configured chat model and RAG_CONTEXT_MAX_TOKENS."""
+	return ContextPacker(token_counter(settings.AZURE_MODEL), settings.RAG_CONTEXT_MAX_TOKENS)
@@ -0,0 +1,152 @@
+"""Two-tier cache for policy query embeddings."""
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+from cachetools import LRUCache
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+	"""Case, whitespace and trailing punctuation do not change what is asked."""
+	return _WHITESPACE.sub(" ", (text or "").strip().lower()).rstrip(" ?!.")
+
+
+class EmbeddingCache:
+	"""
+	Wraps an embedding client so repeated queries skip the embedding call.
+
+	Entries are keyed by embedding model and normalized query text. Hits
+	are served from an in-process LRU first, then from an optional on-disk
+	tier (diskcache) that survives restarts and is shared by workers on the
+	same host.
+	"""
+
+	def __init__(
+		self,
+		embedder,
+		model: str,
+		max_entries: int = 2048,
+		disk_dir: Optional[str] = None,
+		disk_size_limit_mb: int = 256,
+	) -> None:
+		self.embedder = embedder
+		self.model = model
+		self._memory: LRUCache = LRUCache(maxsize=max(1, max_entries))
+		self._lock = threading.Lock()
+		self._disk = self._open_disk(disk_dir, disk_size_limit_mb) if disk_dir else None
+		self.memory_hits = 0
+		self.disk_hits = 0
+		self.misses = 0
+		self._embed_seconds = 0.0
+
+	@staticmethod
+	def _open_disk(disk_dir: str, size_limit_mb: int):
+		try:
+			from diskcache import Cache
+		except ImportError:
+			logger.warning("diskcache is not installed; embedding cache is memory-only")
+			return None
+		return Cache(disk_dir, size_limit=size_limit_mb * 1024 * 1024)
+
+	def key(self, text: str) -> str:
+		digest = hashlib.sha256(f"{self.model}\0{normalize_query(text)}".encode("utf-8"))
+		return digest.hexdigest()
+
+	def get(self, text: str) -> Optional[List[float]]:
+		"""Cached embedding, or None without calling the embedder."""
+		key = self.key(text)
+		with self._lock:
+			vector = self._memory.get(key)
+			if vector is not None:
+				self.memory_hits += 1
+				return vector
+
+		if self._disk is not None:
+			raw = self._disk.get(key)
+			if raw is not None:
+				vector = np.frombuffer(raw, dtype=np.float32).tolist()
+				with self._lock:
+					self._memory[key] = vector
+					self.disk_hits += 1
+				return vector
+		return None
+
+	def put(self, text: str, vector: List[float]) -> None:
+		key = self.key(text)
+		with self._lock:
+			self._memory[key] = vector
+		if self._disk is not None:
+			self._disk.set(key, np.asarray(vector, dtype=np.float32).tobytes())
+
+	def embed_query(self, text: str) -> List[float]:
+		vector = self.get(text)
+		if vector is not None:
+			return vector
+
+		started = time.perf_counter()
+		vector = self.embedder.embed_query(text)
+		elapsed = time.perf_counter() - started
+		with self._lock:
+			self.misses += 1
+			self._embed_seconds += elapsed
+		self.put(text, vector)
+		return vector
+
+	async def aembed_query(self, text: str) -> List[float]:
+		"""Like embed_query, but a miss awaits the embedder's async client."""
+		vector = self.get(text)
+		if vector is not None:
+			return vector
+
+		started = time.perf_counter()
+		vector = await self.embedder.aembed_query(text)
+		elapsed = time.perf_counter() - started
+		with self._lock:
+			self.misses += 1
+			self._embed_seconds += elapsed
+		self.put(text, vector)
+		return vector
+
+	def clear(self) -> None:
+		with self._lock:
+			self._memory.clear()
+		if self._disk is not None:
+			self._disk.clear()
+
+	def stats(self) -> Dict:
+		with self._lock:
+			hits = self.memory_hits + self.disk_hits
+			lookups = hits + self.misses
+			return {
+				"model": self.model,
+				"memory_entries": len(self._memory),
+				"memory_capacity": self._memory.maxsize,
+				"disk_enabled": self._disk is not None,
+				"disk_entries": len(self._disk) if self._disk is not None else 0,
+				"memory_hits": self.memory_hits,
+				"disk_hits": self.disk_hits,
+				"misses": self.misses,
+				"hit_rate": round(hits / lookups, 4) if lookups else None,
+				"avg_embed_ms": round(self._embed_seconds / self.misses * 1000, 1) if self.misses else None,
+			}
+
+
+def create_embedding_cache(embedder) -> EmbeddingCache:
+	"""Embedding cache configured from settings."""
+	return EmbeddingCache(
+		embedder,
+		model=settings.AZURE_EMBEDDING_MODEL,
+		max_entries=settings.RAG_EMBED_CACHE_SIZE,
+		disk_dir=settings.RAG_EMBED_CACHE_DIR or None,
+		disk_size_limit_mb=settings.RAG_EMBED_CACHE_DISK_MB,
+	)
@@ -0,0 +1,224 @@
+"""Hybrid BM25 + vector retrieval with rank fusion and reranking."""
+import logging
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.config.settings import settings
+from src.rag.metadata import PolicyFilter
+from src.rag.vector_store import VectorStore, text_chunk_id
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[.,][0-9]+)*")
+# Grade codes (E3, M1, AT), tiers, amounts: tokens a paraphrase cannot stand in for
+_EXACT_TOKEN = re.compile(r"^(?:[a-z]{1,2}\d{1,2}|\d+(?:\.\d+)?)$")
+_STOPWORDS = frozenset(
+	# "at" stays: AT is a grade code
+	"a an and are as be by can do does for from how i in is it my of on or the to what when where which who "
+	"will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+	"""Lowercased word tokens; thousands separators are dropped so 8,000 matches 8000."""
+	tokens = []
+	for token in _TOKEN.findall((text or "").lower()):
+		token = token.replace(",", "")
+		if token not in _STOPWORDS:
+			tokens.append(token)
+	return tokens
+
+
+class BM25Index:
+	"""Okapi BM25 over an in-memory inverted index."""
+
+	def __init__(self, chunks: Sequence[Dict], k1: float = 1.5, b: float = 0.75) -> None:
+		self.chunks = list(chunks)
+		self.k1 = k1
+		self.b = b
+		self.postings: Dict[str, List[tuple]] = defaultdict(list)
+		lengths = []
+		for i, chunk in enumerate(self.chunks):
+			counts = Counter(tokenize(chunk["text"]))
+			lengths.append(sum(counts.values()))
+			for term, tf in counts.items():
+				self.postings[term].append((i, tf))
+		self.lengths = np.asarray(lengths, dtype=np.float32)
+		self.avg_length = float(self.lengths.mean()) if lengths else 0.0
+		n = len(self.chunks)
+		self.idf = {
+			term: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+			for term, docs in self.postings.items()
+		}
+		self._masks: Dict[str, np.ndarray] = {}
+
+	def _mask(self, filters: PolicyFilter) -> np.ndarray:
+		"""Chunks matching `filters`; there are only a few distinct filters, so masks are kept."""
+		mask = self._masks.get(filters.key)
+		if mask is None:
+			mask = np.fromiter((filters.matches(chunk) for chunk in self.chunks), dtype=bool, count=len(self.chunks))
+			self._masks[filters.key] = mask
+		return mask
+
+	def search(self, query: str, top_k: int, filters: Optional[PolicyFilter] = None) -> List[Dict]:
+		if not self.chunks:
+			return []
+		scores = np.zeros(len(self.chunks), dtype=np.float32)
+		norm = self.k1 * (1 - self.b + self.b * self.lengths / (self.avg_length or 1))
+		for term in set(tokenize(query)):
+			postings = self.postings.get(term)
+			if not postings:
+				continue
+			idx = np.fromiter((p[0] for p in postings), dtype=np.int64, count=len(postings))
+			tf = np.fromiter((p[1] for p in postings), dtype=np.float32, count=len(postings))
+			scores[idx] += self.idf[term] * tf * (self.k1 + 1) / (tf + norm[idx])
+		if filters is not None:
+			scores[~self._mask(filters)] = 0
+		k = min(top_k, int((scores > 0).sum()))
+		if k == 0:
+			return []
+		top = np.argpartition(-scores, k - 1)[:k]
+		order = top[np.argsort(-scores[top])]
+		return [{"id": self.chunks[i].get("chunk_id"), **self.chunks[i], "bm25_score": float(scores[i])} for i in order]
+
+
+def fusion_key(hit: Dict) -> str:
+	"""The chunk id both retrievers report; a text hash only for hits that carry none."""
+	return hit.get("chunk_id") or text_chunk_id(hit.get("text") or "")
+
+
+def reciprocal_rank_fusion(result_lists: Sequence[List[Dict]], k: int = 60) -> List[Dict]:
+	"""Merge ranked lists; each hit scores sum(1 / (k + rank)) over the lists it appears in."""
+	fused: Dict[str, Dict] = {}
+	for results in result_lists:
+		for rank, hit in enumerate(results, 1):
+			key = fusion_key(hit)
+			entry = fused.setdefault(key, {**hit, "rrf_score": 0.0})
+			entry["rrf_score"] += 1.0 / (k + rank)
+	return sorted(fused.values(), key=lambda hit: hit["rrf_score"], reverse=True)
+
+
+def heuristic_rerank(query: str, hits: List[Dict], exact_weight: float = 0.02, overlap_weight: float = 0.01) -> List[Dict]:
+	"""
+	Boost hits containing the query's exact tokens (grade codes, amounts) and
+	covering more of its terms. Boosts are on the RRF scale (1/61 ≈ 0.016).
+	"""
+	query_terms = set(tokenize(query))
+	exact_terms = {t for t in query_terms if _EXACT_TOKEN.match(t)}
+	for hit in hits:
+		terms = set(tokenize(hit.get("text") or ""))
+		exact = len(exact_terms & terms) / len(exact_terms) if exact_terms else 0.0
+		overlap = len(query_terms & terms) / len(query_terms) if query_terms else 0.0
+		hit["rerank_score"] = hit.get("rrf_score", 0.0) + exact_weight * exact + overlap_weight * overlap
+	return sorted(hits, key=lambda hit: hit["rerank_score"], reverse=True)
+
+
+class CrossEncoderReranker:
+	"""Optional CPU cross-encoder (sentence-transformers); falls back to the heuristic."""
+
+	def __init__(self, model_name: str) -> None:
+		self.model_name = model_name
+		self._model = None
+		self._unavailable = False
+		self._lock = threading.Lock()
+
+	def _load(self):
+		with self._lock:
+			if self._model is None and not self._unavailable:
+				try:
+					from sentence_transformers import CrossEncoder
+					self._model = CrossEncoder(self.model_name, device="cpu")
+				except Exception as exc:  # pylint: disable=broad-except
+					logger.warning("Cross-encoder %s unavailable, using heuristic rerank: %s", self.model_name, exc)
+					self._unavailable = True
+		return self._model
+
+	def __call__(self, query: str, hits: List[Dict]) -> List[Dict]:
+		model = self._load()
+		if model is None or not hits:
+			return heuristic_rerank(query, hits)
+		scores = model.predict([(query, hit.get("text") or "") for hit in hits])
+		for hit, score in zip(hits, scores):
+			hit["rerank_score"] = float(score)
+		return sorted(hits, key=lambda hit: hit["rerank_score"], reverse=True)
+
+
+class HybridRetriever:
+	"""
+	Vector search and BM25 over the same chunks, fused by reciprocal rank
+	and reranked. The BM25 index is rebuilt from the vector store whenever
+	the corpus version changes.
+	"""
+
+	def __init__(
+		self,
+		store: VectorStore,
+		candidates: int = 20,
+		rrf_k: int = 60,
+		reranker: str = "heuristic",
+		cross_encoder_model: Optional[str] = None,
+	) -> None:
+		self.store = store
+		self.candidates = max(1, candidates)
+		self.rrf_k = rrf_k
+		self.reranker = reranker
+		self._cross_encoder = CrossEncoderReranker(cross_encoder_model) if reranker == "cross_encoder" and cross_encoder_model else None
+		self._bm25: Optional[BM25Index] = None
+		self._bm25_version: Optional[str] = None
+		self._lock = threading.Lock()
+
+	def keyword_index(self, corpus_version: Optional[str]) -> BM25Index:
+		with self._lock:
+			stale = self._bm25 is None or (corpus_version is not None and corpus_version != self._bm25_version)
+			if stale:
+				chunks = list(self.store.iter_chunks())
+				self._bm25 = BM25Index(chunks)
+				self._bm25_version = corpus_version
+				logger.info("Built BM25 index over %d policy chunks", len(chunks))
+			return self._bm25
+
+	def _rerank(self, query: str, hits: List[Dict]) -> List[Dict]:
+		if self._cross_encoder is not None:
+			return self._cross_encoder(query, hits)
+		if self.reranker == "none":
+			return hits
+		return heuristic_rerank(query, hits)
+
+	def retrieve(
+		self,
+		query: str,
+		embedding: List[float],
+		top_k: int,
+		corpus_version: Optional[str] = None,
+		filters: Optional[PolicyFilter] = None,
+	) -> List[Dict]:
+		vector_hits = self.store.search(embedding, top_k=self.candidates, filters=filters)
+		keyword_hits = self.keyword_index(corpus_version).search(query, self.candidates, filters)
+		fused = reciprocal_rank_fusion([vector_hits, keyword_hits], k=self.rrf_k)
+		return self._rerank(query, fused)[:top_k]
+
+	def stats(self) -> Dict:
+		return {
+			"bm25_chunks": len(self._bm25.chunks) if self._bm25 else 0,
+			"bm25_corpus_version": self._bm25_version,
+			"candidates": self.candidates,
+			"reranker": "cross_encoder" if self._cross_encoder else self.reranker,
+		}
+
+
+def create_retriever(store: VectorStore) -> Optional[HybridRetriever]:
+	"""Hybrid retriever configured from settings, or None when RAG_HYBRID is off."""
+	if not settings.RAG_HYBRID:
+		return None
+	return HybridRetriever(
+		store,
+		candidates=settings.RAG_HYBRID_CANDIDATES,
+		rrf_k=settings.RAG_RRF_K,
+		reranker=settings.RAG_RERANKER,
+		cross_encoder_model=settings.RAG_CROSS_ENCODER_MODEL,
+	)
@@ -0,0 +1,262 @@
+"""
+Incremental policy ingestion.
+
+Streams PDF/text pages, splits them into token-bounded chunks and hashes
+each chunk. Only chunks whose hash is not already stored are embedded
+(in large batches, a few at a time) and upserted; chunks a document no
+longer produces are deleted. Re-running on an unchanged document embeds
+nothing.
+
+Each chunk also carries scalar metadata (section heading, grades it
+mentions, domestic/international, policy version) used to filter
+retrieval.
+
+	python -m src.rag.ingest policies/*.pdf [--prune] [--dry-run] [--policy-version 2025.1]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from src.rag.metadata import chunk_metadata, heading_of
+from src.rag.vector_store import VectorStore, get_vector_store
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_TOKENS = 1000
+DEFAULT_OVERLAP_TOKENS = 50
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_CONCURRENCY = 4
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_WHITESPACE = re.compile(r"[ \t]+")
+
+
+@dataclass(frozen=True)
+class Chunk:
+	document: str
+	page: int
+	text: str
+	section: str = ""
+	version: str = ""
+	chunk_id: str = field(init=False)
+
+	def __post_init__(self) -> None:
+		object.__setattr__(self, "chunk_id", chunk_hash(self.document, self.text))
+
+	def metadata(self) -> Dict:
+		return {
+			"chunk_id": self.chunk_id,
+			"page": self.page,
+			**chunk_metadata(self.text, self.document, self.section, self.version),
+		}
+
+
+def chunk_hash(document: str, text: str) -> str:
+	"""Stable id for a chunk: unchanged text in the same document keeps its id."""
+	normalized = _WHITESPACE.sub(" ", text.strip())
+	return hashlib.sha256(f"{document}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+# ─────────────────────────────
+# Loading
+# ─────────────────────────────
+def iter_pages(path: str) -> Iterator[Tuple[int, str]]:
+	"""(page number, text) for each page, read lazily."""
+	if path.lower().endswith(".pdf"):
+		from pypdf import PdfReader
+
+		reader = PdfReader(path)
+		for number, page in enumerate(reader.pages, 1):
+			yield number, page.extract_text() or ""
+	else:
+		with open(path, encoding="utf-8") as f:
+			# Form feeds mark pages in text exports; otherwise the file is one page
+			for number, page in enumerate(f.read().split("\f"), 1):
+				yield number, page
+
+
+def _token_counter() -> Tuple[Callable[[str], List[int]], Callable[[List[int]], str]]:
+	try:
+		import tiktoken
+
+		encoding = tiktoken.get_encoding("cl100k_base")
+		return encoding.encode, encoding.decode
+	except Exception:  # pylint: disable=broad-except
+		logger.warning("tiktoken unavailable; approximating tokens by words")
+		return str.split, " ".join
+
+
+def chunk_pages(
+	document: str,
+	pages: Iterable[Tuple[int, str]],
+	chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+	overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+	version: str = "",
+) -> Iterator[Chunk]:
+	"""
+	Pack paragraphs into chunks of at most `chunk_tokens` tokens. A chunk
+	never spans pages; an oversized paragraph is split on token windows
+	with `overlap_tokens` of overlap. Each chunk is tagged with the section
+	heading in force where it starts.
+	"""
+	encode, decode = _token_counter()
+	step = max(1, chunk_tokens - overlap_tokens)
+	section = ""
+
+	for page_number, page_text in pages:
+		buffer: List[str] = []
+		buffer_tokens = 0
+		buffer_section = section
+		for paragraph in _PARAGRAPH_BREAK.split(page_text):
+			paragraph = paragraph.strip()
+			if not paragraph:
+				continue
+			section = heading_of(paragraph) or section
+			tokens = encode(paragraph)
+			if len(tokens) > chunk_tokens:
+				if buffer:
+					yield Chunk(document, page_number, "\n\n".join(buffer), buffer_section, version)
+					buffer, buffer_tokens = [], 0
+				for start in range(0, len(tokens), step):
+					yield Chunk(document, page_number, decode(tokens[start:start + chunk_tokens]), section, version)
+					if start + chunk_tokens >= len(tokens):
+						break
+				continue
+			if buffer_tokens + len(tokens) > chunk_tokens:
+				yield Chunk(document, page_number, "\n\n".join(buffer), buffer_section, version)
+				buffer, buffer_tokens = [], 0
+			if not buffer:
+				buffer_section = section
+			buffer.append(paragraph)
+			buffer_tokens += len(tokens)
+		if buffer:
+			yield Chunk(document, page_number, "\n\n".join(buffer), buffer_section, version)
+
+
+# ─────────────────────────────
+# Pipeline
+# ─────────────────────────────
+async def _embed_and_upsert(
+	chunks: List[Chunk],
+	store: VectorStore,
+	embedder,
+	batch_size: int,
+	concurrency: int,
+) -> None:
+	semaphore = asyncio.Semaphore(max(1, concurrency))
+
+	async def run(batch: List[Chunk]) -> None:
+		async with semaphore:
+			texts = [chunk.text for chunk in batch]
+			vectors = await embedder.aembed_documents(texts)
+			await asyncio.to_thread(store.upsert, texts, vectors, False, [chunk.metadata() for chunk in batch])
+
+	batches = [chunks[i:i + batch_size] for i in range(0, len(chunks), batch_size)]
+	await asyncio.gather(*(run(batch) for batch in batches))
+
+
+async def ingest(
+	paths: Sequence[str],
+	store: Optional[VectorStore] = None,
+	embedder=None,
+	chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+	overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+	batch_size: int = DEFAULT_BATCH_SIZE,
+	concurrency: int = DEFAULT_CONCURRENCY,
+	prune: bool = False,
+	dry_run: bool = False,
+	policy_version: str = "",
+) -> Dict:
+	"""
+	Bring the store in line with `paths`. With `prune`, chunks of documents
+	that are not in `paths` are deleted too. `policy_version` is stored on
+	newly embedded chunks; unchanged chunks keep the version they were
+	ingested under.
+	"""
+	started = time.perf_counter()
+	store = store or get_vector_store()
+	existing = await asyncio.to_thread(store.chunk_index)
+
+	documents: Dict[str, str] = {os.path.basename(path): path for path in paths}
+	wanted: Dict[str, Chunk] = {}
+	per_document: Dict[str, Dict[str, int]] = {}
+	for document, path in documents.items():
+		seen = 0
+		for chunk in chunk_pages(document, iter_pages(path), chunk_tokens, overlap_tokens, policy_version):
+			seen += 1
+			wanted.setdefault(chunk.chunk_id, chunk)
+		per_document[document] = {"chunks": seen}
+
+	new_chunks = [chunk for chunk_id, chunk in wanted.items() if chunk_id not in existing]
+	orphans = [
+		chunk_id for chunk_id, document in existing.items()
+		if chunk_id not in wanted and (document in documents or prune)
+	]
+	for chunk in new_chunks:
+		per_document[chunk.document]["new"] = per_document[chunk.document].get("new", 0) + 1
+
+	if not dry_run:
+		if new_chunks:
+			if embedder is None:
+				from src.rag.embedder import get_embedder
+				embedder = get_embedder()
+			await _embed_and_upsert(new_chunks, store, embedder, batch_size, concurrency)
+		if orphans:
+			await asyncio.to_thread(store.delete, orphans)
+		if new_chunks:
+			# Flush once at the end rather than per batch
+			await asyncio.to_thread(store.flush)
+
+	return {
+		"documents": per_document,
+		"unique_chunks": len(wanted),
+		"unchanged": len(wanted) - len(new_chunks),
+		"embedded": 0 if dry_run else len(new_chunks),
+		"to_embed": len(new_chunks),
+		"deleted": 0 if dry_run else len(orphans),
+		"orphans": len(orphans),
+		"dry_run": dry_run,
+		"elapsed_seconds": round(time.perf_counter() - started, 2),
+	}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+	parser = argparse.ArgumentParser(description="Incrementally ingest travel policy documents")
+	parser.add_argument("paths", nargs="+", help="PDF or text files")
+	parser.add_argument("--chunk-tokens", type=int, default=DEFAULT_CHUNK_TOKENS)
+	parser.add_argument("--overlap-tokens", type=int, default=DEFAULT_OVERLAP_TOKENS)
+	parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Chunks per embedding request")
+	parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Embedding requests in flight")
+	parser.add_argument("--prune", action="store_true", help="Also delete chunks of documents not listed")
+	parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+	parser.add_argument("--policy-version", default="", help="Version label stored on newly embedded chunks")
+	parser.add_argument("--rebuild", action="store_true", help="Drop the index first (needed once for Milvus collections without the metadata fields)")
+	args = parser.parse_args(argv)
+
+	logging.basicConfig(level=logging.INFO)
+	store = get_vector_store()
+	if args.rebuild and not args.dry_run:
+		store.drop()
+	stats = asyncio.run(ingest(
+		args.paths,
+		store=store,
+		chunk_tokens=args.chunk_tokens,
+		overlap_tokens=args.overlap_tokens,
+		batch_size=args.batch_size,
+		concurrency=args.concurrency,
+		prune=args.prune,
+		dry_run=args.dry_run,
+		policy_version=args.policy_version,
+	))
+	print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+	main()
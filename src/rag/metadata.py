@@ -0,0 +1,102 @@
+"""Policy chunk metadata: extraction at ingest time and filters at query time."""
+import json
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+TRAVEL_TYPES = ("domestic", "international")
+ALL_TRAVEL = "all"
+
+# Junior to senior; "E5 and above" expands along this order
+GRADE_ORDER = ("T", "AT", "E1", "E2", "E3", "E4", "E5", "E6", "E7", "E8", "M1", "M2", "M3")
+
+_GRADE = re.compile(r"\b(AT|[EM][1-9])\b")
+_GRADE_RANGE = re.compile(r"\b([EM])([1-9])\s*(?:-|–|to)\s*\1?([1-9])\b")
+_GRADE_AND_ABOVE = re.compile(r"\b(AT|[EM][1-9])\s*(?:and|&)\s*above\b", re.IGNORECASE)
+_INTERNATIONAL = re.compile(r"\b(international|overseas|abroad|foreign)\b", re.IGNORECASE)
+_DOMESTIC = re.compile(r"\b(domestic|within india|inland)\b", re.IGNORECASE)
+_NUMBERED_HEADING = re.compile(r"^\d+(?:\.\d+)*\.?\s+\S")
+
+
+def extract_grades(text: str) -> List[str]:
+	"""Grade codes a chunk mentions, with ranges (E1-E4) and "E5 and above" expanded."""
+	grades = set(_GRADE.findall(text or ""))
+	for band, start, end in _GRADE_RANGE.findall(text or ""):
+		grades.update(f"{band}{n}" for n in range(int(start), int(end) + 1))
+	for grade in _GRADE_AND_ABOVE.findall(text or ""):
+		grade = grade.upper()
+		if grade in GRADE_ORDER:
+			grades.update(GRADE_ORDER[GRADE_ORDER.index(grade):])
+	return sorted(grades, key=lambda g: GRADE_ORDER.index(g) if g in GRADE_ORDER else len(GRADE_ORDER))
+
+
+def detect_travel_type(text: str) -> Optional[str]:
+	"""domestic or international when the text names only one of them, else None."""
+	international = bool(_INTERNATIONAL.search(text or ""))
+	domestic = bool(_DOMESTIC.search(text or ""))
+	if international != domestic:
+		return "international" if international else "domestic"
+	return None
+
+
+def heading_of(paragraph: str) -> Optional[str]:
+	"""The paragraph's first line when it reads like a section heading."""
+	line = paragraph.strip().splitlines()[0].strip() if paragraph.strip() else ""
+	if not line or len(line) > 80 or line.endswith((".", ",", ";")):
+		return None
+	if _NUMBERED_HEADING.match(line) or line.isupper() or line.istitle():
+		return line.rstrip(":")
+	return None
+
+
+def chunk_metadata(text: str, document: str, section: str = "", version: str = "") -> Dict:
+	"""Scalar fields stored next to each chunk; travel_type falls back to the document name."""
+	return {
+		"document": document,
+		"section": section,
+		"grades": extract_grades(text),
+		"travel_type": detect_travel_type(text) or detect_travel_type(document) or ALL_TRAVEL,
+		"version": version,
+	}
+
+
+@dataclass(frozen=True)
+class PolicyFilter:
+	"""
+	Restricts retrieval to chunks that apply to one employee grade and, when
+	the question names one, one travel type. Chunks that mention no grade,
+	or are not specific to a travel type, always match.
+	"""
+
+	grade: Optional[str] = None
+	travel_type: Optional[str] = None
+
+	@classmethod
+	def for_question(cls, grade: Optional[str], question: str) -> Optional["PolicyFilter"]:
+		grade = (grade or "").strip().upper() or None
+		if grade is not None and grade not in GRADE_ORDER:
+			grade = None
+		policy_filter = cls(grade=grade, travel_type=detect_travel_type(question))
+		return policy_filter if policy_filter.grade or policy_filter.travel_type else None
+
+	@property
+	def key(self) -> str:
+		return f"{self.grade or '*'}|{self.travel_type or '*'}"
+
+	def matches(self, record: Dict) -> bool:
+		if self.grade:
+			grades = record.get("grades") or []
+			if grades and self.grade not in grades:
+				return False
+		if self.travel_type:
+			if (record.get("travel_type") or ALL_TRAVEL) not in (ALL_TRAVEL, self.travel_type):
+				return False
+		return True
+
+	def milvus_expr(self) -> str:
+		clauses = []
+		if self.grade:
+			clauses.append(f"(array_length(grades) == 0 or array_contains(grades, {json.dumps(self.grade)}))")
+		if self.travel_type:
+			clauses.append(f"travel_type in {json.dumps([ALL_TRAVEL, self.travel_type])}")
+		return " and ".join(clauses)
@@ -1,4 +1,11 @@
-from pymilvus import connections, utility, Collection, FieldSchema, CollectionSchema, DataType
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+
+from pymilvus import connections, utility, Collection, FieldSchema, CollectionSchema, DataType, MilvusException
 from src.config.settings import settings
 
 MILVUS_URI = settings.MILVUS_URI
@@ -8,49 +15,413 @@ DIM = settings.MILVUS_DIM
 VECTOR_FIELD = settings.MILVUS_VECTOR_FIELD
 TEXT_FIELD = settings.MILVUS_TEXT_FIELD
 
+SEARCH_PARAMS = {"metric_type": "L2", "params": {"nprobe": 10}}
+QUERY_BATCH_SIZE = 1000
+METADATA_FIELDS = ["chunk_id", "document", "section", "grades", "travel_type", "version"]
+FILTER_FIELDS = ("grades", "travel_type")
+# Collection property bumped by every insert and delete; see corpus_version()
+VERSION_PROPERTY = "policy.corpus_version"
+
+def version_marker(info):
+    """Value last written by ManagedCollection._bump_version, from a describe() result ("" if never written)"""
+    properties = info.get("properties") or {}
+    if isinstance(properties, list):
+        properties = {item.get("key"): item.get("value") for item in properties}
+    return properties.get(VERSION_PROPERTY, "")
+
+def text_chunk_id(text):
+    """Default chunk id for rows inserted without one"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+logger = logging.getLogger(__name__)
+
+
+class ManagedCollection:
+    """
+    One long-lived Milvus connection and loaded collection handle.
+
+    The connection is opened and the collection loaded on first use, then
+    reused by every call. A lightweight health check runs at most every
+    `health_check_seconds`; a failed check or a failed call drops the
+    handle so the next call reconnects. Inserts are flushed once
+    `flush_batch_size` rows are pending or `flush_interval_seconds` after
+    the first unflushed insert, instead of after every insert (inserted
+    rows are searchable before they are flushed).
+
+    The collection's fields are read on connect. Collections created before
+    the metadata fields existed keep serving plain vector search; metadata
+    filters and keyword retrieval stay off until the collection is rebuilt.
+    """
+
+    def __init__(
+        self,
+        uri,
+        token,
+        collection_name,
+        alias="policy-rag",
+        health_check_seconds=30,
+        flush_batch_size=1000,
+        flush_interval_seconds=5,
+    ):
+        self.uri = uri
+        self.token = token
+        self.collection_name = collection_name
+        self.alias = alias
+        self.health_check_seconds = health_check_seconds
+        self.flush_batch_size = max(1, flush_batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self._lock = threading.RLock()
+        self._collection = None
+        self._checked_at = 0.0
+        self._pending_rows = 0
+        self._flush_timer = None
+        self.reconnects = 0
+        self.fields = frozenset()
+        self.dynamic_fields = False
+
+    # ─────────────────────────────
+    # Connection management
+    # ─────────────────────────────
+    def _connect(self):
+        connections.connect(alias=self.alias, uri=self.uri, token=self.token)
+        self._ensure_schema()
+        collection = Collection(self.collection_name, using=self.alias)
+        collection.load()
+        self._read_schema(collection)
+        self._checked_at = time.time()
+        return collection
+
+    def _read_schema(self, collection):
+        self.fields = frozenset(field.name for field in collection.schema.fields)
+        self.dynamic_fields = bool(getattr(collection.schema, "enable_dynamic_field", False))
+        missing = [name for name in METADATA_FIELDS if name not in self.fields]
+        if missing:
+            logger.warning(
+                "Milvus collection %s has no %s field(s); serving vector-only retrieval without metadata "
+                "filters until it is rebuilt (python -m src.rag.ingest --rebuild)",
+                self.collection_name, ", ".join(missing),
+            )
+
+    def has_fields(self, *names):
+        """Whether every name is a declared field (dynamic keys are not indexed or guaranteed present)"""
+        return all(name in self.fields for name in names)
+
+    def present_fields(self, names):
+        return [name for name in names if name in self.fields]
+
+    def _ensure_schema(self):
+        if utility.has_collection(self.collection_name, using=self.alias):
+            return
+        fields = [
+            FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
+            FieldSchema(name=VECTOR_FIELD, dtype=DataType.FLOAT_VECTOR, dim=DIM),
+            FieldSchema(name=TEXT_FIELD, dtype=DataType.VARCHAR, max_length=65535),
+            FieldSchema(name="chunk_id", dtype=DataType.VARCHAR, max_length=64),
+            FieldSchema(name="document", dtype=DataType.VARCHAR, max_length=512),
+            FieldSchema(name="section", dtype=DataType.VARCHAR, max_length=512),
+            FieldSchema(
+                name="grades", dtype=DataType.ARRAY, element_type=DataType.VARCHAR, max_capacity=32, max_length=16
+            ),
+            FieldSchema(name="travel_type", dtype=DataType.VARCHAR, max_length=16),
+            FieldSchema(name="version", dtype=DataType.VARCHAR, max_length=64)
+        ]
+        # Dynamic fields carry any further chunk metadata
+        schema = CollectionSchema(fields, description="travel policy store", enable_dynamic_field=True)
+        collection = Collection(name=self.collection_name, schema=schema, using=self.alias)
+        collection.create_index(VECTOR_FIELD, {"index_type": "IVF_FLAT", "metric_type": "L2", "params": {"nlist": 128}})
+        # Scalar indexes keep metadata-filtered searches from scanning every row
+        collection.create_index("grades", {"index_type": "INVERTED"})
+        collection.create_index("travel_type", {"index_type": "INVERTED"})
+
+    def _healthy(self):
+        try:
+            utility.get_server_version(using=self.alias)
+            return True
+        except Exception as exc:
+            logger.warning("Milvus health check failed, reconnecting: %s", exc)
+            return False
+
+    def collection(self):
+        """Loaded collection handle, (re)connecting when needed"""
+        with self._lock:
+            if self._collection is not None and time.time() - self._checked_at >= self.health_check_seconds:
+                if self._healthy():
+                    self._checked_at = time.time()
+                else:
+                    self.reset()
+            if self._collection is None:
+                self._collection = self._connect()
+            return self._collection
+
+    def reset(self):
+        """Drop the cached handle and connection; the next call reconnects"""
+        with self._lock:
+            if self._collection is not None:
+                self.reconnects += 1
+            self._collection = None
+            try:
+                connections.disconnect(self.alias)
+            except Exception:
+                pass
+
+    def run(self, operation):
+        """Call operation(collection), reconnecting and retrying once if Milvus drops the connection"""
+        try:
+            return operation(self.collection())
+        except MilvusException as exc:
+            logger.warning("Milvus call failed, retrying on a fresh connection: %s", exc)
+            self.reset()
+            return operation(self.collection())
+
+    # ─────────────────────────────
+    # Writes
+    # ─────────────────────────────
+    def insert(self, texts, embeddings, metadata=None):
+        metadata = metadata or [{} for _ in texts]
+        self.collection()
+        rows = [
+            {
+                **meta,
+                VECTOR_FIELD: embedding,
+                TEXT_FIELD: text,
+                "chunk_id": meta.get("chunk_id") or text_chunk_id(text),
+                "document": meta.get("document") or "",
+                "section": (meta.get("section") or "")[:512],
+                "grades": list(meta.get("grades") or []),
+                "travel_type": meta.get("travel_type") or "all",
+                "version": meta.get("version") or "",
+            }
+            for text, embedding, meta in zip(texts, embeddings, metadata)
+        ]
+        if not self.dynamic_fields:
+            # Older collections reject keys they do not declare
+            rows = [{key: value for key, value in row.items() if key in self.fields} for row in rows]
+        self.run(lambda col: col.insert(rows))
+        self._bump_version()
+        with self._lock:
+            self._pending_rows += len(texts)
+            if self._pending_rows >= self.flush_batch_size:
+                self._flush_locked()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval_seconds, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if self._pending_rows:
+            try:
+                self.run(lambda col: col.flush())
+                self._pending_rows = 0
+            except Exception as exc:
+                logger.error("Milvus flush failed; %d rows still pending: %s", self._pending_rows, exc)
+
+    def delete(self, chunk_ids):
+        if chunk_ids:
+            self.run(lambda col: col.delete(expr=f"chunk_id in {json.dumps(list(chunk_ids))}"))
+            self._bump_version()
+
+    def _bump_version(self):
+        """Record a new corpus version on the collection, visible to every process sharing it"""
+        try:
+            self.run(lambda col: col.set_properties({VERSION_PROPERTY: uuid.uuid4().hex}))
+        except Exception as exc:
+            logger.warning("Could not record the corpus version on %s: %s", self.collection_name, exc)
+
+    def chunk_index(self):
+        """chunk_id -> document for every stored chunk"""
+        def read(col):
+            if not self.has_fields("chunk_id", "document"):
+                raise RuntimeError(
+                    f"Milvus collection {self.collection_name} predates chunk ids; "
+                    "rebuild it with python -m src.rag.ingest --rebuild"
+                )
+            index = {}
+            iterator = col.query_iterator(
+                batch_size=QUERY_BATCH_SIZE, expr='chunk_id != ""', output_fields=["chunk_id", "document"]
+            )
+            try:
+                while True:
+                    batch = iterator.next()
+                    if not batch:
+                        return index
+                    index.update((row["chunk_id"], row["document"]) for row in batch)
+            finally:
+                iterator.close()
+        return self.run(read)
+
+    def iter_chunks(self):
+        """Every stored chunk's text and scalar metadata; empty for collections without chunk ids"""
+        def read(col):
+            chunks = []
+            if not self.has_fields("chunk_id"):
+                return chunks
+            iterator = col.query_iterator(
+                batch_size=QUERY_BATCH_SIZE,
+                expr='chunk_id != ""',
+                output_fields=[TEXT_FIELD, *self.present_fields(METADATA_FIELDS)],
+            )
+            try:
+                while True:
+                    batch = iterator.next()
+                    if not batch:
+                        return chunks
+                    chunks.extend(
+                        {"text": row[TEXT_FIELD], **{name: row.get(name) for name in METADATA_FIELDS}}
+                        for row in batch
+                    )
+            finally:
+                iterator.close()
+        return self.run(read)
+
+    def drop(self):
+        """Drop the collection; the next call recreates it with the current schema"""
+        with self._lock:
+            self._pending_rows = 0
+            self.collection()
+            utility.drop_collection(self.collection_name, using=self.alias)
+            self.reset()
+
+    def close(self):
+        self.flush()
+        self.reset()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "connected": self._collection is not None,
+                "collection": self.collection_name,
+                "pending_rows": self._pending_rows,
+                "metadata_fields": self.has_fields(*METADATA_FIELDS) if self._collection is not None else None,
+                "reconnects": self.reconnects,
+                "last_health_check_age_seconds": round(time.time() - self._checked_at, 1) if self._checked_at else None,
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    """Process-wide managed collection"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ManagedCollection(
+                MILVUS_URI,
+                MILVUS_TOKEN,
+                COLLECTION_NAME,
+                health_check_seconds=settings.MILVUS_HEALTH_CHECK_SECONDS,
+                flush_batch_size=settings.MILVUS_FLUSH_BATCH_SIZE,
+                flush_interval_seconds=settings.MILVUS_FLUSH_INTERVAL_SECONDS,
+            )
+        return _store
+
 def connect():
-    connections.connect(uri=MILVUS_URI, token=MILVUS_TOKEN)
+    get_store().collection()
 
 def ensure_collection():
     connect()
-    if utility.has_collection(COLLECTION_NAME):
-        return
-    fields = [
-        FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
-        FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=DIM),
-        FieldSchema(name="text", dtype=DataType.VARCHAR, max_length=65535)
-    ]
-    schema = CollectionSchema(fields, description="travel policy store")
-    Collection(name=COLLECTION_NAME, schema=schema)
 
-def upsert(texts, embeddings):
+def upsert(texts, embeddings, flush=False, metadata=None):
     """
-    texts: list[str], embeddings: list[list[float]]
+    texts: list[str], embeddings: list[list[float]], metadata: list[dict] (chunk_id, document, ...)
+    Pass flush=True to make the rows durable before returning.
     """
-    connect()
-    ensure_collection()
-    col = Collection(COLLECTION_NAME)
-    entities = [
-        embeddings,
-        texts
-    ]
-    # pymilvus expects column-wise data; using field order
-    col.insert([None, embeddings, texts])  # None for auto id
-    col.flush()
-
-def search(query_embedding, top_k=4):
-    connect()
-    col = Collection(COLLECTION_NAME)
-    search_params = {"metric_type":"L2", "params":{"nprobe":10}}
-    res = col.search(
-        [query_embedding],
-        VECTOR_FIELD,
-        search_params,
-        top_k,
-        output_fields=[TEXT_FIELD],
-    )
+    store = get_store()
+    store.insert(texts, embeddings, metadata)
+    if flush:
+        store.flush()
+
+def flush():
+    get_store().flush()
+
+def delete(chunk_ids):
+    get_store().delete(chunk_ids)
+
+def chunk_index():
+    return get_store().chunk_index()
+
+def iter_chunks():
+    return get_store().iter_chunks()
+
+def drop():
+    get_store().drop()
+
+def corpus_version():
+    """
+    Changes whenever the indexed corpus does: re-creating the collection
+    gives it a new id, and every insert or delete (from the API or the
+    ingestion CLI) writes a new version property. The entity count covers
+    writers that do not bump the property.
+    """
+    def read(col):
+        info = col.describe()
+        return f"{info.get('collection_id')}:{version_marker(info)}:{col.num_entities}"
+    return get_store().run(read)
+
+def search(query_embedding, top_k=4, expr=None):
+    """
+    expr: optional boolean filter on the scalar metadata fields; ignored
+    (unfiltered search) when the collection has no filter fields.
+    """
+    store = get_store()
+
+    def run_search(col):
+        filter_expr = expr if expr and store.has_fields(*FILTER_FIELDS) else None
+        return col.search(
+            [query_embedding],
+            VECTOR_FIELD,
+            SEARCH_PARAMS,
+            top_k,
+            expr=filter_expr,
+            output_fields=[TEXT_FIELD, *store.present_fields(["chunk_id", "section", "document"])],
+        )
+
+    res = store.run(run_search)
     # res is list of QueryResult
     hits = []
     for hit in res[0]:
-        hits.append({"id": hit.id, "text": hit.entity.get(TEXT_FIELD)})
+        chunk_id = hit.entity.get("chunk_id")
+        hits.append({
+            "id": chunk_id or hit.id,
+            "chunk_id": chunk_id,
+            "text": hit.entity.get(TEXT_FIELD),
+            "section": hit.entity.get("section"),
+            "document": hit.entity.get("document"),
+        })
     return hits
+
+
+if __name__ == "__main__":
+    # Per-search latency: connect + Collection() on every call vs the managed handle.
+    # Point MILVUS_URI at Milvus Lite (e.g. ./policy.db) or a local server.
+    # Unverified: this has not been run against a real Milvus yet, and no speed-up
+    # figures have been recorded for it; run it before quoting any.
+    import random
+    import statistics
+
+    runs = 50
+    query = [random.random() for _ in range(DIM)]
+
+    def timed(fn):
+        samples = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
+
+    def per_call_connection():
+        connections.connect(uri=MILVUS_URI, token=MILVUS_TOKEN)
+        Collection(COLLECTION_NAME).search([query], VECTOR_FIELD, SEARCH_PARAMS, 4, output_fields=[TEXT_FIELD])
+
+    search(query)  # warm up the managed handle
+    baseline = timed(per_call_connection)
+    managed = timed(lambda: search(query))
+    print(f"per-call connection: {baseline:.2f} ms  managed: {managed:.2f} ms  ({baseline / managed:.1f}x)")
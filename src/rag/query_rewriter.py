@@ -0,0 +1,153 @@
+"""Condenses policy chat follow-ups into standalone retrieval queries."""
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from cachetools import LRUCache
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from src.config.prompts import SYSTEM_PROMPT_QUERY_REWRITE
+from src.config.settings import settings
+from src.rag.embedding_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9']+")
+# Openers that only make sense against the previous turn ("and for international?")
+_FOLLOW_UP_OPENERS = re.compile(
+	r"^(and|but|also|so|then|what about|how about|same|ok|okay|what if|is that|does that|is it|does it|"
+	r"can i also|and if|or)\b"
+)
+# "that"/"there"/"above" are left out: too common in standalone questions ("E5 and above")
+_REFERENCES = frozenset("it its this those these they them same previous former latter".split())
+_STANDALONE_MIN_WORDS = 6
+_ANSWER_SNIPPET_CHARS = 300
+
+
+def is_standalone(question: str) -> bool:
+	"""
+	Cheap check that a question can be retrieved as is: long enough, no
+	follow-up opener and no pronoun pointing back at the conversation.
+	"""
+	text = normalize_query(question)
+	words = _WORD.findall(text)
+	if len(words) < _STANDALONE_MIN_WORDS or _FOLLOW_UP_OPENERS.match(text):
+		return False
+	return not _REFERENCES.intersection(words)
+
+
+class QueryRewriter:
+	"""
+	Rewrites follow-up questions into standalone queries with a small, fast
+	model. Questions that pass `is_standalone`, or arrive with no earlier
+	turn, are returned untouched without a model call. Rewrites are cached
+	per session, keyed by the question and the turns it was rewritten
+	against; a failed or slow rewrite falls back to the original question.
+	"""
+
+	def __init__(
+		self,
+		llm,
+		history_turns: int = 3,
+		max_entries: int = 1024,
+		timeout_seconds: float = 3.0,
+	) -> None:
+		self.llm = llm
+		self.history_turns = max(1, history_turns)
+		self.timeout_seconds = timeout_seconds
+		self._cache: LRUCache = LRUCache(maxsize=max(1, max_entries))
+		self._lock = threading.Lock()
+		self.skipped = 0
+		self.cache_hits = 0
+		self.rewrites = 0
+		self.failures = 0
+		self._rewrite_seconds = 0.0
+
+	def _recent_turns(self, history: List) -> List:
+		turns = [m for m in history if isinstance(m, (HumanMessage, AIMessage))]
+		return turns[-2 * self.history_turns:]
+
+	@staticmethod
+	def _transcript(turns: List) -> str:
+		lines = []
+		for message in turns:
+			text = str(message.content or "").strip()
+			if isinstance(message, AIMessage):
+				if len(text) > _ANSWER_SNIPPET_CHARS:
+					text = f"{text[:_ANSWER_SNIPPET_CHARS]}…"
+				lines.append(f"Assistant: {text}")
+			else:
+				lines.append(f"Employee: {text}")
+		return "\n".join(lines)
+
+	def _key(self, session_id: str, question: str, transcript: str) -> tuple:
+		digest = hashlib.sha256(f"{transcript}\0{normalize_query(question)}".encode("utf-8")).hexdigest()
+		return session_id, digest
+
+	async def rewrite(self, session_id: str, question: str, history: List) -> str:
+		"""Standalone form of `question` given the session history."""
+		turns = self._recent_turns(history)
+		if not turns or is_standalone(question):
+			with self._lock:
+				self.skipped += 1
+			return question
+
+		transcript = self._transcript(turns)
+		key = self._key(session_id, question, transcript)
+		with self._lock:
+			cached = self._cache.get(key)
+			if cached is not None:
+				self.cache_hits += 1
+				return cached
+
+		prompt = [
+			SystemMessage(content=SYSTEM_PROMPT_QUERY_REWRITE),
+			HumanMessage(content=f"Conversation:\n{transcript}\n\nFollow-up question: {question.strip()}"),
+		]
+		started = time.perf_counter()
+		try:
+			response = await asyncio.wait_for(self.llm.ainvoke(prompt), timeout=self.timeout_seconds)
+			lines = str(response.content or "").strip().splitlines()
+			rewritten = lines[0].strip().strip('"') if lines else question
+		except Exception as exc:  # pylint: disable=broad-except
+			logger.warning("Query rewrite failed, retrieving with the original question: %s", exc)
+			with self._lock:
+				self.failures += 1
+			return question
+
+		with self._lock:
+			self.rewrites += 1
+			self._rewrite_seconds += time.perf_counter() - started
+			self._cache[key] = rewritten
+		return rewritten
+
+	def stats(self) -> Dict:
+		with self._lock:
+			turns = self.skipped + self.cache_hits + self.rewrites + self.failures
+			return {
+				"skipped_standalone": self.skipped,
+				"cache_hits": self.cache_hits,
+				"rewrites": self.rewrites,
+				"failures": self.failures,
+				"cache_entries": len(self._cache),
+				"model_call_rate": round((self.rewrites + self.failures) / turns, 4) if turns else None,
+				"avg_rewrite_ms": round(self._rewrite_seconds / self.rewrites * 1000, 1) if self.rewrites else None,
+			}
+
+
+def create_query_rewriter() -> Optional[QueryRewriter]:
+	"""Query rewriter on the fast model, or None when RAG_QUERY_REWRITE is off."""
+	if not settings.RAG_QUERY_REWRITE:
+		return None
+	from src.config.llm_config import get_fast_llm
+
+	return QueryRewriter(
+		get_fast_llm(),
+		history_turns=settings.RAG_REWRITE_HISTORY_TURNS,
+		max_entries=settings.RAG_REWRITE_CACHE_SIZE,
+		timeout_seconds=settings.RAG_REWRITE_TIMEOUT_SECONDS,
+	)
@@ -1,16 +1,118 @@
 """Policy retrieval-augmented generation helpers."""
+import asyncio
+import logging
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 
-from langchain_core.messages import HumanMessage
+import numpy as np
+from langchain_core.messages import AIMessage, HumanMessage
 
 from src.api.models.session_models import Session
 from src.config.llm_config import get_llm
 from src.config.prompts import SYSTEM_PROMPT_POLICY_RAG
 from src.config.settings import settings
-from src.rag import milvus_store
+from src.rag.context_packer import ContextPacker, create_context_packer
 from src.rag.embedder import get_embedder
+from src.rag.embedding_cache import create_embedding_cache
+from src.rag.hybrid import create_retriever
+from src.rag.metadata import PolicyFilter
+from src.rag.query_rewriter import create_query_rewriter
+from src.rag.vector_store import get_vector_store
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticAnswerCache:
+	"""
+	Answers to earlier standalone questions, matched by cosine similarity of
+	their embeddings. Entries belong to one corpus version; seeing a new
+	version empties the cache. An entry is only reused within its scope
+	(the retrieval filter it was answered under).
+	"""
+
+	def __init__(self, threshold: float, max_entries: int = 512, ttl_seconds: int = 86400) -> None:
+		self.threshold = threshold
+		self.max_entries = max(1, max_entries)
+		self.ttl_seconds = ttl_seconds
+		self._lock = threading.Lock()
+		self._vectors: Optional[np.ndarray] = None
+		self._entries: List[Dict] = []
+		self._version: Optional[str] = None
+		self.hits = 0
+		self.misses = 0
+		self.invalidations = 0
+
+	@property
+	def enabled(self) -> bool:
+		return 0 < self.threshold <= 1
+
+	@staticmethod
+	def _unit(embedding: List[float]) -> np.ndarray:
+		vector = np.asarray(embedding, dtype=np.float32)
+		norm = np.linalg.norm(vector)
+		return vector / norm if norm else vector
+
+	def _sync_version(self, version: str) -> None:
+		if version != self._version:
+			if self._entries:
+				self.invalidations += 1
+				logger.info("Policy corpus changed (%s -> %s); answer cache cleared", self._version, version)
+			self._vectors, self._entries, self._version = None, [], version
+
+	def lookup(self, embedding: List[float], version: str, scope: str = "") -> Optional[Dict]:
+		with self._lock:
+			self._sync_version(version)
+			if not self._entries:
+				self.misses += 1
+				return None
+			similarities = self._vectors @ self._unit(embedding)
+			unusable = np.array([
+				time.time() - e["stored_at"] > self.ttl_seconds or e["scope"] != scope for e in self._entries
+			])
+			similarities[unusable] = -1.0
+			best = int(np.argmax(similarities))
+			if similarities[best] < self.threshold:
+				self.misses += 1
+				return None
+			self.hits += 1
+			return {**self._entries[best], "similarity": float(similarities[best])}
+
+	def store(
+		self,
+		embedding: List[float],
+		version: str,
+		answer: str,
+		sources: List[Dict[str, str]],
+		scope: str = "",
+	) -> None:
+		with self._lock:
+			self._sync_version(version)
+			vector = self._unit(embedding)[None, :]
+			self._vectors = vector if self._vectors is None else np.vstack([self._vectors, vector])
+			self._entries.append({"response": answer, "sources": sources, "scope": scope, "stored_at": time.time()})
+			if len(self._entries) > self.max_entries:
+				excess = len(self._entries) - self.max_entries
+				self._vectors = self._vectors[excess:]
+				self._entries = self._entries[excess:]
+
+	def stats(self) -> Dict:
+		with self._lock:
+			lookups = self.hits + self.misses
+			return {
+				"enabled": self.enabled,
+				"threshold": self.threshold,
+				"corpus_version": self._version,
+				"entries": len(self._entries),
+				"capacity": self.max_entries,
+				"hits": self.hits,
+				"misses": self.misses,
+				"hit_rate": round(self.hits / lookups, 4) if lookups else None,
+				"invalidations": self.invalidations,
+			}
 
 
 class PolicyRAGChatService:
@@ -19,9 +121,25 @@ class PolicyRAGChatService:
 	def __init__(self) -> None:
 		self.sessions: Dict[str, Session] = {}
 		self.embedder = get_embedder()
+		self.embedding_cache = create_embedding_cache(self.embedder)
+		self.vector_store = get_vector_store()
+		self.retriever = create_retriever(self.vector_store)
 		self.llm = get_llm()
+		self.query_rewriter = create_query_rewriter()
 		self.top_k = max(1, settings.RAG_TOP_K)
-		self.max_context_chars = max(200, settings.RAG_CONTEXT_MAX_CHARS)
+		self.context_packer = create_context_packer()
+		self.answer_cache = SemanticAnswerCache(
+			threshold=settings.RAG_ANSWER_CACHE_THRESHOLD,
+			max_entries=settings.RAG_ANSWER_CACHE_SIZE,
+			ttl_seconds=settings.RAG_ANSWER_CACHE_TTL_SECONDS,
+		)
+		self._corpus_version: Optional[str] = None
+		self._corpus_checked_at = 0.0
+		# Vector store calls are synchronous; they run here so they never block the event loop
+		self._executor = ThreadPoolExecutor(
+			max_workers=max(1, settings.RAG_SEARCH_WORKERS),
+			thread_name_prefix="policy-rag",
+		)
 
 	# ─────────────────────────────
 	# Session helpers
@@ -45,41 +163,68 @@ class PolicyRAGChatService:
 	# ─────────────────────────────
 	# Retrieval helpers
 	# ─────────────────────────────
-	def _search(self, query: str) -> List[Dict]:
-		embedding = self.embedder.embed_query(query)
-		return milvus_store.search(embedding, top_k=self.top_k)
+	async def _run_blocking(self, timeout: float, func, *args):
+		"""Run a blocking call on the retrieval executor; on timeout the caller stops waiting for it."""
+		loop = asyncio.get_running_loop()
+		return await asyncio.wait_for(loop.run_in_executor(self._executor, func, *args), timeout=timeout)
+
+	async def _embed(self, query: str) -> List[float]:
+		return await asyncio.wait_for(
+			self.embedding_cache.aembed_query(query),
+			timeout=settings.RAG_EMBED_TIMEOUT_SECONDS,
+		)
+
+	async def _retrieve(self, query: str, embedding: List[float], filters: Optional[PolicyFilter]) -> List[Dict]:
+		if self.retriever is None:
+			return await self._run_blocking(
+				settings.RAG_SEARCH_TIMEOUT_SECONDS,
+				lambda: self.vector_store.search(embedding, top_k=self.top_k, filters=filters),
+			)
+		# The keyword index is rebuilt when the corpus version moves on
+		version = await self._current_corpus_version()
+		return await self._run_blocking(
+			settings.RAG_SEARCH_TIMEOUT_SECONDS,
+			lambda: self.retriever.retrieve(query, embedding, self.top_k, corpus_version=version, filters=filters),
+		)
+
+	async def _search(self, query: str, embedding: List[float], filters: Optional[PolicyFilter] = None) -> List[Dict]:
+		hits = await self._retrieve(query, embedding, filters)
+		if filters is not None and len(hits) < self.top_k:
+			# Too little matched the filter (or the corpus predates metadata): top up unfiltered
+			seen = {hit.get("text") for hit in hits}
+			extra = await self._retrieve(query, embedding, None)
+			hits += [hit for hit in extra if hit.get("text") not in seen][: self.top_k - len(hits)]
+		return hits
+
+	@staticmethod
+	def _filters_for(grade: Optional[str], message: str) -> Optional[PolicyFilter]:
+		if not settings.RAG_METADATA_FILTER:
+			return None
+		return PolicyFilter.for_question(grade, message)
+
+	async def _current_corpus_version(self) -> Optional[str]:
+		"""Corpus version, re-read from Milvus at most every RAG_CORPUS_VERSION_CHECK_SECONDS."""
+		if time.time() - self._corpus_checked_at >= settings.RAG_CORPUS_VERSION_CHECK_SECONDS:
+			try:
+				self._corpus_version = await self._run_blocking(
+					settings.RAG_SEARCH_TIMEOUT_SECONDS, self.vector_store.corpus_version
+				)
+			except Exception as exc:  # pylint: disable=broad-except
+				logger.warning("Could not read policy corpus version; answer cache bypassed, keyword index not refreshed: %s", exc)
+				self._corpus_version = None
+			self._corpus_checked_at = time.time()
+		return self._corpus_version
 
 	def _format_sources(self, hits: List[Dict]) -> List[Dict[str, str]]:
-		sources: List[Dict[str, str]] = []
-		for idx, hit in enumerate(hits, 1):
-			snippet = (hit.get("text") or "").strip()
-			if len(snippet) > self.max_context_chars:
-				snippet = f"{snippet[: self.max_context_chars]}…"
-			sources.append({
-				"id": str(hit.get("id", idx)),
-				"text": snippet,
-			})
-		return sources
+		"""Ranked hits packed into the RAG_CONTEXT_MAX_TOKENS budget; these are also the returned sources."""
+		return self.context_packer.pack(hits)
 
 	def _build_context_block(self, sources: List[Dict[str, str]]) -> str:
-		if not sources:
-			return "No matching travel policy excerpts were retrieved."
-		chunks = []
-		for idx, source in enumerate(sources, 1):
-			chunks.append(f"Source {idx} -> {source['text']}")
-		context = "\n\n".join(chunks)
-		if len(context) > self.max_context_chars:
-			return f"{context[: self.max_context_chars]}…"
-		return context
+		return ContextPacker.render(sources)
 
 	def _compose_user_message(self, question: str, context_block: str) -> str:
-		guidelines = (
-			"You answer employee travel policy questions using ONLY the provided context. "
-			"Quote rupee amounts, limits, and grade-based allowances where available. "
-			"If the context lacks the answer, politely say you don't have that information and suggest checking with HR."
-		)
+		# Answering guidelines live in SYSTEM_PROMPT_POLICY_RAG, sent once per session
 		return (
-			f"{guidelines}\n\n"
 			f"Policy Context:\n{context_block}\n\n"
 			f"Employee Question:\n{question.strip()}"
 		)
@@ -87,27 +232,72 @@ class PolicyRAGChatService:
 	# ─────────────────────────────
 	# Public API
 	# ─────────────────────────────
-	async def chat(self, message: str, session_id: Optional[str] = None) -> Dict:
+	def cache_stats(self) -> Dict:
+		return {
+			"embeddings": self.embedding_cache.stats(),
+			"answers": self.answer_cache.stats(),
+			"vector_store": self.vector_store.stats(),
+			"retriever": self.retriever.stats() if self.retriever else {"hybrid": False},
+			"context": self.context_packer.stats(),
+			"rewrites": self.query_rewriter.stats() if self.query_rewriter else {"enabled": False},
+		}
+
+	async def chat(self, message: str, session_id: Optional[str] = None, grade: Optional[str] = None) -> Dict:
+		"""`grade` is the employee's grade; with the question it narrows retrieval to matching policy chunks."""
 		if not message or not message.strip():
 			raise ValueError("Message cannot be empty")
 
 		self._cleanup_old_sessions()
 		session_id, session = self._get_or_create_session(session_id)
 
-		hits = self._search(message)
+		# Follow-ups are retrieved as standalone questions; the chat model still sees the original
+		query = message
+		if self.query_rewriter is not None:
+			query = await self.query_rewriter.rewrite(session_id, message, session.history)
+
+		embedding = await self._embed(query)
+		filters = self._filters_for(grade, query)
+		scope = filters.key if filters else ""
+
+		# Follow-ups depend on the conversation, so only opening questions use the answer cache
+		version = None
+		if self.answer_cache.enabled and len(session.history) <= 1:
+			version = await self._current_corpus_version()
+		if version is not None:
+			cached = self.answer_cache.lookup(embedding, version, scope)
+			if cached:
+				session.history.append(HumanMessage(content=message))
+				session.history.append(AIMessage(content=cached["response"]))
+				session.update_activity()
+				return {
+					"response": cached["response"],
+					"session_id": session_id,
+					"sources": cached["sources"],
+					"cached": True,
+				}
+
+		hits = await self._search(query, embedding, filters)
 		sources = self._format_sources(hits)
 		context_block = self._build_context_block(sources)
 		enhanced_message = self._compose_user_message(message, context_block)
 
-		session.history.append(HumanMessage(content=enhanced_message))
-		response = await self.llm.ainvoke(session.history)
+		prompt = session.history + [HumanMessage(content=enhanced_message)]
+		response = await asyncio.wait_for(self.llm.ainvoke(prompt), timeout=settings.RAG_LLM_TIMEOUT_SECONDS)
+		# History keeps the bare question: each turn retrieves fresh context, so
+		# earlier excerpts would only be re-sent on every later turn
+		session.history.append(HumanMessage(content=message))
 		session.history.append(response)
 		session.update_activity()
 
+		answer = response.content or ""
+		if version is not None and answer:
+			self.answer_cache.store(embedding, version, answer, sources, scope)
+
 		return {
-			"response": response.content or "",
+			"response": answer,
 			"session_id": session_id,
 			"sources": sources,
+			"cached": False,
 		}
 
 
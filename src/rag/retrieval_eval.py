@@ -0,0 +1,97 @@
+"""
+Recall of policy retrieval on a small labelled question set.
+
+Each line of the eval file is {"question": ..., "expect": [...]} with an
+optional "grade" for the metadata-filtered run; a
+retrieved chunk is relevant when its text contains every expected term
+(case-insensitive). Recall@k is the share of questions with at least one
+relevant chunk in the top k, reported for vector-only, BM25-only,
+hybrid and metadata-filtered hybrid retrieval against the configured
+store:
+
+	python -m src.rag.retrieval_eval [--eval-file ...] [--k 1 3 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+from typing import Callable, Dict, List, Optional, Sequence
+
+from src.rag.hybrid import HybridRetriever
+from src.rag.metadata import PolicyFilter
+from src.rag.vector_store import get_vector_store
+
+DEFAULT_EVAL_FILE = os.path.join(os.path.dirname(__file__), "eval_questions.jsonl")
+
+
+def load_eval_set(path: str = DEFAULT_EVAL_FILE) -> List[Dict]:
+	with open(path, encoding="utf-8") as f:
+		return [json.loads(line) for line in f if line.strip()]
+
+
+def is_relevant(text: str, expect: Sequence[str]) -> bool:
+	text = (text or "").casefold()
+	return all(term.casefold() in text for term in expect)
+
+
+def recall_at_k(
+	eval_set: Sequence[Dict],
+	retrieve: Callable[[Dict, int], List[Dict]],
+	ks: Sequence[int],
+) -> Dict[int, float]:
+	"""`retrieve(item, k)` returns ranked hits for one eval item."""
+	depth = max(ks)
+	found = {k: 0 for k in ks}
+	for item in eval_set:
+		hits = retrieve(item, depth)
+		ranks = [i for i, hit in enumerate(hits, 1) if is_relevant(hit.get("text"), item["expect"])]
+		for k in ks:
+			if ranks and ranks[0] <= k:
+				found[k] += 1
+	return {k: round(found[k] / len(eval_set), 3) if eval_set else 0.0 for k in ks}
+
+
+async def _embed_questions(eval_set: Sequence[Dict], embedder) -> None:
+	vectors = await embedder.aembed_documents([item["question"] for item in eval_set])
+	for item, vector in zip(eval_set, vectors):
+		item["embedding"] = vector
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+	parser = argparse.ArgumentParser(description="Measure policy retrieval recall")
+	parser.add_argument("--eval-file", default=DEFAULT_EVAL_FILE)
+	parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5])
+	parser.add_argument("--candidates", type=int, default=20, help="Hybrid candidates per retriever")
+	args = parser.parse_args(argv)
+
+	from src.rag.embedder import get_embedder
+
+	eval_set = load_eval_set(args.eval_file)
+	asyncio.run(_embed_questions(eval_set, get_embedder()))
+	store = get_vector_store()
+	hybrid = HybridRetriever(store, candidates=args.candidates)
+	bm25 = hybrid.keyword_index(store.corpus_version())
+
+	report = {
+		"questions": len(eval_set),
+		"vector": recall_at_k(eval_set, lambda item, k: store.search(item["embedding"], top_k=k), args.k),
+		"bm25": recall_at_k(eval_set, lambda item, k: bm25.search(item["question"], k), args.k),
+		"hybrid": recall_at_k(
+			eval_set, lambda item, k: hybrid.retrieve(item["question"], item["embedding"], k), args.k
+		),
+		"hybrid_filtered": recall_at_k(
+			eval_set,
+			lambda item, k: hybrid.retrieve(
+				item["question"],
+				item["embedding"],
+				k,
+				filters=PolicyFilter.for_question(item.get("grade"), item["question"]),
+			),
+			args.k,
+		),
+	}
+	print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+	main()
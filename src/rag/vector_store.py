@@ -0,0 +1,390 @@
+"""Vector store backends for policy retrieval."""
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+try:
+	import fcntl
+except ImportError:  # Windows: writes are serialized within the process only
+	fcntl = None
+
+from src.config.settings import settings
+from src.rag.metadata import PolicyFilter
+
+logger = logging.getLogger(__name__)
+
+
+def text_chunk_id(text: str) -> str:
+	"""Default chunk id for rows upserted without one."""
+	return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class VectorStore:
+	"""Interface shared by the policy retrieval backends."""
+
+	name = "base"
+
+	def search(
+		self,
+		query_embedding: List[float],
+		top_k: int = 4,
+		filters: Optional[PolicyFilter] = None,
+	) -> List[Dict]:
+		"""Nearest chunks, restricted to those matching `filters` when given."""
+		raise NotImplementedError
+
+	def upsert(
+		self,
+		texts: List[str],
+		embeddings: List[List[float]],
+		flush: bool = False,
+		metadata: Optional[List[Dict]] = None,
+	) -> None:
+		"""Add chunks; metadata rows carry chunk_id, document and any other fields."""
+		raise NotImplementedError
+
+	def flush(self) -> None:
+		"""Make buffered writes durable; a no-op for stores that write through."""
+
+	def delete(self, chunk_ids: List[str]) -> None:
+		raise NotImplementedError
+
+	def chunk_index(self) -> Dict[str, str]:
+		"""chunk_id -> document for every stored chunk."""
+		raise NotImplementedError
+
+	def iter_chunks(self) -> List[Dict]:
+		"""Every stored chunk as {"text", "chunk_id", "document", ...}, for keyword indexing."""
+		raise NotImplementedError
+
+	def drop(self) -> None:
+		"""Remove every chunk (and, for Milvus, recreate the collection schema)."""
+		raise NotImplementedError
+
+	def corpus_version(self) -> str:
+		"""Opaque value that changes whenever the indexed corpus changes."""
+		raise NotImplementedError
+
+	def stats(self) -> Dict:
+		return {"backend": self.name}
+
+
+class MilvusVectorStore(VectorStore):
+	"""Managed Milvus collection (see milvus_store)."""
+
+	name = "milvus"
+
+	def search(self, query_embedding, top_k=4, filters=None):
+		from src.rag import milvus_store
+		return milvus_store.search(query_embedding, top_k=top_k, expr=filters.milvus_expr() if filters else None)
+
+	def upsert(self, texts, embeddings, flush=False, metadata=None):
+		from src.rag import milvus_store
+		milvus_store.upsert(texts, embeddings, flush=flush, metadata=metadata)
+
+	def flush(self):
+		from src.rag import milvus_store
+		milvus_store.flush()
+
+	def delete(self, chunk_ids):
+		from src.rag import milvus_store
+		milvus_store.delete(chunk_ids)
+
+	def chunk_index(self):
+		from src.rag import milvus_store
+		return milvus_store.chunk_index()
+
+	def iter_chunks(self):
+		from src.rag import milvus_store
+		return milvus_store.iter_chunks()
+
+	def drop(self):
+		from src.rag import milvus_store
+		milvus_store.drop()
+
+	def corpus_version(self):
+		from src.rag import milvus_store
+		return milvus_store.corpus_version()
+
+	def stats(self):
+		from src.rag import milvus_store
+		return {"backend": self.name, **milvus_store.get_store().stats()}
+
+
+class LocalVectorStore(VectorStore):
+	"""
+	In-process exact search over a memory-mapped matrix of unit vectors.
+
+	The index directory holds `meta.json` and, per write, a
+	`vectors.<version>.f32` (float32, rows x dim) and `texts.<version>.jsonl`
+	(one record of text plus chunk metadata per row) named in it. Vectors
+	are normalized on write, so one
+	matrix-vector product gives cosine scores for the whole corpus; top-k is
+	an argpartition over that. With `hnsw=True` and hnswlib installed an
+	HNSW graph is built on load and used instead of the full scan.
+	A write creates a new version's data files and then atomically replaces
+	meta.json, so a reader always pairs meta.json with the files it names;
+	other processes (e.g. the ingestion CLI) are picked up when meta.json
+	changes. Writes hold an exclusive lock on `meta.json.lock` and reload
+	the current version before changing it, so concurrent writers in
+	different processes never drop each other's rows. Upserting an existing
+	chunk_id replaces that row.
+	"""
+
+	name = "local"
+
+	def __init__(self, index_dir: str, dim: int, hnsw: bool = False) -> None:
+		self.index_dir = index_dir
+		self.dim = dim
+		self.use_hnsw = hnsw
+		self._lock = threading.Lock()
+		self._write_lock = threading.Lock()
+		self._vectors = np.zeros((0, dim), dtype=np.float32)
+		self._records: List[Dict] = []
+		self._version = "empty"
+		self._hnsw = None
+		self._meta_mtime = None
+		self._load()
+
+	@property
+	def _meta_path(self) -> str:
+		return os.path.join(self.index_dir, "meta.json")
+
+	def _data_paths(self, meta: Dict) -> Dict[str, str]:
+		"""Data files a meta.json names; indexes written before versioned files use fixed names."""
+		return {
+			"vectors": os.path.join(self.index_dir, meta.get("vectors", "vectors.f32")),
+			"texts": os.path.join(self.index_dir, meta.get("texts", "texts.jsonl")),
+		}
+
+	@contextmanager
+	def _locked_for_write(self) -> Iterator[None]:
+		"""Serialize writers in this process and across processes, then reload the latest version."""
+		with self._write_lock:
+			os.makedirs(self.index_dir, exist_ok=True)
+			with open(self._meta_path + ".lock", "a") as lock_file:
+				if fcntl is not None:
+					fcntl.flock(lock_file, fcntl.LOCK_EX)
+				try:
+					self._load()
+					yield
+				finally:
+					if fcntl is not None:
+						fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+	def _load(self, attempts: int = 3) -> None:
+		meta_path = self._meta_path
+		if not os.path.exists(meta_path):
+			return
+		mtime = os.stat(meta_path).st_mtime_ns
+		with open(meta_path, encoding="utf-8") as f:
+			meta = json.load(f)
+		if meta["dim"] != self.dim:
+			raise ValueError(f"Local index at {self.index_dir} has dim {meta['dim']}, expected {self.dim}")
+		paths = self._data_paths(meta)
+		count = meta["count"]
+		try:
+			with open(paths["texts"], encoding="utf-8") as f:
+				records = [self._as_record(json.loads(line)) for line in f]
+			vectors = (
+				np.memmap(paths["vectors"], dtype=np.float32, mode="r", shape=(count, self.dim))
+				if count else np.zeros((0, self.dim), dtype=np.float32)
+			)
+		except FileNotFoundError:
+			# Another process swapped in a newer version and removed these files; read its meta.json
+			if attempts <= 1:
+				raise
+			return self._load(attempts - 1)
+		hnsw_index = self._build_hnsw(vectors) if self.use_hnsw and count else None
+		with self._lock:
+			self._vectors, self._records, self._version, self._hnsw = vectors, records, meta["version"], hnsw_index
+			self._meta_mtime = mtime
+		logger.info("Loaded local policy index: %d vectors from %s", count, self.index_dir)
+
+	@staticmethod
+	def _as_record(value) -> Dict:
+		if isinstance(value, str):
+			return {"text": value, "chunk_id": text_chunk_id(value), "document": ""}
+		return value
+
+	def _reload_if_changed(self) -> None:
+		try:
+			mtime = os.stat(self._meta_path).st_mtime_ns
+		except FileNotFoundError:
+			return
+		if mtime != self._meta_mtime:
+			with self._write_lock:
+				if mtime != self._meta_mtime:
+					self._load()
+
+	def _build_hnsw(self, vectors: np.ndarray):
+		try:
+			import hnswlib
+		except ImportError:
+			logger.warning("hnswlib is not installed; local index uses exact search")
+			return None
+		index = hnswlib.Index(space="ip", dim=self.dim)
+		index.init_index(max_elements=len(vectors), ef_construction=200, M=16)
+		index.add_items(np.asarray(vectors), np.arange(len(vectors)))
+		index.set_ef(64)
+		return index
+
+	@staticmethod
+	def _normalize(matrix: np.ndarray) -> np.ndarray:
+		norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+		return matrix / np.where(norms == 0, 1, norms)
+
+	def search(self, query_embedding, top_k=4, filters=None):
+		self._reload_if_changed()
+		with self._lock:
+			vectors, records, hnsw_index = self._vectors, self._records, self._hnsw
+		if not records:
+			return []
+		query = self._normalize(np.asarray(query_embedding, dtype=np.float32))
+		# A filtered search scores only the matching rows (exact scan, no HNSW)
+		rows = None
+		if filters is not None:
+			rows = np.fromiter((i for i, record in enumerate(records) if filters.matches(record)), dtype=np.int64)
+			if not len(rows):
+				return []
+		k = min(top_k, len(records) if rows is None else len(rows))
+
+		if hnsw_index is not None and rows is None:
+			labels, distances = hnsw_index.knn_query(query, k=k)
+			order, scores = labels[0], 1 - distances[0]
+		else:
+			similarities = np.asarray(vectors[rows] if rows is not None else vectors) @ query
+			top = np.argpartition(-similarities, k - 1)[:k]
+			ranked = top[np.argsort(-similarities[top])]
+			scores = similarities[ranked]
+			order = rows[ranked] if rows is not None else ranked
+		return [
+			{"id": records[int(i)]["chunk_id"], **records[int(i)], "score": float(score)}
+			for i, score in zip(order, scores)
+		]
+
+	def upsert(self, texts, embeddings, flush=False, metadata=None):
+		new_vectors = self._normalize(np.asarray(embeddings, dtype=np.float32).reshape(-1, self.dim))
+		metadata = metadata or [{} for _ in texts]
+		new_records = [
+			{
+				**meta,
+				"text": text,
+				"chunk_id": meta.get("chunk_id") or text_chunk_id(text),
+				"document": meta.get("document") or "",
+			}
+			for text, meta in zip(texts, metadata)
+		]
+		# Last occurrence wins within the batch; stored rows with the same chunk_id are replaced
+		latest = {record["chunk_id"]: i for i, record in enumerate(new_records)}
+		fresh = sorted(latest.values())
+		new_vectors = new_vectors[fresh]
+		new_records = [new_records[i] for i in fresh]
+		with self._locked_for_write():
+			with self._lock:
+				keep = [i for i, record in enumerate(self._records) if record["chunk_id"] not in latest]
+				vectors = np.vstack([np.asarray(self._vectors)[keep], new_vectors])
+				records = [self._records[i] for i in keep] + new_records
+			self._write(vectors, records)
+			self._load()
+
+	def delete(self, chunk_ids):
+		doomed = set(chunk_ids)
+		if not doomed:
+			return
+		with self._locked_for_write():
+			with self._lock:
+				keep = [i for i, record in enumerate(self._records) if record["chunk_id"] not in doomed]
+				vectors = np.asarray(self._vectors)[keep]
+				records = [self._records[i] for i in keep]
+			self._write(vectors, records)
+			self._load()
+
+	def chunk_index(self):
+		self._reload_if_changed()
+		with self._lock:
+			return {record["chunk_id"]: record.get("document", "") for record in self._records}
+
+	def iter_chunks(self):
+		self._reload_if_changed()
+		with self._lock:
+			return list(self._records)
+
+	def drop(self):
+		with self._locked_for_write():
+			self._write(np.zeros((0, self.dim), dtype=np.float32), [])
+			self._load()
+
+	def _write(self, vectors: np.ndarray, records: List[Dict]) -> None:
+		os.makedirs(self.index_dir, exist_ok=True)
+		version = uuid.uuid4().hex
+		meta = {
+			"dim": self.dim,
+			"count": len(records),
+			"version": version,
+			"vectors": f"vectors.{version}.f32",
+			"texts": f"texts.{version}.jsonl",
+		}
+		paths = self._data_paths(meta)
+		vectors.astype(np.float32).tofile(paths["vectors"])
+		with open(paths["texts"], "w", encoding="utf-8") as f:
+			for record in records:
+				f.write(json.dumps(record) + "\n")
+		try:
+			with open(self._meta_path, encoding="utf-8") as f:
+				previous = self._data_paths(json.load(f))
+		except (FileNotFoundError, ValueError):
+			previous = {}
+		with open(self._meta_path + ".tmp", "w", encoding="utf-8") as f:
+			json.dump(meta, f)
+		# The new version becomes visible in one step; only then are the replaced version's files removed
+		os.replace(self._meta_path + ".tmp", self._meta_path)
+		for path in previous.values():
+			try:
+				os.remove(path)
+			except OSError:
+				# Already gone, or still mapped by a reader on a platform that refuses to delete open files
+				pass
+
+	def corpus_version(self):
+		self._reload_if_changed()
+		with self._lock:
+			return f"local:{self._version}"
+
+	def stats(self):
+		with self._lock:
+			return {
+				"backend": self.name,
+				"index_dir": self.index_dir,
+				"vectors": len(self._records),
+				"dim": self.dim,
+				"hnsw": self._hnsw is not None,
+				"version": self._version,
+			}
+
+
+_vector_store: Optional[VectorStore] = None
+
+
+def create_vector_store(backend: Optional[str] = None) -> VectorStore:
+	backend = (backend or settings.RAG_VECTOR_BACKEND).strip().lower()
+	if backend == "local":
+		return LocalVectorStore(settings.RAG_LOCAL_INDEX_DIR, settings.MILVUS_DIM, hnsw=settings.RAG_LOCAL_HNSW)
+	if backend == "milvus":
+		return MilvusVectorStore()
+	raise ValueError(f"Unknown RAG_VECTOR_BACKEND '{backend}' (expected 'milvus' or 'local')")
+
+
+def get_vector_store() -> VectorStore:
+	"""Return the configured vector store singleton."""
+	global _vector_store
+	if _vector_store is None:
+		_vector_store = create_vector_store()
+	return _vector_store